@@ -1,30 +1,437 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from fnmatch import fnmatch
+from itertools import chain, islice
+import glob
+import multiprocessing
 import os
+import re
+import threading
+import time
+from backend.reader_engines import (select_engine, read_table, file_type, csv_options, sheet_dimensions,
+                                    SUPPORTED_EXTENSIONS)
+from backend.dtype_optimizer import optimize_dtypes
+from backend.variance import PreparedPlan, variance_decomposition, _as_list
+from backend.forecasting import forecast
+from backend.time_intelligence import time_intelligence
+from backend.downsampling import plot_decimated, full_resolution_data
 
 
 class ControllerToolbox:
     """Hauptklasse für die Controller-Funktionalitäten"""
 
-    def __init__(self):
+    def __init__(self, cache=None):
         self.data = None
         self.report_date = datetime.now().strftime("%Y-%m-%d")
 
-    def load_excel(self, filepath, sheet_name=0, skiprows=None, usecols=None):
-        """Lädt Daten aus einer Excel-Datei"""
+        # Optionaler persistenter Cache für eingelesene Tabellenblätter
+        self.cache = cache
+
+        # Geöffnete Arbeitsmappen für Folgezugriffe (Pfad -> (Signatur, ExcelFile))
+        self._excel_files = OrderedDict()
+        self.max_open_files = 4
+
+        # Handles werden aus ImportWorker-Threads und dem GUI-Thread genutzt: Ein
+        # verdrängtes Handle, das gerade gelesen wird, wird erst nach der
+        # Freigabe durch den letzten Nutzer geschlossen (id(ExcelFile) -> Nutzer)
+        self._excel_lock = threading.Lock()
+        self._excel_users = {}
+        self._excel_pending_close = {}
+
+    def open_excel(self, filepath):
+        """Öffnet eine Excel-Datei oder liefert das bereits geöffnete Handle"""
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with self._excel_lock:
+            return self._open_excel_locked(path, signature)
+
+    def close_excel(self, filepath=None):
+        """Schließt ein gecachtes Excel-Handle (oder alle, wenn kein Pfad angegeben)"""
+        with self._excel_lock:
+            paths = list(self._excel_files) if filepath is None else [os.path.abspath(filepath)]
+            for path in paths:
+                self._close_excel_locked(path)
+
+    def _open_excel_locked(self, path, signature):
+        """Wie open_excel, Aufrufer hält _excel_lock"""
+        cached = self._excel_files.get(path)
+        if cached is not None:
+            if cached[0] == signature:
+                self._excel_files.move_to_end(path)
+                return cached[1]
+            # Datei wurde verändert, altes Handle verwerfen
+            self._close_excel_locked(path)
+
         try:
-            df = pd.read_excel(
-                filepath,
-                sheet_name=sheet_name,
-                skiprows=skiprows,
-                usecols=usecols
-            )
+            # Dieselbe Engine wie load_excel, damit das Handle dort wiederverwendet wird
+            excel_file = pd.ExcelFile(path, engine=select_engine(path))
+        except Exception as e:
+            raise Exception(f"Fehler beim Öffnen der Excel-Datei: {str(e)}")
+
+        self._excel_files[path] = (signature, excel_file)
+
+        # Anzahl gleichzeitig offener Arbeitsmappen begrenzen
+        while len(self._excel_files) > self.max_open_files:
+            self._close_excel_locked(next(iter(self._excel_files)))
+
+        return excel_file
+
+    def _close_excel_locked(self, path):
+        """Entfernt ein Handle aus dem Cache und schließt es, sobald es niemand mehr liest"""
+        cached = self._excel_files.pop(path, None)
+        if cached is None:
+            return
+        excel_file = cached[1]
+        if self._excel_users.get(id(excel_file)):
+            # Wird noch gelesen: beim letzten _release_excel schließen
+            self._excel_pending_close[id(excel_file)] = excel_file
+        else:
+            excel_file.close()
+
+    def _acquire_excel(self, filepath, open_missing=False):
+        """Liefert ein gültiges Handle (bzw. None) und markiert es bis _release_excel als benutzt
+
+        Ohne open_missing wird nur ein bereits geöffnetes Handle geliefert.
+        """
+        path = os.path.abspath(filepath)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            if open_missing:
+                raise
+            return None
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with self._excel_lock:
+            if open_missing:
+                excel_file = self._open_excel_locked(path, signature)
+            else:
+                cached = self._excel_files.get(path)
+                if cached is None:
+                    return None
+                if cached[0] != signature:
+                    self._close_excel_locked(path)
+                    return None
+                excel_file = cached[1]
+
+            self._excel_users[id(excel_file)] = self._excel_users.get(id(excel_file), 0) + 1
+            return excel_file
+
+    def _release_excel(self, excel_file):
+        """Gibt ein mit _acquire_excel erhaltenes Handle wieder frei"""
+        if excel_file is None:
+            return
+        with self._excel_lock:
+            key = id(excel_file)
+            users = self._excel_users.get(key, 0) - 1
+            if users > 0:
+                self._excel_users[key] = users
+                return
+            self._excel_users.pop(key, None)
+            pending = self._excel_pending_close.pop(key, None)
+        if pending is not None:
+            pending.close()
+
+    def get_sheet_info(self, filepath):
+        """Ermittelt Tabellenblätter und Dimensionen nur aus den Metadaten der Arbeitsmappe"""
+        # CSV- und Parquet-Dateien bestehen aus genau einer Tabelle
+        kind = file_type(filepath)
+        if kind != "excel":
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            rows, columns = None, None
+            if kind == "parquet":
+                import pyarrow.parquet as pq
+                metadata = pq.ParquetFile(filepath).metadata
+                rows, columns = metadata.num_rows, metadata.num_columns
+            return [{"name": name, "rows": rows, "columns": columns, "dimensions": None}]
+
+        excel_file = self._acquire_excel(filepath, open_missing=True)
+        try:
+            return self._read_sheet_info(excel_file, filepath)
+        finally:
+            self._release_excel(excel_file)
+
+    @staticmethod
+    def _read_sheet_info(excel_file, filepath):
+        """Liest Tabellenblätter und Dimensionen aus einem geöffneten Handle"""
+        book = excel_file.book
+        sheet_info = []
+
+        # Calamine kennt die Blattgröße erst nach dem Einlesen aller Zellen
+        xlsx_dimensions = {}
+        if excel_file.engine == "calamine":
+            xlsx_dimensions = sheet_dimensions(filepath)
+
+        for name in excel_file.sheet_names:
+            rows, columns, dimensions = None, None, None
+            try:
+                if excel_file.engine == "xlrd":
+                    sheet = book.sheet_by_name(name)
+                    rows, columns = sheet.nrows, sheet.ncols
+                elif excel_file.engine == "openpyxl":
+                    # Im Read-only-Modus stammen die Werte aus dem <dimension>-Eintrag
+                    sheet = book[name]
+                    rows, columns = sheet.max_row, sheet.max_column
+                    dimensions = sheet.calculate_dimension() if rows else None
+                elif excel_file.engine == "calamine" and name in xlsx_dimensions:
+                    dimensions = xlsx_dimensions[name]
+                    rows, columns = _dimension_size(dimensions)
+            except Exception:
+                pass
+
+            sheet_info.append({
+                "name": name,
+                "rows": rows,
+                "columns": columns,
+                "dimensions": dimensions
+            })
+
+        return sheet_info
+
+    def load_excel(self, filepath, sheet_name=0, skiprows=None, usecols=None, header=0, engine=None,
+                   encoding=None, decimal=None):
+        """Lädt Daten aus einer Excel-, CSV- oder Parquet-Datei
+
+        Ohne Angabe von engine wird die schnellste installierte Engine für den
+        Dateityp gewählt (siehe backend.reader_engines). encoding und decimal
+        gelten nur für CSV-Dateien und werden ohne Angabe aus der Datei ermittelt.
+        """
+        try:
+            engine = select_engine(filepath, engine)
+            read_options = {
+                "sheet_name": sheet_name,
+                "skiprows": skiprows,
+                "usecols": usecols,
+                "header": header
+            }
+            if file_type(filepath) == "csv":
+                read_options.update(encoding=encoding, decimal=decimal)
+
+            # Parquet-Dateien sind bereits spaltenorientiert und werden nicht gecacht
+            use_cache = self.cache is not None and file_type(filepath) != "parquet"
+
+            # Unveränderte Dateien direkt aus dem Cache laden
+            if use_cache:
+                df = self.cache.get(filepath, engine=engine, **read_options)
+                if df is not None:
+                    return df
+
+            # Bereits geöffnete Arbeitsmappe wiederverwenden, sofern sie dieselbe Engine nutzt
+            excel_file = self._acquire_excel(filepath)
+            try:
+                if excel_file is not None and excel_file.engine == engine:
+                    df = pd.read_excel(excel_file, **read_options)
+                else:
+                    df = read_table(filepath, engine=engine, **read_options)
+            finally:
+                self._release_excel(excel_file)
+
+            if use_cache:
+                self.cache.put(filepath, df, engine=engine, **read_options)
+
             return df
         except Exception as e:
             raise Exception(f"Fehler beim Laden der Excel-Datei: {str(e)}")
 
+    def load_batch(self, source, sheet_name=0, max_workers=None, progress_callback=None,
+                   optimize=False, is_cancelled=None, **read_options):
+        """Lädt mehrere Dateien und Tabellenblätter parallel in einem Prozesspool
+
+        source: Verzeichnis, Glob-Muster oder Liste von Dateipfaden
+        sheet_name: Index, Name, Liste, Muster mit * / ? oder None für alle Blätter
+            (Text aus Ziffern gilt nur dann als Index, wenn kein Blatt so heißt)
+        optimize: Datentypen bereits im Prozesspool verkleinern (siehe optimize_dtypes)
+        is_cancelled: wird nach jeder Datei geprüft; liefert es True, werden noch
+            nicht gestartete Dateien verworfen und das Teilergebnis zurückgegeben
+
+        Datensätze heißen wie die Datei (ohne Endung). Gleichnamige Dateien
+        werden um die Endung und bei Bedarf den Ordner ergänzt; ist ein Name
+        dennoch bereits vergeben, wird das Tabellenblatt unter errors gemeldet.
+        """
+        # Dateien ermitteln
+        if isinstance(source, (list, tuple)):
+            files = list(source)
+        elif os.path.isdir(source):
+            files = [os.path.join(source, name) for name in sorted(os.listdir(source))
+                     if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith("~$")]
+        else:
+            files = sorted(glob.glob(source))
+
+        # Bei genau einem Tabellenblatt pro Datei genügt der Dateiname als Schlüssel
+        single_sheet = isinstance(sheet_name, int) or (
+            isinstance(sheet_name, str) and not any(char in sheet_name for char in "*?["))
+
+        names = _dataset_names(files)
+
+        result = {"datasets": {}, "sources": {}, "memory": {}, "errors": {}, "stats": {}}
+        start = time.perf_counter()
+        total_rows = 0
+        done = 0
+
+        if files:
+            # "spawn" vermeidet das Forken eines laufenden Qt-Prozesses
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                futures = {
+                    executor.submit(_load_batch_file, path, sheet_name, read_options, optimize): path
+                    for path in files
+                }
+
+                for future in as_completed(futures):
+                    path = futures[future]
+                    done += 1
+
+                    # Fehler pro Datei bzw. Tabellenblatt isolieren
+                    try:
+                        sheets, sheet_errors = future.result()
+                    except Exception as e:
+                        sheets, sheet_errors = [], {None: str(e)}
+
+                    for sheet, df, memory_report in sheets:
+                        key = names[path] if single_sheet else f"{names[path]}_{sheet}"
+                        if key in result["datasets"]:
+                            result["errors"][f"{path} [{sheet}]"] = f"Datensatzname '{key}' ist bereits vergeben"
+                            continue
+                        result["datasets"][key] = df
+                        result["sources"][key] = (path, sheet)
+                        if memory_report is not None:
+                            result["memory"][key] = memory_report
+                        total_rows += len(df)
+
+                    for sheet, message in sheet_errors.items():
+                        error_key = path if sheet is None else f"{path} [{sheet}]"
+                        result["errors"][error_key] = message
+
+                    if progress_callback is not None:
+                        progress_callback(done, len(files))
+
+                    if is_cancelled is not None and is_cancelled():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+
+        elapsed = time.perf_counter() - start
+        result["stats"] = {
+            "files": len(files),
+            "sheets": len(result["datasets"]),
+            "rows": total_rows,
+            "errors": len(result["errors"]),
+            "seconds": elapsed,
+            "files_per_second": len(files) / elapsed if elapsed > 0 else 0.0,
+            "rows_per_second": total_rows / elapsed if elapsed > 0 else 0.0
+        }
+        return result
+
+    def iter_excel_chunks(self, filepath, sheet_name=0, chunksize=50000, skiprows=None,
+                          usecols=None, header=0, encoding=None, decimal=None, schema_sample_rows=None):
+        """Liest ein Tabellenblatt blockweise als DataFrames mit einheitlichem Schema ein
+
+        Das Schema wird aus den ersten schema_sample_rows Zeilen abgeleitet
+        (Standard SCHEMA_SAMPLE_ROWS) und gilt danach für alle Blöcke. Passt ein
+        späterer Wert nicht dazu, wird ein ValueError ausgelöst.
+        encoding und decimal gelten nur für CSV-Dateien (siehe load_excel).
+        """
+        kind = file_type(filepath)
+        if kind == "csv":
+            chunks = pd.read_csv(filepath, chunksize=chunksize, skiprows=skiprows, usecols=usecols,
+                                 header=header, **csv_options(filepath, skiprows, encoding, decimal))
+            yield from _iter_with_schema(chunks, schema_sample_rows)
+            return
+        if kind == "parquet":
+            import pyarrow.parquet as pq
+            batches = pq.ParquetFile(filepath).iter_batches(batch_size=chunksize, columns=usecols)
+            yield from _iter_with_schema((batch.to_pandas() for batch in batches), schema_sample_rows)
+            return
+
+        from openpyxl import load_workbook
+        from openpyxl.utils import column_index_from_string
+
+        # Bereits geöffnete Arbeitsmappe (openpyxl) wiederverwenden
+        excel_file = self._acquire_excel(filepath)
+        workbook = excel_file.book if excel_file is not None else None
+        owns_workbook = not hasattr(workbook, "worksheets")
+
+        if owns_workbook:
+            self._release_excel(excel_file)
+            excel_file = None
+            try:
+                workbook = load_workbook(filepath, read_only=True, data_only=True)
+            except Exception as e:
+                raise Exception(f"Fehler beim Laden der Excel-Datei: {str(e)}")
+
+        try:
+            if isinstance(sheet_name, int):
+                worksheet = workbook.worksheets[sheet_name]
+            else:
+                worksheet = workbook[sheet_name]
+
+            rows = worksheet.iter_rows(values_only=True)
+
+            # Führende Zeilen überspringen (Anzahl oder Liste von Zeilenindizes)
+            if skiprows is not None:
+                if isinstance(skiprows, int):
+                    rows = islice(rows, skiprows, None)
+                else:
+                    skip = set(skiprows)
+                    rows = (row for i, row in enumerate(rows) if i not in skip)
+
+            # Spaltennamen bestimmen
+            if header is None:
+                first_row = next(rows, None)
+                if first_row is None:
+                    return
+                rows = _chain_first(first_row, rows)
+                columns = list(range(len(first_row)))
+            else:
+                rows = islice(rows, header, None)
+                header_row = next(rows, None)
+                if header_row is None:
+                    return
+                columns = [name if name is not None else f"Unnamed: {i}"
+                           for i, name in enumerate(header_row)]
+
+            # Spaltenauswahl in Positionen übersetzen
+            positions = list(range(len(columns)))
+            if usecols is not None:
+                if isinstance(usecols, str):
+                    positions = []
+                    for part in usecols.split(","):
+                        start, _, end = part.strip().partition(":")
+                        first = column_index_from_string(start) - 1
+                        last = column_index_from_string(end) - 1 if end else first
+                        positions.extend(range(first, last + 1))
+                else:
+                    positions = [col if isinstance(col, int) else columns.index(col)
+                                 for col in usecols]
+                columns = [columns[i] for i in positions]
+
+            def blocks():
+                while True:
+                    block = list(islice(rows, chunksize))
+                    if not block:
+                        break
+                    records = [[row[i] if i < len(row) else None for i in positions] for row in block]
+                    yield pd.DataFrame(records, columns=columns)
+
+            yield from _iter_with_schema(blocks(), schema_sample_rows)
+        finally:
+            if owns_workbook:
+                workbook.close()
+            else:
+                self._release_excel(excel_file)
+
+    def optimize_dtypes(self, df, category_threshold=0.5, parse_dates=True):
+        """Verkleinert die Datentypen eines DataFrames und liefert (DataFrame, Speicherbericht)"""
+        return optimize_dtypes(df, category_threshold=category_threshold, parse_dates=parse_dates)
+
     def save_to_excel(self, df, filepath, sheet_name="Report", index=True, autoformat=False):
         """Speichert Daten in eine Excel-Datei"""
         try:
@@ -47,42 +454,58 @@ class ControllerToolbox:
         except Exception as e:
             raise Exception(f"Fehler beim Speichern der Excel-Datei: {str(e)}")
 
-    def clean_data(self, df):
-        """Bereinigt Daten (Entfernt Duplikate, behandelt NaN-Werte)"""
+    def clean_data(self, df, copy=True):
+        """Bereinigt Daten (Entfernt Duplikate, behandelt NaN-Werte)
+
+        Mit copy=False darf der übergebene DataFrame verändert werden, statt
+        eine Kopie anzulegen; weiterverwendet wird immer der Rückgabewert.
+        """
         if df is None:
             raise ValueError("Kein DataFrame übergeben")
 
-        # Kopie erstellen
-        result = df.copy()
-
-        # Duplikate entfernen
-        result = result.drop_duplicates()
+        # Duplikate entfernen, ohne Duplikate bleibt die Tabelle unangetastet
+        duplicated = _duplicated_rows(df)
+        if duplicated.any():
+            result = df[~duplicated]
+        else:
+            result = _working_frame(df, copy)
 
-        # NaN-Werte behandeln
+        # NaN-Werte spaltenweise ersetzen, nur in Spalten mit Lücken
         numeric_cols = result.select_dtypes(include=['number']).columns
-        result[numeric_cols] = result[numeric_cols].fillna(0)
+        fill_values = {col: 0 for col in numeric_cols if result[col].hasnans}
 
-        # Nicht-numerische Spalten
+        # Nicht-numerische Spalten (kategorische Spalten benötigen die Kategorie "")
         non_numeric_cols = result.select_dtypes(exclude=['number']).columns
-        result[non_numeric_cols] = result[non_numeric_cols].fillna("")
+        for col in non_numeric_cols:
+            if not result[col].hasnans:
+                continue
+            if isinstance(result[col].dtype, pd.CategoricalDtype) and "" not in result[col].cat.categories:
+                result[col] = result[col].cat.add_categories("")
+            fill_values[col] = ""
+
+        if fill_values:
+            result.fillna(fill_values, inplace=True)
 
         return result
 
-    def calculate_kpis(self, df, revenue_col='Umsatz', cost_col='Kosten', time_col=None):
-        """Berechnet Finanzkennzahlen"""
+    def calculate_kpis(self, df, revenue_col='Umsatz', cost_col='Kosten', time_col=None, group_by=None,
+                       copy=True):
+        """Berechnet Finanzkennzahlen
+
+        Mit group_by (Spalte oder Liste von Spalten, z.B. ['Kostenstelle', 'Produkt'])
+        werden die Wachstumsraten je Gruppe in zeitlicher Reihenfolge berechnet.
+        Mit copy=False werden die Kennzahlen direkt im übergebenen DataFrame ergänzt.
+        """
         if df is None:
             raise ValueError("Kein DataFrame übergeben")
 
-        # Kopie erstellen
-        result = df.copy()
+        group_by = _as_list(group_by)
+        with_time = bool(time_col) and time_col in df.columns
 
-        # Grundlegende KPIs berechnen
-        result['DB1'] = result[revenue_col] - result[cost_col]
-        result['Marge'] = (result['DB1'] / result[revenue_col] * 100).round(2)
-        result['Kostenquote'] = (result[cost_col] / result[revenue_col] * 100).round(2)
+        # Arbeitskopie (bei Copy-on-Write ohne Duplizieren der Daten)
+        result = _working_frame(df, copy)
 
-        # Zeitbasierte Berechnungen, wenn Zeitspalte vorhanden
-        if time_col and time_col in result.columns:
+        if with_time:
             # Sicherstellen, dass die Zeitspalte den richtigen Datentyp hat
             if not pd.api.types.is_datetime64_any_dtype(result[time_col]):
                 try:
@@ -90,70 +513,168 @@ class ControllerToolbox:
                 except:
                     pass
 
-            # Nach Zeit sortieren
-            result = result.sort_values(by=time_col)
+            # Nach Gruppe und Zeit sortieren, bevor die Kennzahlspalten hinzukommen
+            # (stabil, damit gleiche Zeitpunkte ihre Reihenfolge behalten)
+            if copy:
+                result = result.sort_values(by=group_by + [time_col], kind='mergesort')
+            else:
+                result.sort_values(by=group_by + [time_col], kind='mergesort', inplace=True)
+
+        # Grundlegende KPIs berechnen
+        result['DB1'] = result[revenue_col] - result[cost_col]
+        result['Marge'] = (result['DB1'] / result[revenue_col] * 100).round(2)
+        result['Kostenquote'] = (result[cost_col] / result[revenue_col] * 100).round(2)
+
+        # Zeitbasierte Berechnungen, wenn Zeitspalte vorhanden
+        if with_time:
+            # Gruppenanfänge in der sortierten Tabelle (ein vektorisierter Durchlauf über alle Gruppen)
+            group_starts = np.zeros(len(result), dtype=bool)
+            if group_by:
+                codes = result.groupby(group_by, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+                group_starts[1:] = codes[1:] != codes[:-1]
 
-            # Wachstumsraten berechnen
-            result['Umsatzwachstum'] = result[revenue_col].pct_change() * 100
-            result['Kostenwachstum'] = result[cost_col].pct_change() * 100
-            result['DB_Wachstum'] = result['DB1'].pct_change() * 100
+            # Wachstumsraten spaltenweise berechnen (hält nur eine Zwischenspalte im Speicher)
+            value_cols = [revenue_col, cost_col, 'DB1']
+            for growth_col, value_col in zip(GROWTH_COLUMNS, value_cols):
+                result[growth_col] = _pct_change(result[value_col].to_numpy(dtype=float), group_starts) * 100
 
         return result
 
-    def variance_analysis(self, actual_df, plan_df, key_column, value_columns=None):
-        """Führt eine Abweichungsanalyse zwischen Ist- und Plandaten durch"""
+    def update_kpis(self, previous_kpis, new_rows, revenue_col='Umsatz', cost_col='Kosten', time_col=None,
+                    group_by=None):
+        """Ergänzt ein berechnetes KPI-Ergebnis um neue Zeilen, ohne die Historie neu zu berechnen
+
+        Die Wachstumsraten der ersten neuen Zeile (je Gruppe) beziehen sich auf
+        die letzte Zeile des bisherigen Ergebnisses. Liegen neue Zeilen zeitlich
+        vor dem Ende der Historie, wird vollständig neu berechnet.
+        """
+        if previous_kpis is None or new_rows is None:
+            raise ValueError("Kein DataFrame übergeben")
+
+        group_by = _as_list(group_by)
+
+        if previous_kpis.empty:
+            return self.calculate_kpis(new_rows, revenue_col, cost_col, time_col, group_by)
+        if new_rows.empty:
+            return previous_kpis
+
+        # KPIs der neuen Zeilen (ohne Wachstumsraten)
+        new_kpis = self.calculate_kpis(new_rows, revenue_col, cost_col)
+
+        if not time_col or time_col not in new_kpis.columns:
+            return pd.concat([previous_kpis, new_kpis])
+
+        if not pd.api.types.is_datetime64_any_dtype(new_kpis[time_col]):
+            try:
+                new_kpis[time_col] = pd.to_datetime(new_kpis[time_col])
+            except:
+                pass
+
+        # Neue Zeilen vor dem Ende der Historie: vollständige Neuberechnung
+        if new_kpis[time_col].min() < previous_kpis[time_col].max():
+            source_columns = [col for col in previous_kpis.columns if col not in KPI_COLUMNS + GROWTH_COLUMNS]
+            combined = pd.concat([previous_kpis[source_columns], new_rows])
+            return self.calculate_kpis(combined, revenue_col, cost_col, time_col, group_by)
+
+        new_kpis = new_kpis.sort_values(by=group_by + [time_col], kind='mergesort')
+        value_cols = [revenue_col, cost_col, 'DB1']
+
+        if group_by:
+            # Letzte bisherige Zeile je Gruppe als Ausgangswert voranstellen
+            seeds = previous_kpis.groupby(group_by, sort=False, observed=True, dropna=False).tail(1)
+            values = pd.concat([seeds[group_by + value_cols], new_kpis[group_by + value_cols]],
+                               ignore_index=True)
+            grouped = values.groupby(group_by, sort=False, observed=True, dropna=False)
+            growth = grouped[value_cols].pct_change().iloc[len(seeds):] * 100
+        else:
+            seed = previous_kpis.iloc[[-1]]
+            values = pd.concat([seed[value_cols], new_kpis[value_cols]], ignore_index=True)
+            growth = values.pct_change().iloc[1:] * 100
+
+        for growth_col, value_col in zip(GROWTH_COLUMNS, value_cols):
+            new_kpis[growth_col] = growth[value_col].to_numpy()
+
+        return pd.concat([previous_kpis, new_kpis])
+
+    def time_intelligence(self, df, time_col='Datum', value_cols=None, group_by=None, measures=None,
+                          fiscal_year_start=1):
+        """Berechnet YTD, rollierende 12 Monate, Vormonats- und Vorjahresveränderung
+
+        Arbeitet direkt auf dem Ergebnis von calculate_kpis (Standard: Umsatz,
+        Kosten und DB1); Lücken in den Monaten werden nicht aufgefüllt.
+        """
+        return time_intelligence(df, time_col, value_cols, group_by, measures, fiscal_year_start)
+
+    def prepare_plan(self, plan_df, key_column, value_columns=None):
+        """Bereitet Plandaten einmalig für wiederholte Abweichungsanalysen auf"""
+        return PreparedPlan(plan_df, key_column, value_columns)
+
+    def variance_analysis(self, actual_df, plan_df, key_column=None, value_columns=None):
+        """Führt eine Abweichungsanalyse zwischen Ist- und Plandaten durch
+
+        plan_df kann ein DataFrame oder ein mit prepare_plan aufbereiteter Plan sein,
+        key_column eine Spalte oder eine Liste von Spalten (zusammengesetzter Schlüssel).
+        """
         if actual_df is None or plan_df is None:
             raise ValueError("Ist- oder Plan-Daten fehlen")
 
-        # Wenn keine Wertspalten angegeben wurden, gemeinsame numerische Spalten verwenden
-        if value_columns is None:
-            actual_numeric = actual_df.select_dtypes(include=['number']).columns
-            plan_numeric = plan_df.select_dtypes(include=['number']).columns
-            value_columns = list(set(actual_numeric).intersection(set(plan_numeric)))
-            # key_column ausschließen, falls es numerisch ist
-            if key_column in value_columns:
-                value_columns.remove(key_column)
-
-        # Dataframes auf key_column und value_columns beschränken
-        actual_subset = actual_df[[key_column] + value_columns].copy()
-        plan_subset = plan_df[[key_column] + value_columns].copy()
+        if isinstance(plan_df, PreparedPlan):
+            if key_column is not None and key_column != plan_df.key_column:
+                raise ValueError(f"Plan ist nach '{plan_df.key_column}' indiziert, nicht nach '{key_column}'")
+            return plan_df.join(actual_df, value_columns)
 
-        # Suffix für die Spalten
-        actual_suffix = "_ist"
-        plan_suffix = "_plan"
+        key_columns = _as_list(key_column)
+        if not key_columns:
+            raise ValueError("Keine Schlüsselspalte angegeben")
 
-        # Umbenennen der Wertspalten
-        actual_columns = {col: f"{col}{actual_suffix}" for col in value_columns}
-        plan_columns = {col: f"{col}{plan_suffix}" for col in value_columns}
+        # Wenn keine Wertspalten angegeben wurden, gemeinsame numerische Spalten verwenden
+        if value_columns is None:
+            actual_numeric = set(actual_df.select_dtypes(include=['number']).columns)
+            value_columns = [col for col in plan_df.select_dtypes(include=['number']).columns
+                             if col in actual_numeric and col not in key_columns]
 
-        actual_subset = actual_subset.rename(columns=actual_columns)
-        plan_subset = plan_subset.rename(columns=plan_columns)
+        return PreparedPlan(plan_df, key_column, value_columns).join(actual_df, value_columns)
 
-        # Zusammenführen der Daten
-        merged = pd.merge(actual_subset, plan_subset, on=key_column, how='outer')
+    def variance_decomposition(self, actual_df, plan_df, key_columns, volume_col='Menge', revenue_col='Umsatz',
+                               mix_level=None):
+        """Zerlegt die Umsatzabweichung in Preis-, Mengen- und Mixabweichung"""
+        return variance_decomposition(actual_df, plan_df, key_columns, volume_col, revenue_col, mix_level)
 
-        # Berechnung der Abweichungen
-        for col in value_columns:
-            actual_col = f"{col}{actual_suffix}"
-            plan_col = f"{col}{plan_suffix}"
+    def create_forecast(self, df, time_col='Datum', value_col='Wert', periods=12, method='ets', group_by=None,
+                        progress_callback=None, **options):
+        """Erstellt eine Zeitreihenprognose
 
-            # Absolute Abweichung
-            merged[f"{col}_var"] = merged[actual_col] - merged[plan_col]
+        Mit group_by (z.B. 'Kostenstelle') werden alle Reihen gemeinsam prognostiziert.
+        Einfache Verfahren rechnen vektorisiert über alle Reihen, ARIMA im Prozesspool.
+        """
+        if df is None:
+            raise ValueError("Kein DataFrame übergeben")
 
-            # Prozentuale Abweichung
-            merged[f"{col}_var_pct"] = (merged[f"{col}_var"] / merged[plan_col] * 100).round(2)
+        return forecast(df, time_col, value_col, periods, method, group_by,
+                        progress_callback=progress_callback, **options)
 
-        return merged
+    def plot_time_series(self, df, x_col='Datum', y_col='Wert', title='Zeitreihenanalyse', max_points=2000,
+                         downsampling='lttb'):
+        """Erstellt ein Zeitreihendiagramm
 
-    def plot_time_series(self, df, x_col='Datum', y_col='Wert', title='Zeitreihenanalyse'):
-        """Erstellt ein Zeitreihendiagramm"""
+        Lange Reihen werden auf max_points Punkte reduziert (LTTB oder Min/Max je
+        Intervall) und beim Zoomen im sichtbaren Bereich neu reduziert. Die
+        vollständigen Daten bleiben an der Linie verfügbar
+        (export_chart_data). max_points=0 zeichnet alle Punkte.
+        """
         if df is None:
             raise ValueError("Kein DataFrame übergeben")
 
-        fig, ax = plt.subplots(figsize=(10, 6))
+        # Objektorientierte Figure-API (ohne pyplot), damit Diagramme auch in Worker-Threads entstehen können
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot(111)
 
-        # Daten plotten
-        ax.plot(df[x_col], df[y_col], marker='o', linestyle='-', color='#3498db')
+        # Daten plotten (Punktmarker nur, solange die Reihe nicht reduziert wird)
+        if max_points and len(df) > max_points:
+            plot_decimated(ax, df[x_col], df[y_col], max_points, downsampling, linestyle='-', color='#3498db',
+                           label=y_col)
+        else:
+            ax.plot(df[x_col], df[y_col], marker='o', linestyle='-', color='#3498db', label=y_col)
 
         # Achsenbeschriftungen
         ax.set_xlabel(x_col)
@@ -167,7 +688,7 @@ class ControllerToolbox:
         if pd.api.types.is_datetime64_any_dtype(df[x_col]):
             fig.autofmt_xdate()
 
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
 
     def plot_variance(self, variance_df, key_column, actual_column, plan_column, var_column, title=None):
@@ -175,29 +696,36 @@ class ControllerToolbox:
         if variance_df is None:
             raise ValueError("Kein DataFrame übergeben")
 
-        fig, ax1 = plt.subplots(figsize=(10, 6))
+        fig = Figure(figsize=(10, 6))
+        ax1 = fig.add_subplot(111)
 
         # X-Achsen-Werte
-        x = range(len(variance_df))
+        x = np.arange(len(variance_df))
         width = 0.35
 
         # Balken für Ist- und Plan-Werte
-        bars1 = ax1.bar([i - width / 2 for i in x], variance_df[actual_column], width, label='Ist', color='#3498db')
-        bars2 = ax1.bar([i + width / 2 for i in x], variance_df[plan_column], width, label='Plan', color='#2ecc71')
+        bars1 = _draw_bars(ax1, x - width / 2, variance_df[actual_column], width, label='Ist', color='#3498db')
+        bars2 = _draw_bars(ax1, x + width / 2, variance_df[plan_column], width, label='Plan', color='#2ecc71')
 
         # Y-Achse formatieren
         ax1.set_ylabel('Wert')
         ax1.tick_params(axis='y')
 
-        # X-Achse formatieren
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(variance_df[key_column])
+        # X-Achse formatieren (bei vielen Schlüsseln nur jede n-te Beschriftung)
+        keys = variance_df[key_column].astype(str).tolist()
+        if len(keys) <= MAX_CATEGORY_LABELS:
+            ax1.set_xticks(x)
+            ax1.set_xticklabels(keys)
+        else:
+            ax1.xaxis.set_major_locator(MaxNLocator(nbins=MAX_CATEGORY_LABELS, integer=True))
+            ax1.xaxis.set_major_formatter(
+                FuncFormatter(lambda value, _: keys[int(value)] if 0 <= int(value) < len(keys) else ""))
 
         # Zweite Y-Achse für Abweichung
         ax2 = ax1.twinx()
 
         # Linie für absolute Abweichung
-        line = ax2.plot(x, variance_df[var_column], 'r-', marker='o', label='Abweichung', color='#e74c3c')
+        line = ax2.plot(x, variance_df[var_column], '-', marker='o', label='Abweichung', color='#e74c3c')
 
         # Y-Achse für Abweichung formatieren
         ax2.set_ylabel('Abweichung')
@@ -212,13 +740,53 @@ class ControllerToolbox:
 
         # Titel setzen
         if title:
-            plt.title(title)
+            ax1.set_title(title)
         else:
-            plt.title(f"Plan-Ist-Vergleich: {actual_column.split('_')[0]}")
+            ax1.set_title(f"Plan-Ist-Vergleich: {actual_column.split('_')[0]}")
 
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
 
+    def render_chart(self, df, chart_type, progress_callback=None, **parameters):
+        """Erstellt ein Diagramm und zeichnet es einmal mit Agg vor
+
+        Verwendet nur die Figure-API und ist damit threadsicher; Layout und
+        Textmaße sind nach dem Vorzeichnen berechnet.
+        """
+        if chart_type == "time_series":
+            fig = self.plot_time_series(df, **parameters)
+        elif chart_type == "variance":
+            fig = self.plot_variance(df, **parameters)
+        else:
+            raise ValueError(f"Unbekannter Diagrammtyp: {chart_type}")
+
+        FigureCanvasAgg(fig).draw()
+        return fig
+
+    def export_chart_data(self, figure, output_path):
+        """Exportiert die Daten aller Linien eines Diagramms in voller Auflösung
+
+        Auch reduziert gezeichnete Zeitreihen werden vollständig exportiert.
+        .csv und .parquet erhalten alle Reihen untereinander (Spalte 'Reihe'),
+        .xlsx ein Tabellenblatt je Reihe.
+        """
+        data = full_resolution_data(figure)
+        if not data:
+            raise ValueError("Das Diagramm enthält keine Datenreihen")
+
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension == ".xlsx":
+            sheets = {re.sub(r'[\[\]:*?/\\]', '_', str(label))[:31] or "Daten": df for label, df in data.items()}
+            return self.create_excel_report(sheets, output_path=output_path)
+
+        combined = pd.concat([df.assign(Reihe=label) for label, df in data.items()], ignore_index=True)
+        combined = combined[["Reihe", "x", "y"]]
+        if extension == ".parquet":
+            combined.to_parquet(output_path, index=False)
+        else:
+            combined.to_csv(output_path, sep=";", decimal=",", index=False)
+        return output_path
+
     def create_excel_report(self, data_dict, template_path=None, output_path=None):
         """Erstellt einen Excel-Bericht"""
         # Wenn kein Ausgabepfad angegeben, einen erstellen
@@ -233,4 +801,277 @@ class ControllerToolbox:
                 # DataFrame ins Excel schreiben
                 df.to_excel(writer, sheet_name=sheet_name, index=False)
 
-        return output_path
\ No newline at end of file
+        return output_path
+
+
+# Zeilenzahl, aus der iter_excel_chunks das Spaltenschema ableitet
+SCHEMA_SAMPLE_ROWS = 100000
+
+# Von calculate_kpis ergänzte Spalten
+KPI_COLUMNS = ['DB1', 'Marge', 'Kostenquote']
+GROWTH_COLUMNS = ['Umsatzwachstum', 'Kostenwachstum', 'DB_Wachstum']
+
+# Höchstzahl einzeln beschrifteter Schlüssel im Abweichungsdiagramm
+MAX_CATEGORY_LABELS = 40
+
+# Ab dieser Balkenzahl werden Balken als eine Sammlung statt einzeln gezeichnet
+MAX_BAR_PATCHES = 500
+
+
+def _draw_bars(ax, left, heights, width, label=None, color=None):
+    """Zeichnet Balken; viele Balken als eine PolyCollection statt je ein Rechteck
+
+    ax.bar legt je Balken ein eigenes Artist-Objekt an, was bei tausenden
+    Balken Sekunden kostet. Die Eckpunkte der Rechtecke (links unten, links
+    oben, rechts oben, rechts unten) werden hier vektorisiert berechnet.
+    """
+    heights = np.asarray(heights, dtype=float)
+    if len(heights) <= MAX_BAR_PATCHES:
+        return ax.bar(left, heights, width, label=label, color=color)
+
+    right = np.asarray(left, dtype=float) + width
+    left = right - width
+    bottom = np.zeros_like(heights)
+    heights = np.nan_to_num(heights)
+    vertices = np.stack([np.column_stack([left, bottom]), np.column_stack([left, heights]),
+                         np.column_stack([right, heights]), np.column_stack([right, bottom])], axis=1)
+
+    bars = PolyCollection(vertices, facecolors=color, edgecolors='none', label=label)
+    ax.add_collection(bars, autolim=True)
+    ax.autoscale_view()
+    return bars
+
+
+def _copy_on_write_enabled():
+    """Prüft, ob pandas Copy-on-Write verwendet (ab pandas 3 immer aktiv)
+
+    Der Modus "warn" aus pandas 2 warnt nur und kopiert nicht.
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return getattr(pd.options.mode, 'copy_on_write', False) is True
+
+
+def _working_frame(df, copy):
+    """Liefert den DataFrame, in dem eine Methode Spalten ergänzen darf
+
+    Ohne Kopie wird das Original verändert. Mit Copy-on-Write genügt eine flache
+    Kopie, da Daten erst beim Schreiben dupliziert werden.
+    """
+    if not copy:
+        return df
+    return df.copy(deep=not _copy_on_write_enabled())
+
+
+def _pct_change(values, group_starts):
+    """Veränderung gegenüber der Vorzeile wie Series.pct_change, je Gruppe neu beginnend"""
+    change = np.empty(len(values), dtype=float)
+    if len(values):
+        change[0] = np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(values[1:], values[:-1], out=change[1:])
+        change[1:] -= 1
+        change[group_starts] = np.nan
+    return change
+
+
+def _duplicated_rows(df):
+    """Markiert doppelte Zeilen wie DataFrame.duplicated mit geringem Speicherbedarf
+
+    Zeilen werden spaltenweise zu 64-Bit-Hashes verdichtet. Nur Zeilen mit
+    mehrfach vorkommendem Hash werden anschließend exakt verglichen.
+    """
+    row_count = len(df)
+    duplicated = np.zeros(row_count, dtype=bool)
+    if row_count < 2 or df.shape[1] == 0:
+        return duplicated
+
+    hashes = np.zeros(row_count, dtype=np.uint64)
+    for col in range(df.shape[1]):
+        series = df.iloc[:, col]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            column_hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        else:
+            # Textspalten über ihre Codes hashen (vermeidet Kopien als Python-Objekte)
+            column_hashes = pd.util.hash_array(pd.factorize(series)[0])
+        hashes *= np.uint64(1000003)
+        hashes ^= column_hashes
+
+    # Kandidaten über sortierte Hashes finden
+    order = np.argsort(hashes, kind='stable')
+    hashes = hashes[order]
+    same = hashes[1:] == hashes[:-1]
+    if not same.any():
+        return duplicated
+
+    candidates = np.zeros(row_count, dtype=bool)
+    candidates[order[1:][same]] = True
+    candidates[order[:-1][same]] = True
+    duplicated[candidates] = df[candidates].duplicated().to_numpy()
+    return duplicated
+
+
+def _dimension_size(dimensions):
+    """Zeilen- und Spaltenzahl aus einem Bereich wie "A1:D6" (bis zur letzten Zelle)"""
+    letters, row = re.fullmatch(r"([A-Z]+)(\d+)", dimensions.split(":")[-1]).groups()
+    column = 0
+    for letter in letters:
+        column = column * 26 + ord(letter) - ord("A") + 1
+    return int(row), column
+
+
+def _select_sheets(sheet_names, selector):
+    """Wählt Tabellenblätter anhand eines Selektors aus"""
+    if selector is None:
+        return list(sheet_names)
+    if isinstance(selector, int):
+        return [sheet_names[selector]]
+    if isinstance(selector, str):
+        if any(char in selector for char in "*?["):
+            return [name for name in sheet_names if fnmatch(name, selector)]
+        # Blattnamen aus Ziffern (z.B. "2024") haben Vorrang vor der Position
+        if selector not in sheet_names and selector.isdigit():
+            return [sheet_names[int(selector)]]
+        return [selector]
+
+    selected = []
+    for item in selector:
+        selected.extend(_select_sheets(sheet_names, item))
+    return selected
+
+
+def _dataset_names(files):
+    """Eindeutige Datensatznamen je Datei für load_batch
+
+    Grundsätzlich der Dateiname ohne Endung. Kommt er mehrfach vor (z.B.
+    GE01.xlsx und GE01.csv), wird die Endung angehängt, bei gleichnamigen
+    Dateien aus verschiedenen Ordnern zusätzlich der Ordnername vorangestellt.
+    """
+    def candidates(path):
+        folder = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        stem, extension = os.path.splitext(os.path.basename(path))
+        with_extension = f"{stem}_{extension.lstrip('.')}" if extension else stem
+        return [stem, with_extension, f"{folder}_{with_extension}"]
+
+    options = {path: candidates(path) for path in files}
+    names = {}
+    for path, own in options.items():
+        names[path] = own[-1]
+        for level, name in enumerate(own):
+            if sum(other[level] == name for other in options.values()) == 1:
+                names[path] = name
+                break
+    return names
+
+
+def _load_batch_file(path, sheet_selector, read_options, optimize=False):
+    """Liest die ausgewählten Tabellenblätter einer Datei (läuft im Prozesspool)"""
+    sheets = []
+    errors = {}
+
+    def finish(sheet, df):
+        # Verkleinerte Datentypen verringern auch die Übertragung aus dem Prozess
+        if optimize:
+            df, memory_report = optimize_dtypes(df)
+            return sheet, df, memory_report
+        return sheet, df, None
+
+    # CSV- und Parquet-Dateien enthalten nur eine Tabelle
+    if file_type(path) != "excel":
+        name = os.path.splitext(os.path.basename(path))[0]
+        return [finish(name, read_table(path, **read_options))], errors
+
+    with pd.ExcelFile(path, engine=select_engine(path)) as excel_file:
+        for sheet in _select_sheets(excel_file.sheet_names, sheet_selector):
+            try:
+                sheets.append(finish(sheet, excel_file.parse(sheet, **read_options)))
+            except Exception as e:
+                errors[sheet] = str(e)
+
+    return sheets, errors
+
+
+def _chain_first(first, rest):
+    """Stellt ein bereits gelesenes Element wieder an den Anfang eines Iterators"""
+    yield first
+    yield from rest
+
+
+def _iter_with_schema(chunks, sample_rows=None):
+    """Bringt alle Blöcke auf ein Schema, das aus den ersten sample_rows Zeilen abgeleitet wird
+
+    Die Blöcke der Stichprobe werden zurückgehalten, bis sie vollständig ist;
+    danach ändert sich der Typ einer Spalte nicht mehr.
+    """
+    if sample_rows is None:
+        sample_rows = SCHEMA_SAMPLE_ROWS
+
+    sample = []
+    for chunk in chunks:
+        sample.append(chunk)
+        if sum(len(block) for block in sample) >= sample_rows:
+            break
+    if not sample:
+        return
+
+    schema = _infer_chunk_schema(pd.concat(sample, ignore_index=True) if len(sample) > 1 else sample[0])
+    rows = 0
+    for chunk in chain(sample, chunks):
+        yield _apply_chunk_schema(chunk, schema, rows)
+        rows += len(chunk)
+
+
+def _infer_chunk_schema(sample):
+    """Leitet aus der Stichprobe ein stabiles Spaltenschema ab
+
+    Nur Spalten, die in der ganzen Stichprobe Zahlen bzw. Datumswerte enthalten,
+    werden als solche geführt. Gemischte Spalten (z.B. Kontonummern 4711 und
+    '4714A') gelten von Anfang an als Text.
+    """
+    schema = {}
+    for col in sample.columns:
+        values = sample[col].infer_objects()
+        if pd.api.types.is_bool_dtype(values):
+            schema[col] = "bool"
+        elif pd.api.types.is_numeric_dtype(values):
+            # Ganzzahlen als float64, damit spätere Lücken das Schema nicht ändern
+            schema[col] = "float64"
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            schema[col] = "datetime64[ns]"
+        else:
+            schema[col] = "str"
+    return schema
+
+
+def _apply_chunk_schema(chunk, schema, first_row=0):
+    """Wandelt einen Block in das vorgegebene Schema um
+
+    Passt ein Wert nach der Stichprobe nicht mehr zum Typ seiner Spalte, wird
+    ein ValueError ausgelöst, statt den Wert zu verlieren oder den Typ der
+    Spalte nachträglich zu ändern.
+    """
+    for col, dtype in schema.items():
+        values = chunk[col]
+        if dtype == "str":
+            # Text einheitlich als str, Lücken bleiben leer
+            chunk[col] = values.map(str, na_action="ignore").astype("object")
+            continue
+
+        if dtype == "float64":
+            converted = pd.to_numeric(values, errors="coerce").astype("float64")
+            invalid = converted.isna() & values.notna()
+        elif dtype == "datetime64[ns]":
+            converted = pd.to_datetime(values, errors="coerce").astype("datetime64[ns]")
+            invalid = converted.isna() & values.notna()
+        else:
+            converted = values.astype("object")
+            invalid = values.notna() & ~values.map(lambda value: isinstance(value, (bool, np.bool_)))
+
+        if invalid.any():
+            position = int(np.flatnonzero(invalid.to_numpy())[0])
+            raise ValueError(
+                f"Spalte '{col}' enthält in Zeile {first_row + position + 1} den Wert "
+                f"'{values.iloc[position]}', der nicht zum Typ {dtype} aus der Stichprobe passt; "
+                f"schema_sample_rows erhöhen, damit die Spalte als Text gelesen wird")
+        chunk[col] = converted
+    return chunk
\ No newline at end of file
@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+
+# Verfügbare Reduktionsverfahren
+DOWNSAMPLING_METHODS = ["lttb", "minmax"]
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: wählt threshold Punkte, die die Form der Kurve erhalten
+
+    x muss aufsteigend sortiert sein. Gibt die Positionen der gewählten Punkte
+    zurück (erster und letzter Punkt sind immer enthalten).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    # Eimergrenzen ohne ersten und letzten Punkt
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+
+    # Mittelwert des jeweils folgenden Eimers (vorab für alle Eimer)
+    sums_x = np.add.reduceat(x[1:count - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:count - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    means_x = np.append(sums_x / sizes, x[-1])
+    means_y = np.append(sums_y / sizes, y[-1])
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_x, next_y = means_x[bucket + 1], means_y[bucket + 1]
+
+        # Doppelte Dreiecksfläche aus Vorgänger, Kandidat und Mittel des nächsten Eimers
+        areas = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                       - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def min_max(x, y, buckets):
+    """Minimum und Maximum je gleich breitem x-Intervall (vollständig vektorisiert)
+
+    x muss aufsteigend sortiert sein. Gibt die Positionen der gewählten Punkte
+    in aufsteigender Reihenfolge zurück (höchstens 2 * buckets + 2).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    count = len(x)
+    if 2 * buckets >= count or buckets < 1:
+        return np.arange(count)
+
+    # Eimer je x-Intervall (entspricht bei buckets = Achsenbreite in Pixeln einem Pixel)
+    span = x[-1] - x[0]
+    if span <= 0:
+        bucket_of = np.minimum((np.arange(count) * buckets) // count, buckets - 1)
+    else:
+        bucket_of = np.minimum(((x - x[0]) / span * buckets).astype(np.int64), buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket_of[1:] != bucket_of[:-1]])
+    counts = np.diff(np.r_[starts, count])
+    segment = np.repeat(np.arange(len(starts)), counts)
+
+    # Je Eimer erste Position des Minimums und des Maximums
+    minimum = np.flatnonzero(y == np.repeat(np.minimum.reduceat(y, starts), counts))
+    maximum = np.flatnonzero(y == np.repeat(np.maximum.reduceat(y, starts), counts))
+    first_min = minimum[np.r_[True, segment[minimum][1:] != segment[minimum][:-1]]]
+    first_max = maximum[np.r_[True, segment[maximum][1:] != segment[maximum][:-1]]]
+
+    return np.unique(np.concatenate([[0, count - 1], first_min, first_max]))
+
+
+def downsample(x, y, max_points, method="lttb"):
+    """Positionen der Punkte, die bei höchstens max_points Punkten gezeichnet werden
+
+    Fehlende y-Werte werden übersprungen. max_points <= 0 bedeutet keine Reduktion.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unbekanntes Reduktionsverfahren: {method}")
+
+    y = np.asarray(y, dtype=float)
+    valid = np.flatnonzero(np.isfinite(y))
+    if not max_points or max_points <= 0 or len(valid) <= max_points:
+        return np.arange(len(y))
+
+    x = np.asarray(x, dtype=float)
+    if method == "lttb":
+        chosen = lttb(x[valid], y[valid], max_points)
+    else:
+        chosen = min_max(x[valid], y[valid], max(max_points // 2 - 1, 1))
+    return valid[chosen]
+
+
+def is_continuous(values):
+    """Prüft, ob x-Werte Zahlen oder Datumswerte sind (und damit nach Abstand reduziert werden können)"""
+    values = pd.Series(values)
+    return pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values)
+
+
+def as_numeric(values):
+    """x-Werte als Gleitkommazahlen
+
+    Datumswerte werden in matplotlib-Tage umgerechnet. Andere Werte (z.B. Text
+    wie '2024-01' oder Periodenbezeichnungen) werden über ihre Position reduziert.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return mdates.date2num(values.to_numpy())
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    return np.arange(len(values), dtype=float)
+
+
+class DecimatedLine:
+    """Hält die vollständigen Daten einer reduziert gezeichneten Linie
+
+    Bei Änderung des sichtbaren x-Bereichs (Zoomen, Verschieben) wird der
+    sichtbare Ausschnitt erneut auf max_points Punkte reduziert, sodass beim
+    Hineinzoomen wieder Details erscheinen. full_data liefert die
+    vollständigen Werte, z.B. für einen Datenexport. Nicht stetige x-Werte
+    (Text) werden an ihrer Position gezeichnet.
+    """
+
+    def __init__(self, line, x, y, max_points, method="lttb"):
+        self.line = line
+        self.x = np.asarray(x)
+        self.y = np.asarray(y, dtype=float)
+        self.x_numeric = as_numeric(x)
+        self.x_plot = self.x if is_continuous(x) else self.x_numeric
+        self.max_points = max_points
+        self.method = method
+
+        self.connection = line.axes.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def full_data(self):
+        """Vollständige Daten der Linie als DataFrame"""
+        return pd.DataFrame({"x": self.x, "y": self.y})
+
+    def update(self, x_min=None, x_max=None):
+        """Zeichnet den Bereich [x_min, x_max] (plus je einen Nachbarpunkt) reduziert"""
+        start, stop = 0, len(self.x)
+        if x_min is not None:
+            start = max(int(np.searchsorted(self.x_numeric, x_min, side='left')) - 1, 0)
+        if x_max is not None:
+            stop = min(int(np.searchsorted(self.x_numeric, x_max, side='right')) + 1, len(self.x))
+
+        chosen = start + downsample(self.x_numeric[start:stop], self.y[start:stop], self.max_points,
+                                    self.method)
+        self.line.set_data(self.x_plot[chosen], self.y[chosen])
+
+    def on_xlim_changed(self, axes):
+        x_min, x_max = axes.get_xlim()
+        self.update(x_min, x_max)
+
+
+def plot_decimated(ax, x, y, max_points=2000, method="lttb", **plot_options):
+    """Zeichnet eine Linie, reduziert auf max_points Punkte, und hält die vollständigen Daten bereit
+
+    Zahlen und Datumswerte werden bei Bedarf aufsteigend sortiert. Text wird
+    in seiner Reihenfolge an den Positionen 0..n-1 gezeichnet und über die
+    Achsenbeschriftung angezeigt. Gibt (Linie, DecimatedLine) zurück; die
+    DecimatedLine wird zusätzlich an der Linie gespeichert (line.decimation),
+    damit sie so lange lebt wie die Figur.
+    """
+    x = pd.Series(x).reset_index(drop=True)
+    y = pd.to_numeric(pd.Series(y), errors="coerce").reset_index(drop=True)
+
+    continuous = is_continuous(x)
+    x_numeric = as_numeric(x)
+    if continuous and not pd.Series(x_numeric).is_monotonic_increasing:
+        order = np.argsort(x_numeric, kind='stable')
+        x, y = x.iloc[order].reset_index(drop=True), y.iloc[order].reset_index(drop=True)
+        x_numeric = x_numeric[order]
+
+    x_values = x.to_numpy()
+    y_values = y.to_numpy(dtype=float)
+    x_plot = x_values if continuous else x_numeric
+    chosen = downsample(x_numeric, y_values, max_points, method)
+    line, = ax.plot(x_plot[chosen], y_values[chosen], **plot_options)
+
+    if not continuous:
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(_position_labeler(x_values)))
+
+    decimation = DecimatedLine(line, x_values, y_values, max_points, method)
+    line.decimation = decimation
+    return line, decimation
+
+
+def full_resolution_data(figure):
+    """Daten aller Linien einer Figur in voller Auflösung (Beschriftung -> DataFrame mit x und y)
+
+    Reduziert gezeichnete Linien liefern ihre vollständigen Daten, alle
+    übrigen Datenlinien die gezeichneten Werte.
+    """
+    data = {}
+    for axes in figure.axes:
+        for line in axes.get_lines():
+            if line.get_transform() != axes.transData:
+                continue
+            decimation = getattr(line, "decimation", None)
+            if decimation is not None:
+                data[line.get_label()] = decimation.full_data()
+            else:
+                data[line.get_label()] = pd.DataFrame({"x": line.get_xdata(orig=True), "y": line.get_ydata(orig=True)})
+    return data
+
+
+def _position_labeler(labels):
+    """Achsenbeschriftung für an Positionen gezeichnete Textwerte"""
+    def label(value, position=None):
+        index = int(round(value))
+        return str(labels[index]) if 0 <= index < len(labels) else ""
+    return label
\ No newline at end of file
@@ -0,0 +1,122 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+# Zeichenketten, die wie ein Datum bzw. ein Monat aussehen: ISO (2024-01-31, 2024/01/31,
+# 2024-01) und deutsch (31.01.2024, 01.2024). Jahr und Monat müssen plausibel sein, damit
+# Kostenstellen- und Kontonummern wie 4100-01 oder 1000-10 nicht als Datum gelten.
+_YEAR = r"(?:19|20)\d{2}"
+_MONTH = r"(?:0?[1-9]|1[0-2])"
+_DAY = r"(?:0?[1-9]|[12]\d|3[01])"
+_TIME = r"(?:\s+\d{1,2}:\d{2}(?::\d{2})?)?"
+DATE_PATTERN = re.compile(
+    rf"^\s*(?:{_YEAR}-{_MONTH}(?:-{_DAY}{_TIME})?|{_YEAR}/{_MONTH}/{_DAY}{_TIME}"
+    rf"|{_DAY}\.{_MONTH}\.{_YEAR}{_TIME}|{_MONTH}\.{_YEAR})\s*$"
+)
+GERMAN_MONTH_PATTERN = re.compile(rf"^\s*{_MONTH}\.{_YEAR}\s*$")
+
+# Kleinste Ganzzahltypen, auf die verkleinert wird (kleinere Typen laufen bei
+# elementweisen Berechnungen wie DB1 = Umsatz - Kosten zu leicht über)
+INTEGER_TYPES = [np.int32, np.int64]
+
+
+def memory_usage(df):
+    """Gibt den Speicherbedarf eines DataFrames in Bytes zurück"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def optimize_dtypes(df, category_threshold=0.5, parse_dates=True, sample_size=1000):
+    """Verkleinert die Datentypen eines DataFrames und liefert einen Speicherbericht
+
+    - Zeichenketten mit wenigen Ausprägungen werden kategorisch
+    - Datums- und Monatsangaben als Text werden in datetime64 umgewandelt
+    - Ganzzahlen werden auf int32 verkleinert, Gleitkommazahlen nur verlustfrei auf float32
+    """
+    if df is None:
+        raise ValueError("Kein DataFrame übergeben")
+
+    before = memory_usage(df)
+    result = df.copy()
+    changes = {}
+
+    for col in result.columns:
+        series = result[col]
+        old_dtype = str(series.dtype)
+
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            converted = _downcast_integer(series)
+        elif pd.api.types.is_float_dtype(series):
+            converted = _downcast_float(series)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            converted = _optimize_text(series, category_threshold, parse_dates, sample_size)
+        else:
+            continue
+
+        if converted is not None and str(converted.dtype) != old_dtype:
+            result[col] = converted
+            changes[col] = (old_dtype, str(converted.dtype))
+
+    after = memory_usage(result)
+    report = {
+        "before_bytes": before,
+        "after_bytes": after,
+        "saved_pct": round((1 - after / before) * 100, 1) if before else 0.0,
+        "columns": changes
+    }
+    return result, report
+
+
+def _downcast_integer(series):
+    """Verkleinert eine Ganzzahlspalte auf den kleinsten passenden Typ"""
+    # Nullable-Integer mit Lücken unverändert lassen
+    if series.isna().any():
+        return None
+
+    minimum, maximum = series.min(), series.max()
+    for int_type in INTEGER_TYPES:
+        info = np.iinfo(int_type)
+        if info.min <= minimum and maximum <= info.max:
+            return series.astype(int_type)
+    return None
+
+
+def _downcast_float(series):
+    """Verkleinert Gleitkommazahlen nur, wenn dabei keine Genauigkeit verloren geht
+
+    Auch ganzzahlige Werte bleiben Gleitkommazahlen: Als int32 gespeichert
+    würden Produkte wie Umsatz * Menge unbemerkt überlaufen.
+    """
+    values = series.to_numpy()
+    as_float32 = values.astype(np.float32)
+    if np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True):
+        return series.astype(np.float32)
+    return None
+
+
+def _optimize_text(series, category_threshold, parse_dates, sample_size):
+    """Wandelt Textspalten in Datumswerte oder Kategorien um"""
+    non_null = series.dropna()
+    if non_null.empty:
+        return None
+
+    sample = non_null.iloc[:sample_size]
+    if not all(isinstance(value, str) for value in sample):
+        return None
+
+    # Datumswerte anhand einer Stichprobe erkennen
+    if parse_dates:
+        if all(DATE_PATTERN.match(value) for value in sample):
+            if all(GERMAN_MONTH_PATTERN.match(value) for value in sample):
+                parsed = pd.to_datetime(series.str.strip(), errors="coerce", format="%m.%Y")
+            else:
+                parsed = pd.to_datetime(series, errors="coerce", dayfirst="." in str(sample.iloc[0]))
+            if parsed.notna().sum() == len(non_null):
+                return parsed
+
+    # Wenige Ausprägungen im Verhältnis zur Zeilenzahl -> kategorisch
+    if series.nunique() / len(series) < category_threshold:
+        return series.astype("category")
+    return None
\ No newline at end of file
@@ -0,0 +1,286 @@
+import multiprocessing
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+try:
+    import statsmodels  # noqa: F401
+    STATSMODELS_AVAILABLE = True
+except ImportError:
+    STATSMODELS_AVAILABLE = False
+
+
+# Vektorisierte Verfahren (alle Reihen gleichzeitig) und Verfahren im Prozesspool
+VECTORIZED_METHODS = ["moving_average", "ses", "holt", "holt_winters", "ets"]
+PROCESS_METHODS = ["arima"]
+FORECAST_METHODS = VECTORIZED_METHODS + PROCESS_METHODS
+
+# Raster der Glättungsparameter, aus dem je Reihe die beste Kombination gewählt wird
+SMOOTHING_GRID = [0.1, 0.3, 0.5, 0.7, 0.9]
+TREND_GRID = [0.05, 0.2, 0.5]
+
+
+def series_matrix(df, time_col, value_col, group_by=None, freq="M"):
+    """Ordnet eine lange Tabelle als Matrix an (eine Zeile je Reihe, eine Spalte je Periode)
+
+    Gibt (Reihenschlüssel, Perioden, Matrix) zurück. Fehlende Perioden sind NaN.
+    """
+    if df is None:
+        raise ValueError("Kein DataFrame übergeben")
+
+    group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    frame = df[group_by].copy() if group_by else pd.DataFrame(index=df.index)
+    frame["__periode__"] = pd.to_datetime(df[time_col]).dt.to_period(freq)
+    frame["__wert__"] = pd.to_numeric(df[value_col], errors="coerce")
+
+    if group_by:
+        sums = frame.groupby(group_by + ["__periode__"], observed=True)["__wert__"].sum(min_count=1)
+        table = sums.unstack("__periode__")
+    else:
+        table = frame.groupby("__periode__")["__wert__"].sum(min_count=1).to_frame().T
+
+    # Lücken in der Periodenfolge ergänzen
+    full_range = pd.period_range(table.columns.min(), table.columns.max(), freq=freq)
+    table = table.reindex(columns=full_range)
+    return table.index, table.columns, table.to_numpy(dtype=float)
+
+
+def moving_average(values, periods, window=3):
+    """Gleitender Durchschnitt der letzten window Perioden je Reihe"""
+    recent = values[:, -window:]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        level = np.nanmean(recent, axis=1)
+    return np.repeat(level[:, None], periods, axis=1)
+
+
+def exponential_smoothing(values, periods, alpha=None):
+    """Einfache exponentielle Glättung; alpha je Reihe aus einem Raster gewählt, wenn None"""
+    if alpha is None:
+        alpha = _best_parameters(values, lambda a: _ses_pass(values, a)[1], [(a,) for a in SMOOTHING_GRID])[0]
+    level, _ = _ses_pass(values, alpha)
+    return np.repeat(level[:, None], periods, axis=1)
+
+
+def holt(values, periods, alpha=None, beta=None):
+    """Holt-Verfahren mit linearem Trend"""
+    if alpha is None or beta is None:
+        grid = [(a, b) for a in SMOOTHING_GRID for b in TREND_GRID]
+        alpha, beta = _best_parameters(values, lambda a, b: _holt_pass(values, a, b)[2], grid)
+    level, trend, _ = _holt_pass(values, alpha, beta)
+    steps = np.arange(1, periods + 1)
+    return level[:, None] + trend[:, None] * steps[None, :]
+
+
+def holt_winters(values, periods, season_length=12, alpha=None, beta=None, gamma=None):
+    """Additives Holt-Winters-Verfahren (Trend und Saison)
+
+    Reihen mit weniger als zwei vollständigen Saisons werden mit Holt prognostiziert.
+    """
+    if values.shape[1] < 2 * season_length:
+        return holt(values, periods, alpha, beta)
+
+    if alpha is None or beta is None or gamma is None:
+        grid = [(a, b, g) for a in SMOOTHING_GRID for b in TREND_GRID for g in (0.1, 0.3)]
+        alpha, beta, gamma = _best_parameters(
+            values, lambda a, b, g: _holt_winters_pass(values, season_length, a, b, g)[3], grid)
+
+    level, trend, season, _ = _holt_winters_pass(values, season_length, alpha, beta, gamma)
+    steps = np.arange(1, periods + 1)
+    season_index = (values.shape[1] + steps - 1) % season_length
+    return level[:, None] + trend[:, None] * steps[None, :] + season[:, season_index]
+
+
+def forecast(df, time_col='Datum', value_col='Wert', periods=12, method='ets', group_by=None, freq="M",
+             max_workers=None, progress_callback=None, **options):
+    """Erstellt Prognosen für alle Reihen (je Kombination aus group_by) auf einmal
+
+    Gibt eine Tabelle mit den Gruppenspalten, der Zeitspalte und den
+    Prognosewerten (Spalte value_col) für die folgenden periods Perioden zurück.
+    """
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unbekannte Prognosemethode: {method}")
+
+    group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    keys, history, values = series_matrix(df, time_col, value_col, group_by, freq)
+
+    if method in PROCESS_METHODS:
+        predictions = _forecast_in_processes(values, periods, method, max_workers, progress_callback, **options)
+    else:
+        predictions = forecast_matrix(values, periods, method, **options)
+        if progress_callback is not None:
+            progress_callback(len(values), len(values))
+
+    # Ergebnis in eine lange Tabelle überführen
+    future = pd.period_range(history[-1] + 1, periods=periods, freq=freq).to_timestamp()
+    result = pd.DataFrame({
+        time_col: np.tile(future, len(values)),
+        value_col: predictions.ravel()
+    })
+    if group_by:
+        key_frame = keys.to_frame(index=False) if isinstance(keys, pd.MultiIndex) else pd.DataFrame({group_by[0]: keys})
+        key_frame.columns = group_by
+        key_frame = key_frame.loc[key_frame.index.repeat(periods)].reset_index(drop=True)
+        result = pd.concat([key_frame, result], axis=1)
+    return result
+
+
+def forecast_matrix(values, periods, method='ets', **options):
+    """Prognostiziert alle Zeilen einer Reihenmatrix mit einem vektorisierten Verfahren"""
+    if method == "moving_average":
+        return moving_average(values, periods, options.get("window", 3))
+    if method == "ses":
+        return exponential_smoothing(values, periods, options.get("alpha"))
+    if method == "holt":
+        return holt(values, periods, options.get("alpha"), options.get("beta"))
+    if method in ("holt_winters", "ets"):
+        return holt_winters(values, periods, options.get("season_length", 12),
+                            options.get("alpha"), options.get("beta"), options.get("gamma"))
+    raise ValueError(f"Unbekannte Prognosemethode: {method}")
+
+
+def benchmark(n_series=1000, length=48, periods=12, methods=None, seed=0):
+    """Misst den Durchsatz (Reihen je Sekunde) der Prognoseverfahren an synthetischen Reihen"""
+    rng = np.random.default_rng(seed)
+    steps = np.arange(length)
+    values = (100 + rng.normal(0, 5, (n_series, 1)) * steps / length
+              + 10 * np.sin(2 * np.pi * steps / 12) + rng.normal(0, 3, (n_series, length)))
+
+    results = {}
+    for method in methods or VECTORIZED_METHODS:
+        start = time.perf_counter()
+        if method in PROCESS_METHODS:
+            _forecast_in_processes(values, periods, method)
+        else:
+            forecast_matrix(values, periods, method)
+        elapsed = time.perf_counter() - start
+        results[method] = n_series / elapsed if elapsed > 0 else float("inf")
+    return results
+
+
+def _ses_pass(values, alpha):
+    """Glättet alle Reihen; liefert letztes Niveau und Summe der quadrierten Einschrittfehler"""
+    alpha = np.broadcast_to(alpha, values.shape[:1])
+    level = values[:, 0].copy()
+    sse = np.zeros(len(values))
+    for t in range(1, values.shape[1]):
+        observed = values[:, t]
+        # Reihen ohne bisherigen Wert beginnen mit der ersten Beobachtung
+        level = np.where(np.isnan(level), observed, level)
+        error = observed - level
+        valid = ~np.isnan(error)
+        sse += np.where(valid, error ** 2, 0.0)
+        level = np.where(valid, level + alpha * error, level)
+    return level, sse
+
+
+def _holt_pass(values, alpha, beta):
+    """Holt-Verfahren für alle Reihen; liefert Niveau, Trend und Fehlerquadratsumme"""
+    alpha = np.broadcast_to(alpha, values.shape[:1])
+    beta = np.broadcast_to(beta, values.shape[:1])
+    level = values[:, 0].copy()
+    trend = np.zeros(len(values))
+    sse = np.zeros(len(values))
+    for t in range(1, values.shape[1]):
+        observed = values[:, t]
+        level = np.where(np.isnan(level), observed, level)
+        prediction = level + trend
+        error = observed - prediction
+        valid = ~np.isnan(error)
+        sse += np.where(valid, error ** 2, 0.0)
+        new_level = np.where(valid, prediction + alpha * error, prediction)
+        trend = np.where(valid, trend + beta * (new_level - level - trend), trend)
+        level = new_level
+    return level, np.nan_to_num(trend), sse
+
+
+def _holt_winters_pass(values, season_length, alpha, beta, gamma):
+    """Additives Holt-Winters für alle Reihen; liefert Niveau, Trend, Saisonfaktoren und Fehler"""
+    alpha = np.broadcast_to(alpha, values.shape[:1])
+    beta = np.broadcast_to(beta, values.shape[:1])
+    gamma = np.broadcast_to(gamma, values.shape[:1])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        first = np.nanmean(values[:, :season_length], axis=1)
+        second = np.nanmean(values[:, season_length:2 * season_length], axis=1)
+    # Startwerte aus den ersten beiden Saisons (Niveau am Ende der ersten Saison, trendbereinigte Saison)
+    trend = np.nan_to_num((second - first) / season_length)
+    offsets = np.arange(season_length) - (season_length - 1) / 2
+    season = np.nan_to_num(values[:, :season_length] - first[:, None] - trend[:, None] * offsets[None, :])
+    level = first + trend * (season_length - 1) / 2
+
+    sse = np.zeros(len(values))
+    rows = np.arange(len(values))
+    for t in range(season_length, values.shape[1]):
+        observed = values[:, t]
+        index = t % season_length
+        seasonal = season[rows, index]
+        level = np.where(np.isnan(level), observed - seasonal, level)
+        prediction = level + trend + seasonal
+        error = observed - prediction
+        valid = ~np.isnan(error)
+        sse += np.where(valid, error ** 2, 0.0)
+
+        new_level = np.where(valid, level + trend + alpha * error, level + trend)
+        trend = np.where(valid, trend + beta * (new_level - level - trend), trend)
+        season[:, index] = np.where(valid, seasonal + gamma * (observed - new_level - seasonal), seasonal)
+        level = new_level
+    return np.nan_to_num(level), trend, season, sse
+
+
+def _best_parameters(values, sse_function, grid):
+    """Wählt je Reihe die Parameterkombination mit der kleinsten Fehlerquadratsumme"""
+    errors = np.vstack([sse_function(*params) for params in grid])
+    best = np.argmin(errors, axis=0)
+    grid = np.asarray(grid, dtype=float)
+    return tuple(grid[best, position] for position in range(grid.shape[1]))
+
+
+def _forecast_in_processes(values, periods, method, max_workers=None, progress_callback=None, **options):
+    """Rechenintensive Einzelmodelle (statsmodels) reihenweise im Prozesspool schätzen"""
+    if not STATSMODELS_AVAILABLE:
+        raise ImportError(f"Für die Methode '{method}' wird statsmodels benötigt")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    blocks = np.array_split(np.arange(len(values)), max(1, min(len(values), max_workers * 4)))
+    predictions = np.full((len(values), periods), np.nan)
+    done = 0
+
+    # "spawn" vermeidet das Forken eines laufenden Qt-Prozesses
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(_fit_block, values[rows], periods, method, options): rows
+            for rows in blocks if len(rows)
+        }
+        for future in as_completed(futures):
+            rows = futures[future]
+            predictions[rows] = future.result()
+            done += len(rows)
+            if progress_callback is not None:
+                progress_callback(done, len(values))
+    return predictions
+
+
+def _fit_block(values, periods, method, options):
+    """Schätzt ein Modell je Reihe eines Blocks (läuft im Prozesspool)"""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    order = tuple(options.get("order", (1, 1, 1)))
+    predictions = np.full((len(values), periods), np.nan)
+    for row, series in enumerate(values):
+        observed = series[~np.isnan(series)]
+        if len(observed) < sum(order) + 2:
+            predictions[row] = observed[-1] if len(observed) else np.nan
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            try:
+                predictions[row] = ARIMA(observed, order=order).fit().forecast(periods)
+            except Exception:
+                predictions[row] = observed[-1]
+    return predictions
\ No newline at end of file
@@ -0,0 +1,213 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+# Markierung der Übertragszeilen aus dem vorherigen Block
+SEED_COLUMN = "__vorblock__"
+
+
+class ChunkedPipeline:
+    """Blockweise Bereinigung und KPI-Berechnung für Dateien, die größer als der Arbeitsspeicher sind
+
+    Die Quelle wird über ControllerToolbox.iter_excel_chunks gelesen, jeder Block
+    bereinigt, um Kennzahlen ergänzt und sofort an eine Parquet-Datei angehängt.
+    Über Blockgrenzen hinweg gilt:
+
+    - Duplikate werden global über 64-Bit-Zeilenhashes erkannt (8 Byte je
+      eindeutiger Zeile bleiben im Speicher)
+    - Wachstumsraten setzen an der letzten Zeile je Gruppe aus dem vorherigen
+      Block an. Dafür muss die Quelle je Gruppe zeitlich aufsteigend sortiert sein.
+
+    Innerhalb eines Blocks sind die Zeilen wie bei calculate_kpis nach Gruppe
+    und Zeit sortiert.
+    """
+
+    def __init__(self, toolbox, clean=True, kpis=True, revenue_col='Umsatz', cost_col='Kosten',
+                 time_col=None, group_by=None):
+        self.toolbox = toolbox
+        self.clean = clean
+        self.kpis = kpis
+        self.revenue_col = revenue_col
+        self.cost_col = cost_col
+        self.time_col = time_col
+        self.group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+
+    def run(self, source, output_path, sheet_name=0, chunksize=100000, progress_callback=None,
+            **read_options):
+        """Verarbeitet die Quelldatei blockweise und schreibt das Ergebnis nach output_path (Parquet)
+
+        Gibt eine Statistik mit Zeilenzahlen, Duplikaten und Durchsatz zurück.
+        """
+        if not ARROW_AVAILABLE:
+            raise ImportError("Für die blockweise Verarbeitung wird pyarrow benötigt")
+
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        tmp_path = f"{output_path}.tmp"
+
+        seen = _HashSet()
+        state = None
+        writer = None
+        stats = {"chunks": 0, "rows_in": 0, "rows_out": 0, "duplicates": 0}
+
+        total_rows = _total_rows(self.toolbox, source, sheet_name)
+
+        try:
+            for chunk in self.toolbox.iter_excel_chunks(source, sheet_name, chunksize=chunksize,
+                                                        **read_options):
+                stats["chunks"] += 1
+                stats["rows_in"] += len(chunk)
+
+                if self.clean:
+                    rows_before = len(chunk)
+                    chunk = self._remove_duplicates(chunk, seen)
+                    stats["duplicates"] += rows_before - len(chunk)
+                    chunk = self.toolbox.clean_data(chunk, copy=False)
+
+                if self.kpis and len(chunk):
+                    chunk, state = self._calculate_kpis(chunk, state)
+
+                if len(chunk):
+                    writer = _write_chunk(writer, tmp_path, chunk)
+                    stats["rows_out"] += len(chunk)
+
+                if progress_callback is not None:
+                    progress_callback(stats["rows_in"], total_rows)
+        except Exception:
+            if writer is not None:
+                writer.close()
+            _remove_file(tmp_path)
+            raise
+
+        if writer is not None:
+            writer.close()
+            os.replace(tmp_path, output_path)
+
+        elapsed = time.perf_counter() - start
+        stats.update({
+            "output_path": str(output_path) if writer is not None else None,
+            "seconds": elapsed,
+            "rows_per_second": stats["rows_in"] / elapsed if elapsed > 0 else 0.0,
+            "hash_bytes": seen.nbytes
+        })
+        return stats
+
+    def _remove_duplicates(self, chunk, seen):
+        """Entfernt Zeilen, die im Block oder in einem früheren Block bereits vorkamen"""
+        hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+        # Erstes Vorkommen innerhalb des Blocks, das noch nicht gesehen wurde
+        _, first_positions = np.unique(hashes, return_index=True)
+        keep = np.zeros(len(chunk), dtype=bool)
+        keep[first_positions] = True
+        keep &= ~seen.contains(hashes)
+
+        seen.add(hashes[keep])
+        if keep.all():
+            return chunk
+        return chunk[keep]
+
+    def _calculate_kpis(self, chunk, state):
+        """Berechnet die Kennzahlen eines Blocks mit den Übertragszeilen des vorherigen Blocks"""
+        group_by = self.group_by
+        source_columns = list(chunk.columns)
+
+        if state is not None:
+            seeds = state[source_columns].assign(**{SEED_COLUMN: True})
+            chunk = pd.concat([seeds, chunk.assign(**{SEED_COLUMN: False})], ignore_index=True)
+        else:
+            chunk[SEED_COLUMN] = False
+
+        result = self.toolbox.calculate_kpis(chunk, revenue_col=self.revenue_col, cost_col=self.cost_col,
+                                             time_col=self.time_col, group_by=group_by or None, copy=False)
+
+        # Übertragszeilen müssen am Anfang ihrer Gruppe stehen, sonst ist die Quelle nicht sortiert
+        seed_mask = result[SEED_COLUMN].to_numpy(dtype=bool)
+        if seed_mask.any() and self.time_col:
+            group_starts = np.zeros(len(result), dtype=bool)
+            group_starts[0] = True
+            if group_by:
+                codes = result.groupby(group_by, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+                group_starts[1:] = codes[1:] != codes[:-1]
+            if (seed_mask & ~group_starts).any():
+                raise ValueError(f"Die Quelle ist nicht je Gruppe nach '{self.time_col}' sortiert; "
+                                 "Wachstumsraten können nicht blockweise berechnet werden")
+
+        # Letzte Zeile je Gruppe für den nächsten Block merken
+        if group_by:
+            state = result.groupby(group_by, sort=False, observed=True, dropna=False).tail(1)
+        else:
+            state = result.tail(1)
+
+        result = result[~seed_mask] if seed_mask.any() else result
+        return result.drop(columns=SEED_COLUMN), state.drop(columns=SEED_COLUMN)
+
+
+class _HashSet:
+    """Menge von 64-Bit-Hashes als sortierte Teillisten (zusammengeführt wie bei einem LSM-Baum)"""
+
+    def __init__(self):
+        self.runs = []
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self.runs)
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes):
+        if not len(hashes):
+            return
+        run = np.sort(hashes)
+        # Gleich große Teillisten zusammenführen, damit nur logarithmisch viele entstehen
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self.runs.pop(), run]), kind='mergesort')
+        self.runs.append(run)
+
+
+def _write_chunk(writer, path, chunk):
+    """Hängt einen Block an die Parquet-Datei an (legt den Writer beim ersten Block an)"""
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+
+    if writer is None:
+        # Spalten ohne Werte im ersten Block als Text anlegen
+        fields = [pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                  for field in table.schema]
+        schema = pa.schema(fields, metadata=table.schema.metadata)
+        writer = pq.ParquetWriter(path, schema)
+
+    writer.write_table(table.cast(writer.schema))
+    return writer
+
+
+def _total_rows(toolbox, source, sheet_name):
+    """Zeilenzahl aus den Metadaten für die Fortschrittsanzeige (0 = unbekannt)"""
+    try:
+        for index, info in enumerate(toolbox.get_sheet_info(source)):
+            if info["name"] == sheet_name or index == sheet_name:
+                return info["rows"] or 0
+    except Exception:
+        pass
+    return 0
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
\ No newline at end of file
@@ -0,0 +1,255 @@
+import codecs
+import importlib.util
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+
+
+# Dateitypen
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls", ".xlsb", ".ods")
+CSV_EXTENSIONS = (".csv", ".tsv", ".txt")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+SUPPORTED_EXTENSIONS = EXCEL_EXTENSIONS + CSV_EXTENSIONS + PARQUET_EXTENSIONS
+
+# Stichprobe für die Erkennung von Kodierung, Trennzeichen und Dezimaltrennzeichen
+CSV_SAMPLE_BYTES = 64 * 1024
+CSV_SAMPLE_LINES = 50
+DECIMAL_COMMA_PATTERN = re.compile(r"^[-+]?\d+,\d+$")
+DECIMAL_POINT_PATTERN = re.compile(r"^[-+]?\d+\.\d+$")
+
+# Namensräume und Blattgröße in xlsx-Arbeitsmappen
+XLSX_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+XLSX_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+XLSX_DIMENSION_PATTERN = re.compile(rb'<(?:\w+:)?dimension ref="([A-Z]+\d+(?::[A-Z]+\d+)?)"')
+XLSX_DIMENSION_BYTES = 4096
+
+# Engines je Dateiendung, die schnellste zuerst
+ENGINE_PREFERENCES = {
+    ".xlsx": ["calamine", "openpyxl"],
+    ".xlsm": ["calamine", "openpyxl"],
+    ".xls": ["calamine", "xlrd"],
+    ".xlsb": ["calamine", "pyxlsb"],
+    ".ods": ["calamine", "odf"],
+    ".csv": ["pyarrow", "c"],
+    ".tsv": ["pyarrow", "c"],
+    ".txt": ["pyarrow", "c"],
+    ".parquet": ["parquet"],
+    ".pq": ["parquet"]
+}
+
+# Python-Module, die eine Engine voraussetzt (None = immer verfügbar)
+ENGINE_MODULES = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+    "xlrd": "xlrd",
+    "pyxlsb": "pyxlsb",
+    "odf": "odf",
+    "pyarrow": "pyarrow",
+    "c": None,
+    "parquet": "pyarrow"
+}
+
+_availability = {}
+
+
+def is_engine_available(engine):
+    """Prüft, ob die für eine Engine benötigte Bibliothek installiert ist"""
+    if engine not in _availability:
+        module = ENGINE_MODULES.get(engine)
+        _availability[engine] = module is None or importlib.util.find_spec(module) is not None
+    return _availability[engine]
+
+
+def file_type(filepath):
+    """Ordnet eine Datei einem Typ zu ('excel', 'csv' oder 'parquet')"""
+    extension = os.path.splitext(str(filepath))[1].lower()
+    if extension in CSV_EXTENSIONS:
+        return "csv"
+    if extension in PARQUET_EXTENSIONS:
+        return "parquet"
+    return "excel"
+
+
+def available_engines(filepath):
+    """Gibt die installierten Engines für eine Datei zurück, die schnellste zuerst"""
+    extension = os.path.splitext(str(filepath))[1].lower()
+    preferences = ENGINE_PREFERENCES.get(extension, ["openpyxl"])
+    return [engine for engine in preferences if is_engine_available(engine)]
+
+
+def select_engine(filepath, engine=None):
+    """Wählt die Engine für eine Datei aus (automatisch, wenn engine None ist)"""
+    engines = available_engines(filepath)
+
+    if engine is not None:
+        if engine not in ENGINE_PREFERENCES.get(os.path.splitext(str(filepath))[1].lower(), [engine]):
+            raise ValueError(f"Engine '{engine}' unterstützt den Dateityp von '{filepath}' nicht")
+        if not is_engine_available(engine):
+            raise ValueError(f"Engine '{engine}' ist nicht installiert")
+        return engine
+
+    if not engines:
+        raise ValueError(f"Keine Lese-Engine für '{filepath}' installiert")
+    return engines[0]
+
+
+def detect_encoding(filepath):
+    """Ermittelt die Kodierung einer CSV-Datei
+
+    Gültiges UTF-8 (mit oder ohne BOM) wird als solches gelesen, alles andere
+    als Windows-1252, in dem die meisten deutschen ERP-Exporte vorliegen.
+    """
+    with open(filepath, "rb") as f:
+        sample = f.read(CSV_SAMPLE_BYTES)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # Ein am Probenende abgeschnittenes Zeichen ist kein Fehler
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "cp1252"
+    return "utf-8"
+
+
+def _sample_lines(filepath, skiprows=None, encoding=None, count=CSV_SAMPLE_LINES):
+    """Liest die ersten Zeilen einer CSV-Datei nach den übersprungenen Zeilen"""
+    if isinstance(skiprows, int):
+        skip = set(range(skiprows))
+    else:
+        skip = set(skiprows or [])
+
+    lines = []
+    with open(filepath, "r", encoding=encoding or detect_encoding(filepath), errors="replace") as f:
+        for number, line in enumerate(f):
+            if number in skip:
+                continue
+            lines.append(line.rstrip("\r\n"))
+            if len(lines) >= count:
+                break
+    return lines
+
+
+def sniff_delimiter(filepath, skiprows=None, encoding=None):
+    """Ermittelt das Trennzeichen einer CSV-Datei anhand der ersten nicht übersprungenen Zeile"""
+    if str(filepath).lower().endswith(".tsv"):
+        return "\t"
+
+    lines = _sample_lines(filepath, skiprows, encoding, count=1)
+    first_line = lines[0] if lines else ""
+
+    # Deutsche ERP-Exporte verwenden häufig Semikolons
+    candidates = [";", ",", "\t", "|"]
+    return max(candidates, key=first_line.count) if first_line else ","
+
+
+def detect_decimal(filepath, sep, skiprows=None, encoding=None):
+    """Ermittelt das Dezimaltrennzeichen einer CSV-Datei
+
+    Ein Komma gilt als Dezimaltrennzeichen, wenn es nicht das Feldtrennzeichen
+    ist und die Datenzeilen der Stichprobe Zahlen nur mit Dezimalkomma ("1,5")
+    und nicht mit Dezimalpunkt enthalten.
+    """
+    if sep == ",":
+        return "."
+
+    comma, point = False, False
+    for line in _sample_lines(filepath, skiprows, encoding)[1:]:
+        for field in line.split(sep):
+            field = field.strip().strip('"')
+            comma = comma or DECIMAL_COMMA_PATTERN.match(field) is not None
+            point = point or DECIMAL_POINT_PATTERN.match(field) is not None
+    return "," if comma and not point else "."
+
+
+def csv_options(filepath, skiprows=None, encoding=None, decimal=None):
+    """Trennzeichen, Kodierung und Dezimaltrennzeichen für pd.read_csv
+
+    Nicht angegebene Werte werden aus der Datei ermittelt.
+    """
+    encoding = encoding or detect_encoding(filepath)
+    sep = sniff_delimiter(filepath, skiprows, encoding)
+    decimal = decimal or detect_decimal(filepath, sep, skiprows, encoding)
+    return {"sep": sep, "encoding": encoding, "decimal": decimal}
+
+
+def sheet_dimensions(filepath):
+    """Liest die <dimension>-Einträge aller Blätter einer xlsx-Datei, ohne Zellen zu lesen
+
+    Liefert {Blattname: "A1:D6"}; für andere Formate oder Blätter ohne Eintrag
+    fehlt der Name im Ergebnis.
+    """
+    dimensions = {}
+    try:
+        with zipfile.ZipFile(filepath) as archive:
+            workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+            relations = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+            targets = {relation.get("Id"): relation.get("Target") for relation in relations}
+
+            for sheet in workbook.iter(f"{XLSX_MAIN_NS}sheet"):
+                target = targets.get(sheet.get(f"{XLSX_REL_NS}id"))
+                if not target:
+                    continue
+                part = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+                # Der Eintrag steht vor den Zellen am Anfang des Blatts
+                with archive.open(part) as f:
+                    match = XLSX_DIMENSION_PATTERN.search(f.read(XLSX_DIMENSION_BYTES))
+                if match:
+                    dimensions[sheet.get("name")] = match.group(1).decode()
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        pass
+    return dimensions
+
+
+def read_table(filepath, engine=None, sheet_name=0, skiprows=None, usecols=None, header=0,
+               encoding=None, decimal=None):
+    """Liest eine Excel-, CSV- oder Parquet-Datei mit der gewählten Engine
+
+    encoding und decimal gelten nur für CSV-Dateien und werden ohne Angabe
+    aus der Datei ermittelt.
+    """
+    engine = select_engine(filepath, engine)
+    kind = file_type(filepath)
+
+    if kind == "parquet":
+        # Spaltennamen stehen im Schema, eine Kopfzeile gibt es nicht
+        if header != 0:
+            raise ValueError("header wird für Parquet-Dateien nicht unterstützt")
+        df = pd.read_parquet(filepath, columns=usecols)
+        if skiprows is not None:
+            df = df[~_skip_mask(len(df), skiprows)].reset_index(drop=True)
+        return df
+
+    if kind == "csv":
+        options = csv_options(filepath, skiprows, encoding, decimal)
+        options.update(skiprows=skiprows, usecols=usecols, header=header)
+
+        # Die pyarrow-Engine überspringt Zeilen erst nach der Kopfzeile
+        if engine == "pyarrow" and skiprows is not None and skiprows != 0:
+            engine = "c"
+        return pd.read_csv(filepath, engine=engine, **options)
+
+    return pd.read_excel(
+        filepath,
+        engine=engine,
+        sheet_name=sheet_name,
+        skiprows=skiprows,
+        usecols=usecols,
+        header=header
+    )
+
+
+def _skip_mask(row_count, skiprows):
+    """Markiert zu überspringende Datenzeilen wie skiprows in pd.read_csv (Anzahl, Liste oder Funktion)"""
+    mask = np.zeros(row_count, dtype=bool)
+    if callable(skiprows):
+        mask[:] = [bool(skiprows(position)) for position in range(row_count)]
+    elif isinstance(skiprows, (int, np.integer)):
+        mask[:skiprows] = True
+    else:
+        positions = np.asarray(list(skiprows), dtype=np.int64)
+        mask[positions[(positions >= 0) & (positions < row_count)]] = True
+    return mask
\ No newline at end of file
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+
+# Verfügbare Kennzahlvarianten (Spaltensuffix je Variante)
+TIME_MEASURES = {
+    "ytd": "_YTD",   # kumuliert seit Beginn des (Geschäfts-)Jahres
+    "r12": "_R12",   # rollierende 12 Monate
+    "mom": "_MoM",   # Veränderung zum Vormonat in %
+    "yoy": "_YoY"    # Veränderung zum Vorjahresmonat in %
+}
+
+# Summierbare Spalten aus calculate_kpis, die standardmäßig ausgewertet werden
+DEFAULT_VALUE_COLUMNS = ["Umsatz", "Kosten", "DB1"]
+
+
+def time_intelligence(df, time_col='Datum', value_cols=None, group_by=None, measures=None,
+                      fiscal_year_start=1, revenue_col='Umsatz'):
+    """Ergänzt Monatswerte um YTD-, R12-, Vormonats- und Vorjahresvarianten
+
+    Die Werte werden je Gruppe und Monat summiert und auf einem ganzzahligen
+    Monatsindex (Jahr * 12 + Monat) ausgewertet. Kumulierte Summen liefern YTD
+    und R12, Vormonat und Vorjahresmonat werden per Binärsuche gefunden. Lücken
+    in den Monaten werden dabei nicht aufgefüllt: fehlende Monate zählen in
+    YTD/R12 als 0, MoM/YoY sind NaN, wenn der Vergleichsmonat fehlt. R12 ist NaN,
+    solange eine Gruppe noch keine 12 Monate Historie hat.
+
+    Jede Zeile erhält die Werte ihres Gruppenmonats; die Zeilenreihenfolge
+    bleibt erhalten. Ist DB1 und die Umsatzspalte enthalten, wird zusätzlich die
+    Marge auf YTD- bzw. R12-Basis berechnet.
+    """
+    if df is None:
+        raise ValueError("Kein DataFrame übergeben")
+    if time_col not in df.columns:
+        raise ValueError(f"Zeitspalte '{time_col}' nicht gefunden")
+
+    group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    measures = [m.lower() for m in (measures or TIME_MEASURES)]
+    unknown = [m for m in measures if m not in TIME_MEASURES]
+    if unknown:
+        raise ValueError(f"Unbekannte Kennzahlvariante(n): {', '.join(unknown)}")
+    if not 1 <= fiscal_year_start <= 12:
+        raise ValueError("Der Beginn des Geschäftsjahres muss ein Monat zwischen 1 und 12 sein")
+
+    if value_cols is None:
+        value_cols = [col for col in DEFAULT_VALUE_COLUMNS if col in df.columns]
+    else:
+        value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+        missing = [col for col in value_cols if col not in df.columns]
+        if missing:
+            raise ValueError(f"Spalte(n) nicht gefunden: {', '.join(missing)}")
+    if not value_cols:
+        raise ValueError("Keine Wertspalten für die Zeitauswertung gefunden")
+
+    result = df.copy()
+    if result.empty:
+        for col in value_cols:
+            for measure in measures:
+                result[col + TIME_MEASURES[measure]] = pd.Series(dtype=float)
+        return result
+
+    months = _month_index(result[time_col])
+    valid = months >= 0
+    if group_by:
+        codes = result.groupby(group_by, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+    else:
+        codes = np.zeros(len(result), dtype=np.int64)
+
+    # Zusammengesetzter Schlüssel Gruppe/Monat; der Abstand zwischen den Gruppen
+    # ist größer als jedes Fenster, damit Suchen nie in die Nachbargruppe reichen
+    span = int(months[valid].max()) + 13 if valid.any() else 13
+    keys = codes.astype(np.int64) * span + months
+
+    order = np.argsort(keys[valid], kind='stable')
+    rows = np.flatnonzero(valid)[order]
+    sorted_keys = keys[rows]
+
+    # Eindeutige Gruppenmonate und Zuordnung der Zeilen
+    new_cell = np.empty(len(sorted_keys), dtype=bool)
+    new_cell[:1] = True
+    new_cell[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    cell_starts = np.flatnonzero(new_cell)
+    cell_keys = sorted_keys[cell_starts]
+    cell_of_row = np.full(len(result), -1, dtype=np.int64)
+    cell_of_row[rows] = np.cumsum(new_cell) - 1
+
+    cell_codes = cell_keys // span
+    cell_months = cell_keys - cell_codes * span
+    group_first = np.empty(len(cell_keys), dtype=bool)
+    group_first[:1] = True
+    group_first[1:] = cell_codes[1:] != cell_codes[:-1]
+
+    # Beginn von Gruppe und Geschäftsjahr je Gruppenmonat
+    fiscal_years = (cell_months - (fiscal_year_start - 1)) // 12
+    year_first = group_first.copy()
+    year_first[1:] |= fiscal_years[1:] != fiscal_years[:-1]
+    group_begin = np.maximum.accumulate(np.where(group_first, np.arange(len(cell_keys)), 0))
+    first_month = cell_months[group_begin]
+
+    # Fensteranfänge und Vergleichsmonate per Binärsuche
+    window_start = np.searchsorted(cell_keys, cell_keys - 11, side='left')
+    previous_month = _lookup(cell_keys, cell_keys - 1)
+    previous_year = _lookup(cell_keys, cell_keys - 12)
+    full_window = cell_months - first_month >= 11
+
+    totals = {}
+    for col in value_cols:
+        values = pd.to_numeric(result[col], errors='coerce').to_numpy(dtype=float)
+        sums = np.add.reduceat(np.nan_to_num(values[rows]), cell_starts)
+
+        cumulative = np.concatenate([[0.0], np.cumsum(sums)])
+        columns = {}
+        if "ytd" in measures:
+            year_offset = np.maximum.accumulate(np.where(year_first, np.arange(len(sums)), 0))
+            columns["ytd"] = cumulative[1:] - cumulative[year_offset]
+        if "r12" in measures:
+            rolling = cumulative[1:] - cumulative[window_start]
+            columns["r12"] = np.where(full_window, rolling, np.nan)
+        if "mom" in measures:
+            columns["mom"] = _change(sums, previous_month)
+        if "yoy" in measures:
+            columns["yoy"] = _change(sums, previous_year)
+
+        totals[col] = columns
+        for measure in measures:
+            result[col + TIME_MEASURES[measure]] = _to_rows(columns[measure], cell_of_row)
+
+    # Margen auf kumulierter Basis (Verhältnis der Summen, nicht Summe der Verhältnisse)
+    if 'DB1' in totals and revenue_col in totals and revenue_col != 'DB1':
+        for measure in ("ytd", "r12"):
+            if measure in measures:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    margin = totals['DB1'][measure] / totals[revenue_col][measure] * 100
+                result['Marge' + TIME_MEASURES[measure]] = _to_rows(np.round(margin, 2), cell_of_row)
+
+    return result
+
+
+def _month_index(times):
+    """Ganzzahliger Monatsindex (Jahr * 12 + Monat - 1), -1 für fehlende Zeitpunkte"""
+    times = pd.to_datetime(times)
+    index = (times.dt.year * 12 + times.dt.month - 1).to_numpy(dtype=float)
+    return np.where(np.isnan(index), -1, index).astype(np.int64)
+
+
+def _lookup(keys, targets):
+    """Position des exakt passenden Schlüssels oder -1"""
+    positions = np.searchsorted(keys, targets, side='left')
+    positions[positions == len(keys)] = 0
+    return np.where(keys[positions] == targets, positions, -1)
+
+
+def _change(values, previous):
+    """Prozentuale Veränderung gegenüber einem Vergleichswert (NaN ohne Vergleichswert)"""
+    change = np.full(len(values), np.nan)
+    found = previous >= 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change[found] = (values[found] / values[previous[found]] - 1) * 100
+    return change
+
+
+def _to_rows(cell_values, cell_of_row):
+    """Überträgt Werte je Gruppenmonat auf die Zeilen (NaN für Zeilen ohne Zeitpunkt)"""
+    # Index -1 greift auf das angehängte NaN zu
+    return np.append(cell_values, np.nan)[cell_of_row]
\ No newline at end of file
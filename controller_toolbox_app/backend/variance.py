@@ -0,0 +1,179 @@
+import weakref
+import numpy as np
+import pandas as pd
+
+
+# Suffixe der Ist- und Planspalten im Ergebnis
+ACTUAL_SUFFIX = "_ist"
+PLAN_SUFFIX = "_plan"
+
+
+class PreparedPlan:
+    """Einmalig aufbereitete Plandaten für wiederholte Abweichungsanalysen
+
+    Die Plandaten werden auf Schlüssel- und Wertspalten beschränkt, umbenannt
+    und nach dem Schlüssel sortiert indiziert. Der Schlüssel kann aus mehreren
+    Spalten bestehen (z.B. ['Gesellschaft', 'Kostenstelle', 'Monat']). Jede weitere Abweichungsanalyse
+    gegen denselben Plan besteht dann nur noch aus einem Join über den Index
+    und der vektorisierten Differenzberechnung.
+    """
+
+    def __init__(self, plan_df, key_column, value_columns=None):
+        if plan_df is None:
+            raise ValueError("Plan-Daten fehlen")
+
+        key_columns = _as_list(key_column)
+        if not key_columns:
+            raise ValueError("Keine Schlüsselspalte angegeben")
+
+        # Ohne Angabe alle numerischen Spalten außer dem Schlüssel verwenden
+        if value_columns is None:
+            value_columns = [col for col in plan_df.select_dtypes(include=['number']).columns
+                             if col not in key_columns]
+
+        missing = [col for col in key_columns + list(value_columns) if col not in plan_df.columns]
+        if missing:
+            raise ValueError(f"Spalten im Plan nicht gefunden: {', '.join(map(str, missing))}")
+
+        self.key_column = key_column
+        self.key_columns = key_columns
+        self.value_columns = list(value_columns)
+
+        # Auswahl erzeugt bereits eine Kopie, Umbenennen ohne weitere Kopie
+        frame = plan_df[key_columns + self.value_columns].set_index(key_columns)
+        frame.columns = [f"{col}{PLAN_SUFFIX}" for col in self.value_columns]
+        self.frame = frame.sort_index(kind='mergesort')
+
+        # Herkunft merken, um die Aufbereitung für denselben DataFrame wiederzuverwenden
+        self._source = weakref.ref(plan_df)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def is_prepared_from(self, plan_df):
+        """Prüft, ob der Plan aus genau diesem DataFrame aufbereitet wurde"""
+        return self._source() is plan_df
+
+    def join(self, actual_df, value_columns=None):
+        """Berechnet die Abweichungen eines Ist-Datensatzes gegenüber dem Plan"""
+        if actual_df is None:
+            raise ValueError("Ist-Daten fehlen")
+
+        key_columns = self.key_columns
+
+        # Ohne Angabe die gemeinsamen numerischen Spalten verwenden
+        if value_columns is None:
+            actual_numeric = set(actual_df.select_dtypes(include=['number']).columns)
+            value_columns = [col for col in self.value_columns if col in actual_numeric]
+        else:
+            unknown = [col for col in value_columns if col not in self.value_columns]
+            if unknown:
+                raise ValueError(f"Wertspalten nicht im aufbereiteten Plan: {', '.join(map(str, unknown))}")
+
+        actual = actual_df[key_columns + list(value_columns)].set_index(key_columns)
+        actual.columns = [f"{col}{ACTUAL_SUFFIX}" for col in value_columns]
+        plan = self.frame[[f"{col}{PLAN_SUFFIX}" for col in value_columns]]
+
+        # Outer-Join über den Schlüsselindex (sortiert wie pd.merge mit how='outer')
+        merged = actual.join(plan, how='outer', sort=True).reset_index()
+
+        # Berechnung der Abweichungen
+        for col in value_columns:
+            actual_col = f"{col}{ACTUAL_SUFFIX}"
+            plan_col = f"{col}{PLAN_SUFFIX}"
+
+            # Absolute Abweichung
+            merged[f"{col}_var"] = merged[actual_col] - merged[plan_col]
+
+            # Prozentuale Abweichung
+            merged[f"{col}_var_pct"] = (merged[f"{col}_var"] / merged[plan_col] * 100).round(2)
+
+        return merged
+
+
+def variance_decomposition(actual_df, plan_df, key_columns, volume_col='Menge', revenue_col='Umsatz',
+                           mix_level=None):
+    """Zerlegt die Umsatzabweichung je Schlüssel in Preis-, Mengen- und Mixabweichung
+
+    Ist- und Plandaten werden je Schlüsselkombination verdichtet und in einem
+    Durchlauf verglichen. Der Mix bezieht sich auf den Mengenanteil innerhalb
+    der Spalten aus mix_level (ohne Angabe: innerhalb der Gesamtmenge):
+
+    - Preisabweichung  = (Preis Ist - Preis Plan) * Menge Ist
+    - Mengenabweichung = (Gesamtmenge Ist - Gesamtmenge Plan) * Anteil Plan * Preis Plan
+    - Mixabweichung    = Gesamtmenge Ist * (Anteil Ist - Anteil Plan) * Preis Plan
+
+    Die Summe der drei Anteile ergibt die Umsatzabweichung. Fehlt ein Planpreis
+    (neue Position), wird der Istpreis angesetzt und umgekehrt.
+    """
+    if actual_df is None or plan_df is None:
+        raise ValueError("Ist- oder Plan-Daten fehlen")
+
+    key_columns = _as_list(key_columns)
+    mix_level = _as_list(mix_level)
+    if not key_columns:
+        raise ValueError("Keine Schlüsselspalte angegeben")
+    if any(col not in key_columns for col in mix_level):
+        raise ValueError("Die Mix-Ebene muss aus Schlüsselspalten bestehen")
+
+    value_columns = [volume_col, revenue_col]
+    for name, df in (("Ist", actual_df), ("Plan", plan_df)):
+        missing = [col for col in key_columns + value_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Spalten in den {name}-Daten nicht gefunden: {', '.join(map(str, missing))}")
+
+    # Je Schlüsselkombination verdichten und über den Index zusammenführen
+    actual = actual_df.groupby(key_columns, observed=True, sort=False)[value_columns].sum()
+    plan = plan_df.groupby(key_columns, observed=True, sort=False)[value_columns].sum()
+    actual.columns = [f"{col}{ACTUAL_SUFFIX}" for col in value_columns]
+    plan.columns = [f"{col}{PLAN_SUFFIX}" for col in value_columns]
+    merged = actual.join(plan, how='outer', sort=True).reset_index()
+
+    volume_actual = merged[f"{volume_col}{ACTUAL_SUFFIX}"].fillna(0).to_numpy(dtype=float)
+    volume_plan = merged[f"{volume_col}{PLAN_SUFFIX}"].fillna(0).to_numpy(dtype=float)
+    revenue_actual = merged[f"{revenue_col}{ACTUAL_SUFFIX}"].fillna(0).to_numpy(dtype=float)
+    revenue_plan = merged[f"{revenue_col}{PLAN_SUFFIX}"].fillna(0).to_numpy(dtype=float)
+
+    # Durchschnittspreise, fehlende Preise gegenseitig ergänzen
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_actual = np.where(volume_actual != 0, revenue_actual / volume_actual, np.nan)
+        price_plan = np.where(volume_plan != 0, revenue_plan / volume_plan, np.nan)
+    price_actual = np.where(np.isnan(price_actual), price_plan, price_actual)
+    price_plan = np.where(np.isnan(price_plan), price_actual, price_plan)
+    price_actual = np.nan_to_num(price_actual)
+    price_plan = np.nan_to_num(price_plan)
+
+    # Gesamtmengen und Mengenanteile je Mix-Ebene
+    if mix_level:
+        groups = merged.groupby(mix_level, observed=True, sort=False, dropna=False)
+        total_actual = groups[f"{volume_col}{ACTUAL_SUFFIX}"].transform('sum').fillna(0).to_numpy(dtype=float)
+        total_plan = groups[f"{volume_col}{PLAN_SUFFIX}"].transform('sum').fillna(0).to_numpy(dtype=float)
+    else:
+        total_actual = np.full(len(merged), volume_actual.sum())
+        total_plan = np.full(len(merged), volume_plan.sum())
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share_actual = np.where(total_actual != 0, volume_actual / total_actual, 0.0)
+        share_plan = np.where(total_plan != 0, volume_plan / total_plan, 0.0)
+
+    merged["Preis_ist"] = price_actual
+    merged["Preis_plan"] = price_plan
+    merged["Preisabweichung"] = (price_actual - price_plan) * volume_actual
+    merged["Mengenabweichung"] = (total_actual - total_plan) * share_plan * price_plan
+    merged["Mixabweichung"] = total_actual * (share_actual - share_plan) * price_plan
+    merged["Gesamtabweichung"] = revenue_actual - revenue_plan
+
+    # Nicht zerlegbarer Rest (z.B. Umsatz ohne Menge)
+    merged["Restabweichung"] = (merged["Gesamtabweichung"] - merged["Preisabweichung"]
+                                - merged["Mengenabweichung"] - merged["Mixabweichung"]).round(6)
+
+    return merged
+
+
+def _as_list(columns):
+    """Wandelt eine Spaltenangabe (None, Name oder Liste) in eine Liste um"""
+    if columns is None:
+        return []
+    if isinstance(columns, (list, tuple)):
+        return list(columns)
+    return [columns]
\ No newline at end of file
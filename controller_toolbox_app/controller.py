@@ -1,74 +1,299 @@
 from PyQt6.QtWidgets import QMessageBox
+from PyQt6.QtCore import QThreadPool, QTimer
 from gui.main_window import MainWindow
+from gui.workers import ImportWorker, FunctionWorker
 from backend.controller_toolbox import ControllerToolbox
 from data.data_manager import DataManager
+from data.excel_cache import ExcelCache
+from data.session_store import SessionStore
+from data.result_cache import ResultCache
+from data.dataset_graph import DatasetGraph
+from backend.reader_engines import available_engines
+from functools import partial
 import os
-import pandas as pd
 
 
 class ControllerApp:
     """Hauptklasse der Anwendung, die GUI und Backend verbindet"""
 
     def __init__(self):
+        # Gemeinsamer Cache für eingelesene Excel-Tabellenblätter
+        self.excel_cache = ExcelCache()
+
         # Initialisierung der drei Schichten
-        self.toolbox = ControllerToolbox()  # Anwendungslogik
-        self.data_manager = DataManager()  # Datenhaltung
+        self.toolbox = ControllerToolbox(cache=self.excel_cache)  # Anwendungslogik
+        self.data_manager = DataManager(cache=self.excel_cache)  # Datenhaltung
         self.main_window = MainWindow()  # GUI
 
-        # Session-Daten
+        # Session-Daten (Datensätze mit Speicherbudget, Auslagerung auf die Festplatte)
         self.session_data = {}
-        self.dataframes = {}
+        memory_budget_mb = float(self.data_manager.get_setting("session_memory_budget_mb", 2048))
+        self.dataframes = SessionStore(memory_budget_mb=memory_budget_mb,
+                                       error_callback=self.on_session_store_error)
+
+        # Zwischengespeicherte Analyseergebnisse (Schlüssel enthalten die Datensatzversionen)
+        result_cache_mb = float(self.data_manager.get_setting("result_cache_mb", 256))
+        self.result_cache = ResultCache(max_size_mb=result_cache_mb)
+
+        # Herkunft abgeleiteter Datensätze (werden bei Zugriff nach Änderungen neu berechnet)
+        self.dataset_graph = DatasetGraph(self.dataframes, on_update=self.result_cache.discard_dataset)
+
+        # Fertig gezeichnete Diagramme (Schlüssel: Datensatzversion, Diagrammtyp und Parameter)
+        chart_cache_entries = int(self.data_manager.get_setting("chart_cache_entries", 16))
+        chart_cache_mb = float(self.data_manager.get_setting("chart_cache_mb", 256))
+        self.chart_cache = ResultCache(max_size_mb=chart_cache_mb, max_entries=chart_cache_entries)
+        self.latest_charts = {}     # Diagramm unabhängig von der Version -> Cache-Schlüssel der neuesten Version
+        self.chart_workers = {}     # Cache-Schlüssel -> laufender Worker
+        self.chart_request = None   # zuletzt angefordertes Diagramm (nur dieses wird angezeigt)
+        self.displayed_chart = None  # (Datensatz, Diagrammtyp, Parameter) des angezeigten Diagramms
+
+        # Hintergrund-Worker
+        self.thread_pool = QThreadPool.globalInstance()
+        self.import_worker = None
+        self.forecast_worker = None
+        self.store_imports = False
+        self.store_workers = set()
+
+        # Aufbereitete Pläne für wiederholte Abweichungsanalysen
+        self.prepared_plans = {}
 
         # Verbindungen herstellen
         self.connect_signals()
 
+        # Gespeicherte Datensätze zum Laden anbieten
+        self.update_stored_datasets()
+
     def connect_signals(self):
         """Verbindet die GUI-Signale mit den Controller-Methoden"""
         # Datenimport-Signale
         self.main_window.import_tab.file_selected.connect(self.on_file_selected)
         self.main_window.import_tab.import_data.connect(self.on_import_data)
+        self.main_window.import_tab.cancel_import.connect(self.on_cancel_import)
+        self.main_window.import_tab.batch_import.connect(self.on_batch_import)
+        self.main_window.import_tab.load_stored_dataset.connect(self.on_load_stored_dataset)
 
         # Analyse-Signale
         self.main_window.analysis_tab.run_analysis.connect(self.on_run_analysis)
 
         # Visualisierungs-Signale
         self.main_window.visualization_tab.create_chart.connect(self.on_create_chart)
+        self.main_window.visualization_tab.export_chart_data.connect(self.on_export_chart_data)
+        self.main_window.tab_widget.currentChanged.connect(self.on_tab_changed)
 
         # Reporting-Signale
         self.main_window.reporting_tab.generate_report.connect(self.on_generate_report)
 
+        # Prognose-Signale
+        self.main_window.forecasting_tab.create_forecast.connect(self.on_create_forecast)
+
     def on_file_selected(self, file_path):
         """Wird aufgerufen, wenn eine Datei ausgewählt wird"""
         try:
-            # Tabellenblätter ermitteln
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
+            # Tabellenblätter aus den Metadaten ermitteln (Handle bleibt für den Import geöffnet)
+            sheet_info = self.toolbox.get_sheet_info(file_path)
+            sheet_names = [info["name"] for info in sheet_info]
 
             # Tabellenblätter in der GUI aktualisieren
-            self.main_window.import_tab.set_sheets(sheet_names)
+            self.main_window.import_tab.set_sheets(sheet_names, sheet_info)
+            self.main_window.import_tab.set_engines(available_engines(file_path))
         except Exception as e:
             self.main_window.show_error("Fehler beim Laden der Datei", str(e))
 
     def on_import_data(self, file_path, sheet_name, options):
         """Wird aufgerufen, wenn Daten importiert werden sollen"""
-        try:
-            # Daten laden
-            df = self.toolbox.load_excel(file_path, sheet_name, **options)
+        if self.import_worker is not None:
+            self.main_window.show_status("Es läuft bereits ein Import")
+            return
 
-            # Daten in Session speichern
-            file_key = os.path.basename(file_path).split('.')[0]
-            self.dataframes[file_key] = df
+        # Import im Hintergrund starten
+        options = dict(options)
+        self.store_imports = options.pop("store", False)
+        worker = ImportWorker(self.toolbox, file_path, sheet_name, options)
+        worker.signals.progress.connect(self.on_import_progress)
+        worker.signals.preview.connect(self.main_window.import_tab.update_preview)
+        worker.signals.finished.connect(self.on_import_finished)
+        worker.signals.error.connect(self.on_import_error)
+        worker.signals.cancelled.connect(self.on_import_cancelled)
 
-            # Vorschau aktualisieren
-            self.main_window.import_tab.update_preview(df)
+        self.import_worker = worker
+        self.main_window.import_tab.set_import_running(True)
+        self.main_window.show_progress(0, 0)
+        self.main_window.show_status(f"Importiere '{file_path}'...", 0)
+        self.thread_pool.start(worker)
 
-            # Verfügbare Datensätze in allen Tabs aktualisieren
-            self.update_data_sources()
+    def on_cancel_import(self):
+        """Bricht den laufenden Import ab"""
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.main_window.show_status("Import wird abgebrochen...", 0)
 
-            # Erfolgsmeldung
-            self.main_window.show_status(f"Daten aus '{file_path}' erfolgreich geladen")
-        except Exception as e:
-            self.main_window.show_error("Fehler beim Importieren der Daten", str(e))
+    def on_import_progress(self, rows_read, total_rows, bytes_read):
+        """Zeigt den Fortschritt des laufenden Imports an"""
+        self.main_window.show_progress(rows_read, total_rows)
+
+        message = f"{rows_read} Zeilen gelesen"
+        if total_rows:
+            message += f" von ca. {total_rows}"
+        if bytes_read:
+            message += f" ({bytes_read / (1024 * 1024):.1f} MB)"
+        self.main_window.show_status(message + "...", 0)
+
+    def on_import_finished(self, df):
+        """Übernimmt das Ergebnis eines abgeschlossenen Imports"""
+        file_path = self.import_worker.file_path
+        sheet_name = self.import_worker.sheet_name
+        memory_report = self.import_worker.memory_report
+        self.finish_import()
+
+        # Daten in Session speichern
+        file_key = os.path.basename(file_path).split('.')[0]
+        self.set_dataframe(file_key, df)
+
+        # Für spätere Sitzungen binär in der lokalen Datenbank ablegen
+        if self.store_imports:
+            self.store_datasets([(file_key, df, f"Import aus '{file_path}', Tabellenblatt '{sheet_name}'")])
+
+        # Speicherbericht anzeigen
+        if memory_report is not None:
+            self.main_window.import_tab.show_memory_report(file_key, memory_report)
+
+        # Vorschau aktualisieren
+        self.main_window.import_tab.update_preview(df)
+
+        # Verfügbare Datensätze in allen Tabs aktualisieren
+        self.update_data_sources()
+
+        # Erfolgsmeldung mit Cache-Statistik
+        cache_stats = self.excel_cache.stats()
+        self.main_window.show_status(
+            f"Daten aus '{file_path}' erfolgreich geladen "
+            f"(Cache: {cache_stats['hits']} Treffer, {cache_stats['misses']} Fehlzugriffe)"
+        )
+
+    def on_import_error(self, message):
+        """Wird aufgerufen, wenn der Import fehlschlägt"""
+        self.finish_import()
+        self.main_window.show_error("Fehler beim Importieren der Daten", message)
+
+    def on_import_cancelled(self):
+        """Wird aufgerufen, wenn der Import abgebrochen wurde"""
+        self.finish_import()
+        self.main_window.show_status("Import abgebrochen")
+
+    def finish_import(self):
+        """Setzt den Import-Zustand der GUI zurück"""
+        self.import_worker = None
+        self.main_window.hide_progress()
+        self.main_window.import_tab.set_import_running(False)
+
+    def on_batch_import(self, source, sheet_text, options):
+        """Importiert mehrere Dateien bzw. Tabellenblätter parallel"""
+        if self.import_worker is not None:
+            self.main_window.show_status("Es läuft bereits ein Import")
+            return
+
+        options = dict(options)
+        self.store_imports = options.pop("store", False)
+        worker = FunctionWorker(self.toolbox.load_batch, source, cancellable=True,
+                                sheet_name=self.parse_sheet_selector(sheet_text), **options)
+        worker.signals.progress.connect(self.on_batch_progress)
+        worker.signals.finished.connect(self.on_batch_finished)
+        worker.signals.error.connect(self.on_import_error)
+        worker.signals.cancelled.connect(self.on_import_cancelled)
+
+        self.import_worker = worker
+        self.main_window.import_tab.set_import_running(True)
+        self.main_window.show_progress(0, 0)
+        self.main_window.show_status(f"Stapelimport aus '{source}' gestartet...", 0)
+        self.thread_pool.start(worker)
+
+    @staticmethod
+    def parse_sheet_selector(text):
+        """Übersetzt die Tabellenblatt-Eingabe in einen Selektor für load_batch
+
+        Zahlen bleiben Text: Ob "2024" ein Blattname oder eine Position ist,
+        entscheidet load_batch anhand der Blattnamen jeder Arbeitsmappe.
+        """
+        if not text:
+            return 0
+        if text == "*":
+            return None
+
+        parts = [part.strip() for part in text.split(",") if part.strip()]
+        return parts[0] if len(parts) == 1 else parts
+
+    def on_batch_progress(self, done, total, _):
+        """Zeigt den Fortschritt des Stapelimports an"""
+        self.main_window.show_progress(done, total)
+        self.main_window.show_status(f"Stapelimport: {done} von {total} Dateien verarbeitet...", 0)
+
+    def on_batch_finished(self, result):
+        """Registriert die Ergebnisse des Stapelimports"""
+        self.finish_import()
+
+        registrations = []
+        for key, df in result["datasets"].items():
+            path, sheet = result["sources"][key]
+            self.set_dataframe(key, df)
+            registrations.append((key, df, f"Stapelimport aus '{path}', Tabellenblatt '{sheet}'", path))
+
+            if key in result["memory"]:
+                self.main_window.import_tab.show_memory_report(key, result["memory"][key])
+
+        # Alle Datensätze binär speichern bzw. mit ihrem Quellpfad in einer Transaktion registrieren
+        if self.store_imports:
+            self.store_datasets([(key, df, description) for key, df, description, _ in registrations])
+        else:
+            self.data_manager.register_datasets(
+                [(key, description, path) for key, _, description, path in registrations])
+
+        self.update_data_sources()
+
+        stats = result["stats"]
+        summary = (
+            f"{stats['sheets']} Datensätze aus {stats['files']} Dateien geladen "
+            f"({stats['rows']} Zeilen in {stats['seconds']:.1f} s, "
+            f"{stats['files_per_second']:.1f} Dateien/s, {stats['rows_per_second']:.0f} Zeilen/s)"
+        )
+        self.main_window.show_status(summary)
+
+        if result["errors"]:
+            details = "\n".join(f"{name}: {message}" for name, message in result["errors"].items())
+            self.main_window.show_error("Fehler beim Stapelimport", f"{summary}\n\nFehler:\n{details}")
+
+    def store_datasets(self, datasets):
+        """Speichert Datensätze (name, df, description) im Hintergrund in der lokalen Datenbank"""
+        worker = FunctionWorker(self.data_manager.store_datasets, datasets)
+        worker.signals.finished.connect(lambda stored: self.on_datasets_stored(worker, stored))
+        worker.signals.error.connect(lambda message: self.on_datasets_stored(worker, False))
+
+        self.store_workers.add(worker)
+        self.thread_pool.start(worker)
+
+    def on_datasets_stored(self, worker, stored):
+        """Aktualisiert die gespeicherten Datensätze nach dem Speichern"""
+        self.store_workers.discard(worker)
+        if stored:
+            self.update_stored_datasets()
+        else:
+            self.main_window.show_status("Datensätze konnten nicht in der lokalen Datenbank gespeichert werden")
+
+    def update_stored_datasets(self):
+        """Aktualisiert die Liste der gespeicherten Datensätze im Import-Tab"""
+        self.main_window.import_tab.set_stored_datasets(self.data_manager.get_datasets())
+
+    def on_load_stored_dataset(self, name):
+        """Lädt einen gespeicherten Datensatz in die Sitzung"""
+        df = self.data_manager.load_dataset(name)
+        if df is None:
+            self.main_window.show_error("Fehler beim Laden des Datensatzes",
+                                        f"Datensatz '{name}' konnte nicht geladen werden")
+            return
+
+        self.set_dataframe(name, df)
+        self.main_window.import_tab.update_preview(df)
+        self.update_data_sources()
+        self.main_window.show_status(f"Datensatz '{name}' geladen ({len(df)} Zeilen)")
 
     def update_data_sources(self):
         """Aktualisiert die verfügbaren Datensätze in allen Tabs"""
@@ -76,30 +301,40 @@ class ControllerApp:
         self.main_window.analysis_tab.set_data_sources(data_keys)
         self.main_window.visualization_tab.set_data_sources(data_keys)
         self.main_window.reporting_tab.set_data_sources(data_keys)
+        self.main_window.forecasting_tab.set_data_sources(data_keys)
 
     def on_run_analysis(self, data_key, analysis_type, parameters):
         """Führt eine Analyse durch"""
         try:
-            # Daten abrufen
-            df = self.dataframes.get(data_key)
-            if df is None:
-                raise ValueError(f"Datensatz '{data_key}' nicht gefunden")
+            # Veraltete abgeleitete Ausgangsdatensätze zuerst neu berechnen
+            upstream = [data_key]
+            if "plan_data_key" in parameters:
+                upstream.append(parameters["plan_data_key"])
+            self.dataset_graph.refresh(upstream)
+
+            # Zwischengespeichertes Ergebnis für dieselben Datensatzversionen und Parameter
+            datasets = [(key, self.dataframes.version(key)) for key in upstream]
+            cache_key = ResultCache.make_key(analysis_type, datasets, parameters)
 
-            # Analyse durchführen
-            if analysis_type == "kpi":
-                result = self.toolbox.calculate_kpis(df, **parameters)
-            elif analysis_type == "variance":
-                plan_key = parameters.pop("plan_data_key")
-                plan_df = self.dataframes.get(plan_key)
-                if plan_df is None:
-                    raise ValueError(f"Plan-Datensatz '{plan_key}' nicht gefunden")
-                result = self.toolbox.variance_analysis(df, plan_df, **parameters)
+            result = self.result_cache.get(cache_key)
+            if result is None:
+                result = self.run_analysis(data_key, analysis_type, dict(parameters))
+                self.result_cache.put(cache_key, result)
+                self.main_window.show_status("Analyse abgeschlossen")
             else:
-                raise ValueError(f"Unbekannter Analysetyp: {analysis_type}")
+                self.main_window.show_status("Analyseergebnis aus dem Cache geladen")
 
-            # Ergebnis speichern
+            # Ergebnis speichern (unverändertes Ergebnis nicht erneut zuweisen)
             result_key = f"{data_key}_{analysis_type}"
-            self.dataframes[result_key] = result
+            if result_key not in self.dataframes or self.dataframes[result_key] is not result:
+                self.set_dataframe(result_key, result)
+
+            # Herkunft festhalten, damit das Ergebnis bei Änderungen neu berechnet werden kann
+            recipe = {name: value for name, value in parameters.items() if name != "plan_data_key"}
+            if len(upstream) > 1:
+                recipe["plan_key"] = upstream[1]
+            self.dataset_graph.define(result_key, partial(self.compute_analysis, analysis_type),
+                                      upstream, recipe, built=True)
 
             # Ergebnis anzeigen
             self.main_window.analysis_tab.show_result(result)
@@ -109,34 +344,155 @@ class ControllerApp:
         except Exception as e:
             self.main_window.show_error("Analysefehler", str(e))
 
+    def run_analysis(self, data_key, analysis_type, parameters):
+        """Berechnet eine Analyse ohne Cache"""
+        # Daten abrufen
+        df = self.get_dataframe(data_key)
+        if df is None:
+            raise ValueError(f"Datensatz '{data_key}' nicht gefunden")
+
+        plan_key = parameters.pop("plan_data_key", None)
+        plan_df = None
+        if plan_key is not None:
+            plan_df = self.get_dataframe(plan_key)
+            if plan_df is None:
+                raise ValueError(f"Plan-Datensatz '{plan_key}' nicht gefunden")
+
+        return self.compute_analysis(analysis_type, df, plan_df, plan_key=plan_key, **parameters)
+
+    def compute_analysis(self, analysis_type, df, plan_df=None, plan_key=None, **parameters):
+        """Führt eine Analyse auf bereits geladenen Datensätzen aus"""
+        if analysis_type == "kpi":
+            return self.toolbox.calculate_kpis(df, **parameters)
+        elif analysis_type == "variance":
+            plan = self.get_prepared_plan(plan_key, plan_df, **parameters)
+            return self.toolbox.variance_analysis(df, plan, **parameters)
+        elif analysis_type == "decomposition":
+            return self.toolbox.variance_decomposition(df, plan_df, **parameters)
+        elif analysis_type == "time_intelligence":
+            return self.toolbox.time_intelligence(df, **parameters)
+        else:
+            raise ValueError(f"Unbekannter Analysetyp: {analysis_type}")
+
+    def get_dataframe(self, key):
+        """Liefert einen Datensatz der Sitzung; veraltete abgeleitete Datensätze werden neu berechnet"""
+        return self.dataset_graph.get(key)
+
+    def set_dataframe(self, key, df):
+        """Legt einen Datensatz in der Sitzung ab und verwirft darauf beruhende Ergebnisse"""
+        self.dataframes[key] = df
+        self.dataset_graph.forget(key)
+        self.result_cache.discard_dataset(key)
+
+    def on_session_store_error(self, message):
+        """Meldet Auslagerungsfehler des Datenspeichers (erst nach dem laufenden Speicherzugriff)"""
+        QTimer.singleShot(0, partial(self.main_window.show_error, "Speicherfehler", message))
+
+    def get_prepared_plan(self, plan_key, plan_df, key_column, value_columns=None):
+        """Liefert den aufbereiteten Plan, solange sich der Plan-Datensatz nicht geändert hat"""
+        key = tuple(key_column) if isinstance(key_column, list) else key_column
+        cache_key = (plan_key, key, tuple(value_columns) if value_columns else None)
+        plan = self.prepared_plans.get(cache_key)
+        if plan is None or not plan.is_prepared_from(plan_df):
+            plan = self.toolbox.prepare_plan(plan_df, key_column, value_columns or None)
+            self.prepared_plans[cache_key] = plan
+        return plan
+
     def on_create_chart(self, data_key, chart_type, parameters):
-        """Erstellt ein Diagramm"""
+        """Erstellt ein Diagramm im Hintergrund oder zeigt es aus dem Cache an
+
+        Liegt nur eine ältere Version des Diagramms vor (Datensatz inzwischen
+        geändert), wird diese sofort angezeigt und im Hintergrund aktualisiert.
+        """
         try:
-            # Daten abrufen
-            df = self.dataframes.get(data_key)
+            # Daten abrufen (veraltete abgeleitete Datensätze werden dabei neu berechnet)
+            df = self.get_dataframe(data_key)
             if df is None:
                 raise ValueError(f"Datensatz '{data_key}' nicht gefunden")
+        except Exception as e:
+            self.main_window.show_error("Visualisierungsfehler", str(e))
+            return
 
-            # Diagramm erstellen
-            if chart_type == "time_series":
-                fig = self.toolbox.plot_time_series(df, **parameters)
-            elif chart_type == "variance":
-                fig = self.toolbox.plot_variance(df, **parameters)
-            else:
-                raise ValueError(f"Unbekannter Diagrammtyp: {chart_type}")
+        self.displayed_chart = (data_key, chart_type, dict(parameters))
+        cache_key = ResultCache.make_key(chart_type, [(data_key, self.dataframes.version(data_key))], parameters)
+        # Dasselbe Diagramm unabhängig von der Datensatzversion
+        chart_id = ResultCache.make_key(chart_type, [(data_key, None)], parameters)
+        self.chart_request = cache_key
+
+        figure = self.chart_cache.get(cache_key)
+        if figure is not None:
+            self.main_window.visualization_tab.show_chart(figure)
+            self.main_window.show_status("Diagramm aus dem Cache geladen")
+            return
+
+        # Ältere Version sofort anzeigen, aktuelle im Hintergrund zeichnen
+        stale_key = self.latest_charts.get(chart_id)
+        stale = self.chart_cache.get(stale_key) if stale_key is not None else None
+        if stale is not None:
+            self.main_window.visualization_tab.show_chart(stale)
+            self.main_window.show_status("Veraltetes Diagramm angezeigt, wird aktualisiert...", 0)
+        else:
+            self.main_window.show_status("Diagramm wird erstellt...", 0)
+
+        if cache_key in self.chart_workers:
+            return
+
+        worker = FunctionWorker(self.toolbox.render_chart, df, chart_type, **parameters)
+        worker.signals.finished.connect(lambda figure: self.on_chart_rendered(chart_id, cache_key, figure))
+        worker.signals.error.connect(lambda message: self.on_chart_error(cache_key, message))
+        self.chart_workers[cache_key] = worker
+        self.thread_pool.start(worker)
+
+    def on_chart_rendered(self, chart_id, cache_key, figure):
+        """Speichert ein im Hintergrund gezeichnetes Diagramm und zeigt es an, falls es noch angefordert ist"""
+        self.chart_workers.pop(cache_key, None)
+        self.chart_cache.put(cache_key, figure)
+        self.latest_charts[chart_id] = cache_key
 
-            # Diagramm anzeigen
-            self.main_window.visualization_tab.show_chart(fig)
+        if self.chart_request == cache_key:
+            self.main_window.visualization_tab.show_chart(figure)
+            self.main_window.show_status("Diagramm erstellt")
+
+    def on_chart_error(self, cache_key, message):
+        """Zeigt einen Fehler beim Zeichnen an"""
+        self.chart_workers.pop(cache_key, None)
+        if self.chart_request == cache_key:
+            self.main_window.show_status("Diagramm konnte nicht erstellt werden")
+            self.main_window.show_error("Visualisierungsfehler", message)
+
+    def on_tab_changed(self, index):
+        """Aktualisiert beim Wechsel in die Visualisierung ein veraltetes Diagramm"""
+        if self.main_window.tab_widget.widget(index) is not self.main_window.visualization_tab:
+            return
+        if self.displayed_chart is None:
+            return
+
+        data_key, chart_type, parameters = self.displayed_chart
+        if data_key not in self.dataframes and not self.dataset_graph.is_derived(data_key):
+            return
+        cache_key = ResultCache.make_key(chart_type, [(data_key, self.dataframes.version(data_key))], parameters)
+        if cache_key != self.chart_request or self.dataset_graph.is_stale(data_key):
+            self.on_create_chart(data_key, chart_type, parameters)
+
+    def on_export_chart_data(self, file_path):
+        """Exportiert die Daten des angezeigten Diagramms in voller Auflösung"""
+        try:
+            figure = self.main_window.visualization_tab.chart_view.figure
+            output_path = self.toolbox.export_chart_data(figure, file_path)
+            self.main_window.show_status(f"Diagrammdaten exportiert: {output_path}")
         except Exception as e:
-            self.main_window.show_error("Visualisierungsfehler", str(e))
+            self.main_window.show_error("Exportfehler", str(e))
 
     def on_generate_report(self, config):
         """Generiert einen Bericht"""
         try:
+            # Veraltete Datensätze des Berichts gemeinsam (unabhängige parallel) neu berechnen
+            self.dataset_graph.refresh(list(config["data_mapping"].values()))
+
             # Daten für den Bericht sammeln
             data_dict = {}
             for sheet_name, data_key in config["data_mapping"].items():
-                df = self.dataframes.get(data_key)
+                df = self.get_dataframe(data_key)
                 if df is None:
                     raise ValueError(f"Datensatz '{data_key}' nicht gefunden")
                 data_dict[sheet_name] = df
@@ -154,4 +510,58 @@ class ControllerApp:
             # Bericht anzeigen
             self.main_window.reporting_tab.show_report_info(report_path)
         except Exception as e:
-            self.main_window.show_error("Berichtsfehler", str(e))
\ No newline at end of file
+            self.main_window.show_error("Berichtsfehler", str(e))
+
+    def on_create_forecast(self, data_key, time_col, value_col, method, periods, options):
+        """Erstellt eine Prognose im Hintergrund"""
+        if self.forecast_worker is not None:
+            self.main_window.show_status("Es läuft bereits eine Prognose")
+            return
+
+        try:
+            df = self.get_dataframe(data_key)
+            if df is None:
+                raise ValueError(f"Datensatz '{data_key}' nicht gefunden")
+        except Exception as e:
+            self.main_window.show_error("Prognosefehler", str(e))
+            return
+
+        parameters = dict(options, time_col=time_col, value_col=value_col, periods=periods, method=method)
+        worker = FunctionWorker(self.toolbox.create_forecast, df, **parameters)
+        worker.signals.progress.connect(self.on_forecast_progress)
+        worker.signals.finished.connect(
+            lambda result: self.on_forecast_finished(data_key, df, parameters, result))
+        worker.signals.error.connect(self.on_forecast_error)
+
+        self.forecast_worker = worker
+        self.main_window.forecasting_tab.set_running(True)
+        self.main_window.show_progress(0, 0)
+        self.main_window.show_status(f"Prognose für '{data_key}' wird berechnet...", 0)
+        self.thread_pool.start(worker)
+
+    def on_forecast_progress(self, done, total, _):
+        """Zeigt den Fortschritt der Prognose an (Anzahl berechneter Reihen)"""
+        self.main_window.show_progress(done, total)
+
+    def on_forecast_finished(self, data_key, df, parameters, result):
+        """Speichert und zeigt die fertige Prognose an"""
+        self.finish_forecast()
+
+        result_key = f"{data_key}_forecast"
+        self.set_dataframe(result_key, result)
+        self.dataset_graph.define(result_key, self.toolbox.create_forecast, [data_key], parameters, built=True)
+
+        self.main_window.forecasting_tab.show_forecast(df, result, parameters["time_col"], parameters["value_col"])
+        self.main_window.show_status(f"Prognose gespeichert als '{result_key}'")
+        self.update_data_sources()
+
+    def on_forecast_error(self, message):
+        """Zeigt einen Fehler bei der Prognose an"""
+        self.finish_forecast()
+        self.main_window.show_error("Prognosefehler", message)
+
+    def finish_forecast(self):
+        """Setzt den Prognose-Zustand der GUI zurück"""
+        self.forecast_worker = None
+        self.main_window.hide_progress()
+        self.main_window.forecasting_tab.set_running(False)
\ No newline at end of file
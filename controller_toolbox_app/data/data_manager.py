@@ -1,13 +1,33 @@
+import hashlib
+import json
 import os
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 import pandas as pd
 
 
+# Zusätzliche Spalten der Tabelle datasets für binär gespeicherte Datensätze
+DATASET_COLUMNS = {
+    "storage_format": "TEXT",
+    "schema_json": "TEXT",
+    "row_count": "INTEGER",
+    "checksum": "TEXT",
+    "updated_at": "TIMESTAMP"
+}
+
+
 class DataManager:
-    """Klasse für die Datenhaltung"""
+    """Klasse für die Datenhaltung
 
-    def __init__(self, db_path=None):
+    Jeder Thread erhält eine eigene SQLite-Verbindung (WAL-Modus), sodass
+    Hintergrund-Worker parallel lesen können. Einstellungen werden in einem
+    Lese-Cache gehalten.
+    """
+
+    def __init__(self, db_path=None, cache=None):
         # Pfad zur SQLite-Datenbank
         if db_path is None:
             app_dir = Path.home() / ".controller_toolbox"
@@ -15,13 +35,71 @@ class DataManager:
             db_path = app_dir / "controller_data.db"
 
         self.db_path = str(db_path)
-        self.conn = None
+        self.cache = cache
+
+        # Verbindungen je Thread
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+        # Lese-Cache für Einstellungen (None = noch nicht geladen)
+        self._settings_cache = None
+        self._settings_lock = threading.Lock()
+
+        # Verzeichnis für binär gespeicherte Datensätze neben der Datenbank
+        self.datasets_dir = Path(self.db_path).parent / "datasets"
         self.init_db()
 
+    @property
+    def conn(self):
+        """SQLite-Verbindung des aktuellen Threads"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Wartezeit statt sofortigem Fehler, wenn ein anderer Thread schreibt. Genutzt wird
+            # die Verbindung nur von ihrem Thread; check_same_thread=False erlaubt close() das
+            # Schließen aus einem anderen Thread
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Fasst mehrere Schreibzugriffe zu einer Transaktion zusammen"""
+        conn = self.conn
+        self._local.depth += 1
+        try:
+            yield conn
+        except Exception:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.rollback()
+                # Der Cache könnte zurückgerollte Werte enthalten
+                self._invalidate_settings()
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.commit()
+
+    def close(self):
+        """Schließt die Verbindungen aller Threads"""
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
     def init_db(self):
         """Initialisiert die Datenbank-Tabellen"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
             cursor = self.conn.cursor()
 
             # Tabelle für Einstellungen
@@ -43,44 +121,73 @@ class DataManager:
             )
             ''')
 
+            # Bestehende Datenbanken um die Metadaten-Spalten erweitern
+            cursor.execute('PRAGMA table_info(datasets)')
+            existing_columns = {row[1] for row in cursor.fetchall()}
+            for column, column_type in DATASET_COLUMNS.items():
+                if column not in existing_columns:
+                    cursor.execute(f'ALTER TABLE datasets ADD COLUMN {column} {column_type}')
+
             self.conn.commit()
         except Exception as e:
             print(f"Fehler bei der Datenbank-Initialisierung: {e}")
 
     def save_setting(self, key, value):
         """Speichert eine Anwendungseinstellung"""
+        return self.save_settings({key: value})
+
+    def save_settings(self, settings):
+        """Speichert mehrere Anwendungseinstellungen in einer Transaktion"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-            INSERT OR REPLACE INTO settings (key, value)
-            VALUES (?, ?)
-            ''', (key, str(value)))
-            self.conn.commit()
+            rows = [(key, str(value)) for key, value in settings.items()]
+            with self.transaction() as conn:
+                conn.executemany('''
+                INSERT OR REPLACE INTO settings (key, value)
+                VALUES (?, ?)
+                ''', rows)
+
+            # Cache fortschreiben
+            with self._settings_lock:
+                if self._settings_cache is not None:
+                    self._settings_cache.update(rows)
             return True
         except Exception as e:
             print(f"Fehler beim Speichern der Einstellung: {e}")
             return False
 
+    def _load_settings(self):
+        """Lädt alle Einstellungen einmalig in den Cache"""
+        with self._settings_lock:
+            if self._settings_cache is None:
+                cursor = self.conn.cursor()
+                cursor.execute('SELECT key, value FROM settings')
+                self._settings_cache = dict(cursor.fetchall())
+            return self._settings_cache
+
+    def _invalidate_settings(self):
+        with self._settings_lock:
+            self._settings_cache = None
+
     def get_setting(self, key, default=None):
         """Liest eine Anwendungseinstellung"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
-            result = cursor.fetchone()
-            return result[0] if result else default
+            return self._load_settings().get(key, default)
         except Exception as e:
             print(f"Fehler beim Lesen der Einstellung: {e}")
             return default
 
     def register_dataset(self, name, description, file_path):
         """Registriert einen Datensatz in der Datenbank"""
+        return self.register_datasets([(name, description, file_path)])
+
+    def register_datasets(self, datasets):
+        """Registriert mehrere Datensätze (name, description, file_path) in einer Transaktion"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-            INSERT OR REPLACE INTO datasets (name, description, file_path)
-            VALUES (?, ?, ?)
-            ''', (name, description, file_path))
-            self.conn.commit()
+            with self.transaction() as conn:
+                conn.executemany('''
+                INSERT OR REPLACE INTO datasets (name, description, file_path)
+                VALUES (?, ?, ?)
+                ''', [tuple(dataset) for dataset in datasets])
             return True
         except Exception as e:
             print(f"Fehler beim Registrieren des Datensatzes: {e}")
@@ -96,23 +203,126 @@ class DataManager:
             print(f"Fehler beim Abrufen der Datensätze: {e}")
             return []
 
+    def store_dataset(self, name, df, description=""):
+        """Speichert einen DataFrame als Parquet-Datei und registriert ihn mit Metadaten"""
+        return self.store_datasets([(name, df, description)])
+
+    def store_datasets(self, datasets, progress_callback=None):
+        """Speichert mehrere Datensätze (name, df, description) als Parquet-Dateien
+
+        Die Dateien werden nacheinander geschrieben, die Metadaten anschließend
+        in einer Transaktion registriert. progress_callback(done, total) wird
+        nach jeder Datei aufgerufen.
+        """
+        try:
+            self.datasets_dir.mkdir(parents=True, exist_ok=True)
+            rows = []
+            for done, (name, df, description) in enumerate(datasets, start=1):
+                file_path = self.datasets_dir / f"{_dataset_file_stem(name)}.parquet"
+                tmp_path = file_path.with_suffix(".tmp")
+
+                # Erst vollständig schreiben, dann atomar ersetzen
+                df.to_parquet(tmp_path)
+                checksum = _file_checksum(tmp_path)
+                os.replace(tmp_path, file_path)
+
+                schema = {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+                rows.append((name, description, str(file_path), json.dumps(schema), len(df), checksum))
+
+                if progress_callback is not None:
+                    progress_callback(done, len(datasets))
+
+            with self.transaction() as conn:
+                conn.executemany('''
+                INSERT OR REPLACE INTO datasets
+                    (name, description, file_path, storage_format, schema_json, row_count, checksum, updated_at)
+                VALUES (?, ?, ?, 'parquet', ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', rows)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern des Datensatzes: {e}")
+            return False
+
+    def load_dataset(self, name, verify=False):
+        """Lädt einen registrierten Datensatz (Parquet direkt, sonst über Excel)"""
+        try:
+            info = self.get_dataset_info(name)
+            if info is None:
+                return None
+
+            if info["storage_format"] != "parquet":
+                return self.load_dataframe(info["file_path"])
+
+            # Optional prüfen, ob die Datei seit dem Speichern verändert wurde
+            if verify and _file_checksum(info["file_path"]) != info["checksum"]:
+                raise ValueError(f"Prüfsumme des Datensatzes '{name}' stimmt nicht überein")
+
+            return pd.read_parquet(info["file_path"])
+        except Exception as e:
+            print(f"Fehler beim Laden des Datensatzes: {e}")
+            return None
+
+    def get_dataset_info(self, name):
+        """Gibt die Metadaten eines registrierten Datensatzes zurück"""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            SELECT name, description, file_path, storage_format, schema_json, row_count, checksum,
+                   created_at, updated_at
+            FROM datasets WHERE name = ?
+            ''', (name,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+
+            return {
+                "name": row[0],
+                "description": row[1],
+                "file_path": row[2],
+                "storage_format": row[3] or "excel",
+                "schema": json.loads(row[4]) if row[4] else None,
+                "row_count": row[5],
+                "checksum": row[6],
+                "created_at": row[7],
+                "updated_at": row[8]
+            }
+        except Exception as e:
+            print(f"Fehler beim Abrufen des Datensatzes: {e}")
+            return None
+
     def save_dataframe(self, df, file_path, sheet_name="Sheet1", index=True):
-        """Speichert einen DataFrame in eine Excel-Datei"""
+        """Speichert einen DataFrame in eine Excel- oder Parquet-Datei"""
         try:
             # Verzeichnis erstellen, falls es nicht existiert
             os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
 
             # DataFrame speichern
-            df.to_excel(file_path, sheet_name=sheet_name, index=index)
+            if str(file_path).lower().endswith(".parquet"):
+                df.to_parquet(file_path, index=index)
+            else:
+                df.to_excel(file_path, sheet_name=sheet_name, index=index)
             return True
         except Exception as e:
             print(f"Fehler beim Speichern des DataFrames: {e}")
             return False
 
     def load_dataframe(self, file_path, sheet_name=0):
-        """Lädt einen DataFrame aus einer Excel-Datei"""
+        """Lädt einen DataFrame aus einer Excel- oder Parquet-Datei"""
         try:
-            return pd.read_excel(file_path, sheet_name=sheet_name)
+            if str(file_path).lower().endswith(".parquet"):
+                return pd.read_parquet(file_path)
+
+            if self.cache is not None:
+                df = self.cache.get(file_path, sheet_name=sheet_name)
+                if df is not None:
+                    return df
+
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+
+            if self.cache is not None:
+                self.cache.put(file_path, df, sheet_name=sheet_name)
+
+            return df
         except Exception as e:
             print(f"Fehler beim Laden des DataFrames: {e}")
             return None
@@ -120,19 +330,33 @@ class DataManager:
     def get_config(self, section, default=None):
         """Liest eine Konfigurationssektion"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT value FROM settings WHERE key LIKE ?', (f"{section}_%",))
-            results = cursor.fetchall()
+            prefix = f"{section}_"
+            config = {
+                key[len(prefix):]: value
+                for key, value in self._load_settings().items()
+                if key.startswith(prefix)
+            }
+            return config if config else default
+        except Exception as e:
+            print(f"Fehler beim Lesen der Konfiguration: {e}")
+            return default
 
-            if not results:
-                return default
 
-            config = {}
-            for row in results:
-                key = row[0].split('_', 1)[1]
-                config[key] = row[0]
+def _dataset_file_stem(name):
+    """Dateiname eines gespeicherten Datensatzes
 
-            return config
-        except Exception as e:
-            print(f"Fehler beim Lesen der Konfiguration: {e}")
-            return default
\ No newline at end of file
+    Lesbarer Teil aus dem Namen plus Hash des vollständigen Namens, damit sich
+    z.B. "Ist 2024" und "Ist_2024" nicht dieselbe Datei teilen.
+    """
+    safe_name = re.sub(r'[^\w\-]', '_', name)
+    name_hash = hashlib.sha256(name.encode("utf-8")).hexdigest()[:12]
+    return f"{safe_name}_{name_hash}"
+
+
+def _file_checksum(file_path):
+    """Berechnet die SHA-256-Prüfsumme einer Datei"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
\ No newline at end of file
@@ -0,0 +1,178 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DerivedDataset:
+    """Bauanleitung eines abgeleiteten Datensatzes"""
+
+    def __init__(self, key, function, upstream, parameters):
+        self.key = key
+        self.function = function
+        self.upstream = list(upstream)
+        self.parameters = dict(parameters or {})
+
+        # Versionen der Ausgangsdatensätze bei der letzten Berechnung (None = nie berechnet)
+        self.built_versions = None
+
+
+class DatasetGraph:
+    """Abhängigkeitsgraph abgeleiteter Datensätze mit verzögerter Neuberechnung
+
+    Für jeden abgeleiteten Datensatz werden Funktion, Parameter und
+    Ausgangsdatensätze festgehalten. Ändert sich ein Ausgangsdatensatz (neue
+    Version im SessionStore), gilt der abgeleitete Datensatz als veraltet und
+    wird erst beim nächsten Zugriff neu berechnet. refresh berechnet ganze
+    Ketten in topologischer Reihenfolge, unabhängige Zweige parallel.
+    """
+
+    def __init__(self, store, on_update=None, max_workers=None):
+        self.store = store
+        self.on_update = on_update
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+
+        self._nodes = {}
+        self._lock = threading.RLock()
+
+    def define(self, key, function, upstream, parameters=None, built=False):
+        """Hält fest, wie ein Datensatz aus seinen Ausgangsdatensätzen entsteht
+
+        function wird mit den Ausgangs-DataFrames in der Reihenfolge von
+        upstream und den Parametern als Schlüsselwortargumente aufgerufen. Mit
+        built=True gilt der aktuell gespeicherte Datensatz als aktuell.
+        """
+        with self._lock:
+            if key in upstream or any(key in self.ancestors(up) for up in upstream):
+                raise ValueError(f"Zyklische Abhängigkeit für Datensatz '{key}'")
+
+            node = DerivedDataset(key, function, upstream, parameters)
+            if built:
+                node.built_versions = self._current_versions(node)
+            self._nodes[key] = node
+
+    def forget(self, key):
+        """Entfernt die Bauanleitung eines Datensatzes (er gilt dann als Ausgangsdatensatz)"""
+        with self._lock:
+            self._nodes.pop(key, None)
+
+    def is_derived(self, key):
+        return key in self._nodes
+
+    def upstream(self, key):
+        """Direkte Ausgangsdatensätze eines Datensatzes"""
+        node = self._nodes.get(key)
+        return list(node.upstream) if node is not None else []
+
+    def ancestors(self, key):
+        """Alle Datensätze, von denen ein Datensatz direkt oder indirekt abhängt"""
+        with self._lock:
+            found = set()
+            pending = self.upstream(key)
+            while pending:
+                current = pending.pop()
+                if current not in found:
+                    found.add(current)
+                    pending.extend(self.upstream(current))
+            return found
+
+    def dependents(self, key):
+        """Alle abgeleiteten Datensätze, die direkt oder indirekt auf einem Datensatz beruhen"""
+        with self._lock:
+            return {name for name in self._nodes if key in self.ancestors(name)}
+
+    def is_stale(self, key):
+        """Prüft, ob ein abgeleiteter Datensatz neu berechnet werden muss"""
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is None:
+                return False
+            if node.built_versions is None or key not in self.store:
+                return True
+            if node.built_versions != self._current_versions(node):
+                return True
+            return any(self.is_stale(up) for up in node.upstream)
+
+    def stale_keys(self):
+        """Alle veralteten abgeleiteten Datensätze"""
+        with self._lock:
+            return [key for key in self._nodes if self.is_stale(key)]
+
+    def get(self, key, default=None):
+        """Liefert einen Datensatz und berechnet ihn samt Vorgängern neu, falls er veraltet ist"""
+        if self.is_stale(key):
+            self.refresh([key], parallel=False)
+        return self.store.get(key, default)
+
+    def topological_order(self, keys=None):
+        """Abgeleitete Datensätze (inkl. benötigter Vorgänger) so sortiert, dass Vorgänger zuerst kommen"""
+        with self._lock:
+            if keys is None:
+                keys = list(self._nodes)
+
+            order = []
+            visited = set()
+
+            def visit(name):
+                if name in visited:
+                    return
+                visited.add(name)
+                for up in self.upstream(name):
+                    visit(up)
+                if name in self._nodes:
+                    order.append(name)
+
+            for key in keys:
+                visit(key)
+            return order
+
+    def refresh(self, keys=None, parallel=True):
+        """Berechnet veraltete Datensätze neu und gibt die neu berechneten Schlüssel zurück
+
+        Die Datensätze werden in Ebenen eingeteilt; alle Datensätze einer Ebene
+        hängen nur von früheren Ebenen ab und werden parallel berechnet.
+        """
+        with self._lock:
+            stale = [key for key in self.topological_order(keys) if self.is_stale(key)]
+
+            # Ebene = längster Weg von einem aktuellen Datensatz
+            levels = {}
+            for key in stale:
+                levels[key] = max((levels[up] + 1 for up in self.upstream(key) if up in levels), default=0)
+
+        waves = [[key for key in stale if levels[key] == level]
+                 for level in range(max(levels.values(), default=-1) + 1)]
+
+        for wave in waves:
+            if parallel and len(wave) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(wave))) as executor:
+                    list(executor.map(self._compute, wave))
+            else:
+                for key in wave:
+                    self._compute(key)
+        return stale
+
+    def _compute(self, key):
+        """Berechnet einen Datensatz aus seinen (aktuellen) Ausgangsdatensätzen"""
+        with self._lock:
+            node = self._nodes[key]
+            versions = self._current_versions(node)
+
+        frames = []
+        for up in node.upstream:
+            df = self.store.get(up)
+            if df is None:
+                raise KeyError(f"Ausgangsdatensatz '{up}' für '{key}' nicht gefunden")
+            frames.append(df)
+
+        result = node.function(*frames, **node.parameters)
+
+        with self._lock:
+            self.store[key] = result
+            node.built_versions = versions
+
+        if self.on_update is not None:
+            self.on_update(key)
+        return result
+
+    def _current_versions(self, node):
+        return {up: self.store.version(up) for up in node.upstream}
\ No newline at end of file
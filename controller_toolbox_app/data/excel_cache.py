@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+class ExcelCache:
+    """Persistenter Parquet-Cache für eingelesene Tabellenblätter mit LRU-Verdrängung"""
+
+    def __init__(self, cache_dir=None, max_size_mb=1024):
+        # Cache-Verzeichnis neben der SQLite-Datenbank
+        if cache_dir is None:
+            cache_dir = Path.home() / ".controller_toolbox" / "cache"
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.enabled = PARQUET_AVAILABLE
+
+        # Statistik
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._hash_memo = {}    # Pfad -> (Größe, Änderungszeit, Hash)
+        self._index = self._load_index()
+
+    def _load_index(self):
+        """Lädt das Verzeichnis der Cache-Einträge"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        """Schreibt das Verzeichnis der Cache-Einträge atomar"""
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _content_hash(self, filepath, stat):
+        """Berechnet den SHA-256-Hash des Dateiinhalts"""
+        # Hash nur neu berechnen, wenn sich Größe oder Änderungszeit geändert haben
+        path = os.path.abspath(filepath)
+        memo = self._hash_memo.get(path)
+        if memo is not None and memo[:2] == (stat.st_size, stat.st_mtime_ns):
+            return memo[2]
+
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+
+        content_hash = digest.hexdigest()
+        self._hash_memo[path] = (stat.st_size, stat.st_mtime_ns, content_hash)
+        return content_hash
+
+    def make_key(self, filepath, **options):
+        """Erzeugt den Cache-Schlüssel für eine Datei und ihre Leseoptionen"""
+        stat = os.stat(filepath)
+        key_data = {
+            "content": self._content_hash(filepath, stat),
+            "mtime": stat.st_mtime_ns,
+            "options": {name: repr(value) for name, value in sorted(options.items())}
+        }
+        raw = json.dumps(key_data, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, filepath, **options):
+        """Liefert den gecachten DataFrame oder None"""
+        if not self.enabled:
+            return None
+
+        try:
+            key = self.make_key(filepath, **options)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._index.get(key)
+            entry_path = self.cache_dir / entry["file"] if entry else None
+
+            if entry is None or not entry_path.exists():
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+
+            try:
+                df = pd.read_parquet(entry_path)
+            except Exception:
+                # Beschädigten Eintrag verwerfen
+                self._remove_entry(key)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            # Zugriffszeit nur im Speicher aktualisieren, geschrieben wird sie mit dem nächsten put
+            entry["last_access"] = time.time()
+            self.hits += 1
+            return df
+
+    def put(self, filepath, df, **options):
+        """Legt einen DataFrame im Cache ab (best effort)"""
+        if not self.enabled or not isinstance(df, pd.DataFrame):
+            return False
+
+        try:
+            key = self.make_key(filepath, **options)
+            file_name = f"{key}.parquet"
+            entry_path = self.cache_dir / file_name
+            tmp_path = self.cache_dir / f"{key}.tmp"
+
+            # Nicht jeder DataFrame ist als Parquet darstellbar (z.B. gemischte Typen)
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, entry_path)
+        except Exception:
+            return False
+
+        with self._lock:
+            self._index[key] = {
+                "file": file_name,
+                "source": os.path.abspath(filepath),
+                "size": entry_path.stat().st_size,
+                "last_access": time.time()
+            }
+            self._evict()
+            self._save_index()
+        return True
+
+    def _remove_entry(self, key):
+        """Entfernt einen Eintrag samt Datei"""
+        entry = self._index.pop(key, None)
+        if entry:
+            try:
+                os.remove(self.cache_dir / entry["file"])
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Entfernt die am längsten nicht genutzten Einträge bis zur Maximalgröße"""
+        total_size = sum(entry["size"] for entry in self._index.values())
+        by_age = sorted(self._index.items(), key=lambda item: item[1]["last_access"])
+
+        for key, entry in by_age:
+            if total_size <= self.max_size:
+                break
+            total_size -= entry["size"]
+            self._remove_entry(key)
+
+    def clear(self):
+        """Leert den Cache vollständig"""
+        with self._lock:
+            for key in list(self._index.keys()):
+                self._remove_entry(key)
+            self._save_index()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Gibt Statistiken zur Cache-Nutzung zurück"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "entries": len(self._index),
+                "size_bytes": sum(entry["size"] for entry in self._index.values()),
+                "max_size_bytes": self.max_size
+            }
\ No newline at end of file
@@ -0,0 +1,148 @@
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+
+class ResultCache:
+    """Arbeitsspeicher-Cache für Analyseergebnisse mit LRU-Verdrängung und Speicherobergrenze
+
+    Schlüssel enthalten die Versionen der verwendeten Datensätze. Wird ein
+    Datensatz ersetzt, ändert sich seine Version und ältere Ergebnisse werden
+    nicht mehr getroffen; sie werden über discard_dataset sofort oder über die
+    LRU-Verdrängung später entfernt. Mit max_entries wird zusätzlich die Anzahl
+    der Einträge begrenzt (z.B. für Diagramme).
+    """
+
+    def __init__(self, max_size_mb=256, max_entries=None):
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # Schlüssel -> (Ergebnis, Größe, verwendete Datensätze)
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # Statistik
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(analysis_type, datasets, parameters):
+        """Bildet einen Cache-Schlüssel
+
+        datasets ist eine Liste von (Datensatzname, Version), parameters ein
+        dict mit den Analyseparametern.
+        """
+        return (analysis_type, tuple(datasets), _freeze(parameters))
+
+    def get(self, key):
+        """Gibt ein zwischengespeichertes Ergebnis zurück oder None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, result):
+        """Speichert ein Ergebnis und verdrängt bei Bedarf die am längsten nicht genutzten"""
+        size = _estimate_size(result)
+        if size > self.max_size:
+            return False
+
+        datasets = {name for name, _ in key[1]}
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (result, size, datasets)
+            self._size += size
+
+            while self._size > self.max_size or (self.max_entries and len(self._entries) > self.max_entries):
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def discard_dataset(self, name):
+        """Entfernt alle Ergebnisse, die auf einem Datensatz beruhen"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if name in entry[2]]:
+                self._remove(key)
+
+    def clear(self):
+        """Leert den Cache"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Gibt Statistiken zur Cache-Nutzung zurück"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_size_bytes": self.max_size,
+                "max_entries": self.max_entries
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+def _freeze(value):
+    """Wandelt Parameter in eine hashbare Form um"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+def _estimate_size(result):
+    """Schätzt den Speicherbedarf eines Ergebnisses in Bytes"""
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+    if isinstance(result, Figure):
+        return _figure_size(result)
+    return 0
+
+
+def _figure_size(figure):
+    """Speicherbedarf der Daten einer Figur
+
+    Reduziert gezeichnete Linien halten über line.decimation ihre vollständigen
+    Daten; diese machen bei langen Zeitreihen den Großteil aus.
+    """
+    arrays = {}
+    for axes in figure.axes:
+        for line in axes.get_lines():
+            for values in (line.get_xdata(orig=False), line.get_ydata(orig=False)):
+                arrays[id(values)] = values
+            decimation = getattr(line, "decimation", None)
+            if decimation is not None:
+                for values in (decimation.x, decimation.y, decimation.x_numeric, decimation.x_plot):
+                    arrays[id(values)] = values
+        for collection in axes.collections:
+            for path in collection.get_paths():
+                arrays[id(path.vertices)] = path.vertices
+    return sum(_array_size(values) for values in arrays.values())
+
+
+def _array_size(values, sample_size=100):
+    """Speicherbedarf eines Arrays; bei Python-Objekten (z.B. Text) über eine Stichprobe geschätzt"""
+    values = np.asarray(values)
+    size = values.nbytes
+    if values.dtype == object and len(values):
+        sample = values.ravel()[:sample_size]
+        size += int(np.mean([sys.getsizeof(value) for value in sample]) * values.size)
+    return size
\ No newline at end of file
@@ -0,0 +1,219 @@
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+class SessionStore(MutableMapping):
+    """Datensätze der Sitzung mit Speicherbudget und Auslagerung auf die Festplatte
+
+    Verhält sich wie ein dict. Überschreiten die geladenen DataFrames das
+    Budget, werden die am längsten nicht genutzten als Arrow-IPC-Dateien
+    ausgelagert. Beim nächsten Zugriff wird der DataFrame wieder vollständig in
+    den Arbeitsspeicher geladen; vorher wird für ihn Platz im Budget geschaffen.
+
+    Fehler beim Auslagern werden an error_callback(Meldung) gemeldet (ohne
+    Callback als RuntimeWarning); der DataFrame bleibt dann im Speicher.
+    """
+
+    def __init__(self, memory_budget_mb=2048, spill_dir=None, error_callback=None):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.error_callback = error_callback
+
+        # Auslagerungsverzeichnis je Sitzung, wird beim Beenden entfernt
+        if spill_dir is None:
+            base_dir = Path.home() / ".controller_toolbox" / "spill"
+            base_dir.mkdir(parents=True, exist_ok=True)
+            spill_dir = tempfile.mkdtemp(prefix="session_", dir=base_dir)
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, str(self.spill_dir), True)
+
+        self._keys = {}                # Alle Schlüssel in Einfügereihenfolge
+        self._memory = OrderedDict()   # Geladene DataFrames, zuletzt genutzte am Ende
+        self._sizes = {}               # Geschätzter Speicherbedarf je Schlüssel
+        self._spilled = {}             # Ausgelagerte Schlüssel -> Dateipfad
+        self._versions = {}            # Schlüssel -> Version (steigt bei jeder Zuweisung)
+        self._unspillable = set()      # Schlüssel, deren Auslagerung fehlgeschlagen ist
+        self._counter = itertools.count()
+        self._version_counter = itertools.count(1)
+        self._lock = threading.RLock()
+
+        # Statistik
+        self.spill_count = 0
+        self.reload_count = 0
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+            if key not in self._spilled:
+                raise KeyError(key)
+
+            # Ausgelagerten DataFrame transparent nachladen, vorher Platz für ihn schaffen
+            self._enforce_budget(reserve=self._sizes.get(key, 0))
+            df = self._read_spilled(self._spilled[key])
+            self.reload_count += 1
+            self._memory[key] = df
+            self._enforce_budget()
+            return df
+
+    def __setitem__(self, key, df):
+        with self._lock:
+            self._discard_spilled(key)
+            self._unspillable.discard(key)
+            self._keys[key] = None
+            self._versions[key] = next(self._version_counter)
+            self._memory[key] = df
+            self._memory.move_to_end(key)
+            self._sizes[key] = _estimate_size(df)
+            self._enforce_budget()
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._keys:
+                raise KeyError(key)
+            del self._keys[key]
+            self._versions.pop(key, None)
+            self._memory.pop(key, None)
+            self._sizes.pop(key, None)
+            self._unspillable.discard(key)
+            self._discard_spilled(key)
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def version(self, key):
+        """Version eines Datensatzes; ändert sich bei jeder Zuweisung (None = unbekannt)
+
+        Auslagern und Nachladen verändern die Version nicht.
+        """
+        return self._versions.get(key)
+
+    def memory_usage(self):
+        """Geschätzter Speicherbedarf der geladenen DataFrames in Bytes"""
+        with self._lock:
+            return sum(self._sizes[key] for key in self._memory)
+
+    def is_spilled(self, key):
+        """Prüft, ob ein Datensatz derzeit ausgelagert ist"""
+        return key in self._spilled and key not in self._memory
+
+    def stats(self):
+        """Gibt Statistiken zur Speichernutzung zurück"""
+        with self._lock:
+            return {
+                "datasets": len(self._keys),
+                "in_memory": len(self._memory),
+                "spilled": sum(1 for key in self._spilled if key not in self._memory),
+                "memory_bytes": self.memory_usage(),
+                "budget_bytes": self.memory_budget,
+                "spill_count": self.spill_count,
+                "reload_count": self.reload_count
+            }
+
+    def close(self):
+        """Entfernt alle ausgelagerten Dateien"""
+        with self._lock:
+            self._memory.clear()
+            self._spilled.clear()
+            self._finalizer()
+
+    def _enforce_budget(self, reserve=0):
+        """Lagert die am längsten nicht genutzten DataFrames aus, bis das Budget eingehalten wird
+
+        reserve: Bytes, die zusätzlich frei bleiben sollen (für einen nachzuladenden DataFrame)
+        """
+        if not ARROW_AVAILABLE:
+            return
+
+        # Ohne Reservierung bleibt der zuletzt genutzte DataFrame immer im Speicher
+        candidates = list(self._memory) if reserve else list(self._memory)[:-1]
+        for key in candidates:
+            if self.memory_usage() + reserve <= self.memory_budget:
+                break
+            if key not in self._unspillable:
+                self._spill(key)
+
+    def _spill(self, key):
+        """Schreibt einen DataFrame als Arrow-IPC-Datei und gibt den Speicher frei"""
+        df = self._memory[key]
+        path = self.spill_dir / f"{next(self._counter)}.arrow"
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            with pa.OSFile(str(path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        except Exception as e:
+            # Nicht als Arrow darstellbare DataFrames bleiben im Speicher und werden
+            # bis zur nächsten Zuweisung nicht erneut ausgelagert
+            _remove_file(path)
+            self._unspillable.add(key)
+            self._report_error(f"Datensatz '{key}' konnte nicht ausgelagert werden und bleibt "
+                               f"im Arbeitsspeicher: {e}")
+            return
+
+        self._discard_spilled(key)
+        self._spilled[key] = path
+        del self._memory[key]
+        self.spill_count += 1
+
+    def _read_spilled(self, path):
+        """Lädt eine ausgelagerte Arrow-IPC-Datei als DataFrame
+
+        to_pandas kopiert alle Daten in den Arbeitsspeicher; die Speicherabbildung
+        erspart nur den zusätzlichen Lesepuffer.
+        """
+        source = pa.memory_map(str(path), "r")
+        table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas()
+
+    def _report_error(self, message):
+        """Meldet einen Fehler an error_callback bzw. als Warnung"""
+        if self.error_callback is not None:
+            self.error_callback(message)
+        else:
+            warnings.warn(message, RuntimeWarning)
+
+    def _discard_spilled(self, key):
+        """Entfernt die ausgelagerte Datei eines Schlüssels"""
+        path = self._spilled.pop(key, None)
+        if path is not None:
+            _remove_file(path)
+
+
+def _estimate_size(df):
+    """Schätzt den Speicherbedarf eines Objekts in Bytes"""
+    if isinstance(df, pd.DataFrame):
+        return int(df.memory_usage(deep=True).sum())
+    return 0
+
+
+def _remove_file(path):
+    """Löscht eine Datei, Fehler (z.B. noch gemappte Dateien unter Windows) werden ignoriert"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
\ No newline at end of file
@@ -1,5 +1,6 @@
-from .dashboard_tab import DashboardTab
-from .import_tab import ImportTab
-from .analysis_tab import AnalysisTab
-from .visualization_tab import VisualizationTab
-from .reporting_tab import ReportingTab
\ No newline at end of file
+from .tabs.dashboard_tab import DashboardTab
+from .tabs.import_tab import ImportTab
+from .tabs.analysis_tab import AnalysisTab
+from .tabs.visualization_tab import VisualizationTab
+from .tabs.reporting_tab import ReportingTab
+from .tabs.forecasting_tab import ForecastingTab
\ No newline at end of file
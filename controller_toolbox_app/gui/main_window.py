@@ -1,10 +1,11 @@
-from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QMessageBox, QStatusBar)
+from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QMessageBox, QStatusBar, QProgressBar)
 from PyQt6.QtCore import Qt
 from gui.tabs.dashboard_tab import DashboardTab
 from gui.tabs.import_tab import ImportTab
 from gui.tabs.analysis_tab import AnalysisTab
 from gui.tabs.visualization_tab import VisualizationTab
 from gui.tabs.reporting_tab import ReportingTab
+from gui.tabs.forecasting_tab import ForecastingTab
 
 
 class MainWindow(QMainWindow):
@@ -19,6 +20,12 @@ class MainWindow(QMainWindow):
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
 
+        # Fortschrittsanzeige für Hintergrundaufgaben
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setVisible(False)
+        self.statusBar.addPermanentWidget(self.progress_bar)
+
         # Tabs erstellen
         self.init_ui()
 
@@ -34,6 +41,7 @@ class MainWindow(QMainWindow):
         self.analysis_tab = AnalysisTab()
         self.visualization_tab = VisualizationTab()
         self.reporting_tab = ReportingTab()
+        self.forecasting_tab = ForecastingTab()
 
         # Tabs hinzufügen
         self.tab_widget.addTab(self.dashboard_tab, "Dashboard")
@@ -41,11 +49,22 @@ class MainWindow(QMainWindow):
         self.tab_widget.addTab(self.analysis_tab, "Analyse")
         self.tab_widget.addTab(self.visualization_tab, "Visualisierung")
         self.tab_widget.addTab(self.reporting_tab, "Reporting")
+        self.tab_widget.addTab(self.forecasting_tab, "Prognose")
 
     def show_status(self, message, timeout=5000):
         """Zeigt eine Statusmeldung an"""
         self.statusBar.showMessage(message, timeout)
 
+    def show_progress(self, value, maximum):
+        """Zeigt den Fortschritt an (maximum=0 für unbestimmten Fortschritt)"""
+        self.progress_bar.setRange(0, maximum)
+        self.progress_bar.setValue(min(value, maximum))
+        self.progress_bar.setVisible(True)
+
+    def hide_progress(self):
+        """Blendet die Fortschrittsanzeige aus"""
+        self.progress_bar.setVisible(False)
+
     def show_error(self, title, message):
         """Zeigt einen Fehlerdialog an"""
         QMessageBox.critical(self, title, message)
@@ -0,0 +1,303 @@
+import re
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+# Vergleichsfilter für Zahlen- und Datumsspalten, z.B. ">= 1000" oder "<2024-01-01"
+COMPARISON_PATTERN = re.compile(r"^\s*(<=|>=|!=|<|>|=)\s*(.+?)\s*$")
+
+
+class DataFrameModel(QAbstractTableModel):
+    """Virtualisiertes Model für die Anzeige von pandas DataFrames in QTableView
+
+    Zellen werden nicht einzeln über iloc gelesen, sondern spaltenweise in
+    Blöcken vektorisiert formatiert und zwischengespeichert; es werden nur die
+    Blöcke formatiert, die tatsächlich angezeigt werden. Zeilen werden über
+    canFetchMore/fetchMore schrittweise nachgeladen, damit die Ansicht auch bei
+    Millionen Zeilen sofort reagiert.
+
+    Sortieren und Filtern verändern den DataFrame nicht: Die Sortierung ist
+    eine Permutation (argsort), der Filter eine boolesche Maske über alle Zeilen.
+    Angezeigt werden die Zeilen der Permutation, die die Maske erfüllen.
+    """
+
+    def __init__(self, data=None, batch_size=1000, block_size=512, max_blocks=2000, parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+
+        self._data = pd.DataFrame()
+        self._loaded = 0
+        self._blocks = OrderedDict()  # (Spalte, Block) -> formatierte Texte
+        self._numeric = []
+
+        # Sortierung und Filter
+        self._order = None      # Permutation der Zeilen (None = Originalreihenfolge)
+        self._mask = None       # Filtermaske über alle Zeilen (None = kein Filter)
+        self._rows = None       # angezeigte Zeilenpositionen (None = alle in Originalreihenfolge)
+        self._codes = {}        # Spalte -> (sortierte Codes, eindeutige Werte)
+
+        if data is not None:
+            self.set_dataframe(data)
+
+    def set_dataframe(self, data):
+        """Ersetzt die angezeigten Daten (Sortierung und Filter werden zurückgesetzt)"""
+        self.beginResetModel()
+        self._data = data if data is not None else pd.DataFrame()
+        self._numeric = [pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                         for dtype in self._data.dtypes]
+        self._order = None
+        self._mask = None
+        self._codes.clear()
+        self._blocks.clear()
+        self._update_rows()
+        self.endResetModel()
+
+    def dataframe(self):
+        """Gibt die vollständigen, unsortierten Daten zurück"""
+        return self._data
+
+    def visible_dataframe(self):
+        """Gibt die angezeigten Zeilen in angezeigter Reihenfolge zurück (gefiltert und sortiert)"""
+        if self._rows is None:
+            return self._data
+        return self._data.iloc[self._rows]
+
+    def visible_row_count(self):
+        """Zeilenzahl nach dem Filter (unabhängig vom schrittweisen Nachladen)"""
+        return len(self._data) if self._rows is None else len(self._rows)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._data.shape[1]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < self.visible_row_count()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        remaining = self.visible_row_count() - self._loaded
+        count = min(self.batch_size, remaining)
+        if count <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        """Lädt alle Zeilen auf einmal (z.B. vor dem Springen ans Tabellenende)"""
+        if self.canFetchMore():
+            self.beginInsertRows(QModelIndex(), self._loaded, self.visible_row_count() - 1)
+            self._loaded = self.visible_row_count()
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.text(index.row(), index.column())
+        if role == Qt.ItemDataRole.TextAlignmentRole and self._numeric[index.column()]:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return str(self._data.columns[section])
+            if orientation == Qt.Orientation.Vertical:
+                row = section if self._rows is None else int(self._rows[section])
+                return str(self._data.index[row])
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sortiert die Anzeige stabil nach einer Spalte (fehlende Werte immer am Ende)
+
+        Eine Spalte < 0 stellt die Originalreihenfolge wieder her.
+        """
+        self.layoutAboutToBeChanged.emit()
+        if column < 0 or column >= self._data.shape[1]:
+            self._order = None
+        else:
+            keys = self._sort_keys(column, order == Qt.SortOrder.DescendingOrder)
+            self._order = np.argsort(keys, kind='stable')
+
+        self._blocks.clear()
+        self._update_rows(keep_loaded=True)
+        self.layoutChanged.emit()
+
+    def set_filter(self, text, column=None):
+        """Zeigt nur Zeilen, deren Wert den Filtertext enthält
+
+        column ist ein Spaltenindex oder None für alle Textspalten. In Zahlen-
+        und Datumsspalten sind zusätzlich Vergleiche wie '>1000' oder
+        '<=2024-06-30' möglich. Ein leerer Text hebt den Filter auf.
+        """
+        text = (text or "").strip()
+        self.beginResetModel()
+        if not text:
+            self._mask = None
+        else:
+            if column is None:
+                # Zahlen und Datumswerte nur bei ausgewählter Spalte durchsuchen
+                columns = [col for col in range(self._data.shape[1])
+                           if not self._numeric[col]
+                           and not pd.api.types.is_datetime64_any_dtype(self._data.dtypes.iloc[col])]
+            else:
+                columns = [column]
+            mask = np.zeros(len(self._data), dtype=bool)
+            for col in columns:
+                mask |= self._column_mask(col, text)
+            self._mask = mask
+        self._blocks.clear()
+        self._update_rows()
+        self.endResetModel()
+
+    def text(self, row, column):
+        """Formatierter Text einer angezeigten Zelle aus dem Blockcache"""
+        block = row // self.block_size
+        texts = self._block(column, block)
+        return texts[row - block * self.block_size]
+
+    def sample_texts(self, column, count=200):
+        """Texte einer Stichprobe von Zeilen (Anfang und gleichmäßig verteilt) für die Breitenschätzung"""
+        row_count = self.visible_row_count()
+        if row_count == 0:
+            return []
+        head = np.arange(min(count // 2, row_count))
+        spread = np.linspace(0, row_count - 1, num=min(count - len(head), row_count), dtype=np.int64)
+        positions = np.union1d(head, spread)
+        if self._rows is not None:
+            positions = self._rows[positions]
+        return _format(self._data.iloc[positions, column])
+
+    def _block(self, column, block):
+        key = (column, block)
+        texts = self._blocks.get(key)
+        if texts is not None:
+            self._blocks.move_to_end(key)
+            return texts
+
+        start = block * self.block_size
+        if self._rows is None:
+            values = self._data.iloc[start:start + self.block_size, column]
+        else:
+            values = self._data.iloc[self._rows[start:start + self.block_size], column]
+        texts = _format(values)
+
+        self._blocks[key] = texts
+        if len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return texts
+
+    def _update_rows(self, keep_loaded=False):
+        """Bestimmt die angezeigten Zeilen aus Sortierung und Filter"""
+        if self._order is None and self._mask is None:
+            self._rows = None
+        elif self._order is None:
+            self._rows = np.flatnonzero(self._mask)
+        elif self._mask is None:
+            self._rows = self._order
+        else:
+            self._rows = self._order[self._mask[self._order]]
+
+        loaded = max(self._loaded, self.batch_size) if keep_loaded else self.batch_size
+        self._loaded = min(self.visible_row_count(), loaded)
+
+    def _sort_keys(self, column, descending=False):
+        """Aufsteigend zu sortierende Schlüssel einer Spalte, fehlende Werte am Ende
+
+        Zahlen werden direkt sortiert, alle übrigen Spalten (auch Datumswerte)
+        über ihre sortierten Codes. Codes werden auf den kleinsten passenden
+        Ganzzahltyp verkleinert, damit NumPy sie per Radixsort sortieren kann.
+        """
+        series = self._data.iloc[:, column]
+        if self._numeric[column]:
+            # NaN sortiert NumPy bereits ans Ende
+            keys = series.to_numpy(dtype=float, na_value=np.nan)
+            return -keys if descending else keys
+
+        codes, uniques = self._column_codes(column)
+        count = len(uniques)
+        keys = count - 1 - codes if descending else codes.copy()
+        keys[codes < 0] = count
+        return keys.astype(np.min_scalar_type(count))
+
+    def _column_codes(self, column):
+        """Codes einer Spalte in Sortierreihenfolge (zwischengespeichert für Sortieren und Filtern)"""
+        cached = self._codes.get(column)
+        if cached is None:
+            cached = pd.factorize(self._data.iloc[:, column], sort=True)
+            self._codes[column] = cached
+        return cached
+
+    def _column_mask(self, column, text):
+        """Filtermaske einer Spalte
+
+        Vergleiche laufen direkt über die Spalte, Textsuchen nur einmal je
+        eindeutigem Wert.
+        """
+        series = self._data.iloc[:, column]
+        is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+
+        comparison = COMPARISON_PATTERN.match(text)
+        if comparison and (self._numeric[column] or is_datetime):
+            operator, operand = comparison.groups()
+            try:
+                operand = pd.Timestamp(operand) if is_datetime else float(operand.replace(",", "."))
+            except (ValueError, TypeError):
+                return np.zeros(len(series), dtype=bool)
+            matches = {
+                "<": series.lt, "<=": series.le, ">": series.gt,
+                ">=": series.ge, "=": series.eq, "!=": series.ne
+            }[operator](operand)
+            # Fehlende Werte erfüllen keinen Vergleich
+            return matches.to_numpy(dtype=bool) & series.notna().to_numpy()
+
+        codes, uniques = self._column_codes(column)
+        matches = pd.Series(uniques).astype(str).str.contains(text, case=False, regex=False)
+
+        # Code -1 (fehlender Wert) greift auf das angehängte False zu
+        return np.append(matches.to_numpy(dtype=bool), False)[codes]
+
+
+def _format(values):
+    """Formatiert eine Spalte vektorisiert als Text (fehlende Werte als leere Zellen)"""
+    return values.astype(str).fillna("").tolist()
+
+
+def resize_columns_to_sample(view, sample_size=200, max_width=400, padding=16):
+    """Passt die Spaltenbreiten anhand einer Zeilenstichprobe an
+
+    Ersetzt resizeColumnsToContents, das jede Zeile des Models ausmisst.
+    """
+    model = view.model()
+    if model is None:
+        return
+
+    metrics = view.fontMetrics()
+    header_metrics = view.horizontalHeader().fontMetrics()
+    for column in range(model.columnCount()):
+        header = str(model.headerData(column, Qt.Orientation.Horizontal) or "")
+        width = header_metrics.horizontalAdvance(header)
+        if hasattr(model, "sample_texts"):
+            texts = model.sample_texts(column, sample_size)
+        else:
+            rows = min(model.rowCount(), sample_size)
+            texts = [str(model.index(row, column).data() or "") for row in range(rows)]
+        for text in texts:
+            width = max(width, metrics.horizontalAdvance(text))
+        view.setColumnWidth(column, min(width + padding, max_width))
\ No newline at end of file
@@ -1,37 +1,10 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QComboBox, QTableView, QGroupBox,
-                             QFormLayout, QLineEdit)
+                             QFormLayout, QLineEdit, QCheckBox, QSpinBox)
 from PyQt6.QtCore import pyqtSignal, Qt
 import pandas as pd
-from PyQt6.QtCore import QAbstractTableModel
-
-
-class PandasModel(QAbstractTableModel):
-    """Ein Model für die Anzeige von pandas DataFrames in QTableView"""
-
-    def __init__(self, data):
-        super().__init__()
-        self._data = data
-
-    def rowCount(self, parent=None):
-        return self._data.shape[0]
-
-    def columnCount(self, parent=None):
-        return self._data.shape[1]
-
-    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
-        if index.isValid():
-            if role == Qt.ItemDataRole.DisplayRole:
-                return str(self._data.iloc[index.row(), index.column()])
-        return None
-
-    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
-        if role == Qt.ItemDataRole.DisplayRole:
-            if orientation == Qt.Orientation.Horizontal:
-                return str(self._data.columns[section])
-            if orientation == Qt.Orientation.Vertical:
-                return str(self._data.index[section])
-        return None
+from gui.models import DataFrameModel, resize_columns_to_sample
+from gui.widgets import TableFilterBar
 
 
 class AnalysisTab(QWidget):
@@ -58,7 +31,7 @@ class AnalysisTab(QWidget):
 
         # Analysetyp-Auswahl
         self.analysis_combo = QComboBox()
-        self.analysis_combo.addItems(["KPI-Berechnung", "Abweichungsanalyse"])
+        self.analysis_combo.addItems(["KPI-Berechnung", "Abweichungsanalyse", "Zeitintelligenz (YTD, R12, MoM, YoY)"])
         self.analysis_combo.currentIndexChanged.connect(self.on_analysis_type_changed)
         data_layout.addRow("Analysetyp:", self.analysis_combo)
 
@@ -69,10 +42,13 @@ class AnalysisTab(QWidget):
         self.revenue_col_edit = QLineEdit("Umsatz")
         self.cost_col_edit = QLineEdit("Kosten")
         self.time_col_edit = QLineEdit("Datum")
+        self.group_by_edit = QLineEdit()
+        self.group_by_edit.setPlaceholderText("Optional, z.B. Kostenstelle,Produkt")
 
         kpi_layout.addRow("Umsatzspalte:", self.revenue_col_edit)
         kpi_layout.addRow("Kostenspalte:", self.cost_col_edit)
         kpi_layout.addRow("Zeitspalte:", self.time_col_edit)
+        kpi_layout.addRow("Gruppierung (kommagetrennt):", self.group_by_edit)
 
         # Abweichungsanalyse-Parameter
         self.variance_group = QGroupBox("Abweichungsanalyse-Parameter")
@@ -82,9 +58,39 @@ class AnalysisTab(QWidget):
         self.key_column_edit = QLineEdit("Monat")
         self.value_columns_edit = QLineEdit("Umsatz,Kosten")
 
+        # Preis-/Mengen-/Mixzerlegung
+        self.decomposition_check = QCheckBox("Preis-/Mengen-/Mixabweichung berechnen")
+        self.decomposition_check.toggled.connect(self.on_decomposition_toggled)
+        self.volume_col_edit = QLineEdit("Menge")
+        self.decomposition_revenue_edit = QLineEdit("Umsatz")
+        self.mix_level_edit = QLineEdit()
+        self.mix_level_edit.setPlaceholderText("Optional, z.B. Gesellschaft")
+
         variance_layout.addRow("Plan-Datensatz:", self.plan_data_combo)
-        variance_layout.addRow("Schlüsselspalte:", self.key_column_edit)
+        variance_layout.addRow("Schlüsselspalten (kommagetrennt):", self.key_column_edit)
         variance_layout.addRow("Wertspalten (kommagetrennt):", self.value_columns_edit)
+        variance_layout.addRow(self.decomposition_check)
+        variance_layout.addRow("Mengenspalte:", self.volume_col_edit)
+        variance_layout.addRow("Umsatzspalte:", self.decomposition_revenue_edit)
+        variance_layout.addRow("Mix-Ebene (kommagetrennt):", self.mix_level_edit)
+        self.on_decomposition_toggled(False)
+
+        # Zeitintelligenz-Parameter
+        self.time_group = QGroupBox("Zeitintelligenz-Parameter")
+        time_layout = QFormLayout(self.time_group)
+
+        self.ti_time_col_edit = QLineEdit("Datum")
+        self.ti_value_columns_edit = QLineEdit("Umsatz,Kosten,DB1")
+        self.ti_group_by_edit = QLineEdit()
+        self.ti_group_by_edit.setPlaceholderText("Optional, z.B. Kostenstelle")
+        self.fiscal_start_spin = QSpinBox()
+        self.fiscal_start_spin.setRange(1, 12)
+        self.fiscal_start_spin.setValue(1)
+
+        time_layout.addRow("Zeitspalte:", self.ti_time_col_edit)
+        time_layout.addRow("Wertspalten (kommagetrennt):", self.ti_value_columns_edit)
+        time_layout.addRow("Gruppierung (kommagetrennt):", self.ti_group_by_edit)
+        time_layout.addRow("Beginn Geschäftsjahr (Monat):", self.fiscal_start_spin)
 
         # Analysebutton
         self.run_button = QPushButton("Analyse durchführen")
@@ -95,26 +101,35 @@ class AnalysisTab(QWidget):
         result_layout = QVBoxLayout(result_group)
 
         self.result_table = QTableView()
+        self.result_table.setSortingEnabled(True)
+        self.result_filter = TableFilterBar(self.result_table)
+        result_layout.addWidget(self.result_filter)
         result_layout.addWidget(self.result_table)
 
         # Alles zusammenfügen
         layout.addWidget(data_group)
         layout.addWidget(self.kpi_group)
         layout.addWidget(self.variance_group)
+        layout.addWidget(self.time_group)
         layout.addWidget(self.run_button)
         layout.addWidget(result_group)
 
         # Standardeinstellung: KPI-Berechnung anzeigen, Abweichungsanalyse ausblenden
         self.variance_group.setVisible(False)
+        self.time_group.setVisible(False)
 
     def on_analysis_type_changed(self, index):
         """Wird aufgerufen, wenn der Analysetyp geändert wird"""
-        if index == 0:  # KPI-Berechnung
-            self.kpi_group.setVisible(True)
-            self.variance_group.setVisible(False)
-        elif index == 1:  # Abweichungsanalyse
-            self.kpi_group.setVisible(False)
-            self.variance_group.setVisible(True)
+        self.kpi_group.setVisible(index == 0)  # KPI-Berechnung
+        self.variance_group.setVisible(index == 1)  # Abweichungsanalyse
+        self.time_group.setVisible(index == 2)  # Zeitintelligenz
+
+    def on_decomposition_toggled(self, checked):
+        """Aktiviert die Felder der Preis-/Mengen-/Mixzerlegung"""
+        self.value_columns_edit.setEnabled(not checked)
+        self.volume_col_edit.setEnabled(checked)
+        self.decomposition_revenue_edit.setEnabled(checked)
+        self.mix_level_edit.setEnabled(checked)
 
     def set_data_sources(self, data_keys):
         """Setzt die verfügbaren Datensätze"""
@@ -149,26 +164,49 @@ class AnalysisTab(QWidget):
 
         if analysis_index == 0:  # KPI-Berechnung
             analysis_type = "kpi"
+            group_by = [col.strip() for col in self.group_by_edit.text().split(",") if col.strip()]
             parameters = {
                 "revenue_col": self.revenue_col_edit.text(),
                 "cost_col": self.cost_col_edit.text(),
-                "time_col": self.time_col_edit.text() if self.time_col_edit.text() else None
+                "time_col": self.time_col_edit.text() if self.time_col_edit.text() else None,
+                "group_by": group_by if group_by else None
             }
         elif analysis_index == 1:  # Abweichungsanalyse
-            analysis_type = "variance"
-
             # Werte aus den Feldern abrufen
             plan_data_key = self.plan_data_combo.currentText()
-            key_column = self.key_column_edit.text()
+            key_columns = [col.strip() for col in self.key_column_edit.text().split(",") if col.strip()]
+            key_column = key_columns[0] if len(key_columns) == 1 else key_columns
             value_columns_text = self.value_columns_edit.text()
 
             # Wertspalten als Liste
             value_columns = [col.strip() for col in value_columns_text.split(",") if col.strip()]
 
+            if self.decomposition_check.isChecked():
+                analysis_type = "decomposition"
+                mix_level = [col.strip() for col in self.mix_level_edit.text().split(",") if col.strip()]
+                parameters = {
+                    "plan_data_key": plan_data_key,
+                    "key_columns": key_columns,
+                    "volume_col": self.volume_col_edit.text(),
+                    "revenue_col": self.decomposition_revenue_edit.text(),
+                    "mix_level": mix_level if mix_level else None
+                }
+            else:
+                analysis_type = "variance"
+                parameters = {
+                    "plan_data_key": plan_data_key,
+                    "key_column": key_column,
+                    "value_columns": value_columns
+                }
+        elif analysis_index == 2:  # Zeitintelligenz
+            analysis_type = "time_intelligence"
+            value_cols = [col.strip() for col in self.ti_value_columns_edit.text().split(",") if col.strip()]
+            group_by = [col.strip() for col in self.ti_group_by_edit.text().split(",") if col.strip()]
             parameters = {
-                "plan_data_key": plan_data_key,
-                "key_column": key_column,
-                "value_columns": value_columns
+                "time_col": self.ti_time_col_edit.text(),
+                "value_cols": value_cols if value_cols else None,
+                "group_by": group_by if group_by else None,
+                "fiscal_year_start": self.fiscal_start_spin.value()
             }
         else:
             return
@@ -179,8 +217,10 @@ class AnalysisTab(QWidget):
     def show_result(self, df):
         """Zeigt das Analyseergebnis an"""
         if df is not None:
-            model = PandasModel(df)
+            model = DataFrameModel(df, parent=self.result_table)
             self.result_table.setModel(model)
+            self.result_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            self.result_filter.model_changed()
 
-            # Spaltenbreiten anpassen
-            self.result_table.resizeColumnsToContents()
\ No newline at end of file
+            # Spaltenbreiten anhand einer Stichprobe anpassen
+            resize_columns_to_sample(self.result_table)
\ No newline at end of file
@@ -0,0 +1,173 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QComboBox, QGroupBox, QFormLayout, QLineEdit,
+                             QSpinBox, QTableView, QSplitter)
+from PyQt6.QtCore import pyqtSignal, Qt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+import pandas as pd
+from gui.models import DataFrameModel, resize_columns_to_sample
+
+
+# Anzeigenamen und interne Bezeichnungen der Prognosemethoden
+FORECAST_METHODS = [
+    ("ETS (Holt-Winters, automatisch)", "ets"),
+    ("Holt-Winters (additiv)", "holt_winters"),
+    ("Holt (linearer Trend)", "holt"),
+    ("Exponentielle Glättung", "ses"),
+    ("Gleitender Durchschnitt", "moving_average"),
+    ("ARIMA (statsmodels, Prozesspool)", "arima")
+]
+
+
+class ForecastingTab(QWidget):
+    """Tab für Zeitreihenprognosen"""
+
+    # Signal für Kommunikation mit Controller
+    create_forecast = pyqtSignal(str, str, str, str, int, dict)  # data_key, time_col, value_col, method, periods, options
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data_sources = []
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialisiert die UI-Komponenten"""
+        layout = QVBoxLayout(self)
+
+        # Oberer Bereich: Einstellungen
+        settings_layout = QHBoxLayout()
+
+        # Datenauswahl
+        data_group = QGroupBox("Datenauswahl")
+        data_layout = QFormLayout(data_group)
+
+        self.data_combo = QComboBox()
+        self.time_col_edit = QLineEdit("Datum")
+        self.value_col_edit = QLineEdit("Kosten")
+        self.group_by_edit = QLineEdit()
+        self.group_by_edit.setPlaceholderText("Optional, z.B. Kostenstelle")
+
+        data_layout.addRow("Datensatz:", self.data_combo)
+        data_layout.addRow("Zeitspalte:", self.time_col_edit)
+        data_layout.addRow("Wertspalte:", self.value_col_edit)
+        data_layout.addRow("Reihen je (kommagetrennt):", self.group_by_edit)
+
+        settings_layout.addWidget(data_group)
+
+        # Methode und Parameter
+        method_group = QGroupBox("Prognosemethode")
+        method_layout = QFormLayout(method_group)
+
+        self.method_combo = QComboBox()
+        for label, method in FORECAST_METHODS:
+            self.method_combo.addItem(label, method)
+
+        self.periods_spin = QSpinBox()
+        self.periods_spin.setRange(1, 120)
+        self.periods_spin.setValue(12)
+
+        self.season_spin = QSpinBox()
+        self.season_spin.setRange(2, 52)
+        self.season_spin.setValue(12)
+
+        self.window_spin = QSpinBox()
+        self.window_spin.setRange(1, 60)
+        self.window_spin.setValue(3)
+
+        method_layout.addRow("Methode:", self.method_combo)
+        method_layout.addRow("Perioden:", self.periods_spin)
+        method_layout.addRow("Saisonlänge:", self.season_spin)
+        method_layout.addRow("Fenster (gleitender Durchschnitt):", self.window_spin)
+
+        settings_layout.addWidget(method_group)
+
+        # Prognose-Button
+        button_layout = QHBoxLayout()
+        self.create_button = QPushButton("Prognose erstellen")
+        self.create_button.clicked.connect(self.create_selected_forecast)
+        button_layout.addStretch()
+        button_layout.addWidget(self.create_button)
+
+        # Ergebnis: Diagramm und Tabelle
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        self.figure = Figure(figsize=(8, 4))
+        self.canvas = FigureCanvas(self.figure)
+        splitter.addWidget(self.canvas)
+
+        result_group = QGroupBox("Prognosewerte")
+        result_layout = QVBoxLayout(result_group)
+        self.result_table = QTableView()
+        self.result_table.setSortingEnabled(True)
+        result_layout.addWidget(self.result_table)
+        splitter.addWidget(result_group)
+
+        # Alles zusammenfügen
+        layout.addLayout(settings_layout)
+        layout.addLayout(button_layout)
+        layout.addWidget(splitter)
+
+    def set_data_sources(self, data_keys):
+        """Setzt die verfügbaren Datensätze"""
+        self.data_sources = data_keys
+
+        # Aktuellen Text speichern
+        current_data = self.data_combo.currentText()
+
+        # Combobox leeren und neu füllen
+        self.data_combo.clear()
+        self.data_combo.addItems(data_keys)
+
+        # Wenn möglich, vorherige Auswahl wiederherstellen
+        if current_data in data_keys:
+            self.data_combo.setCurrentText(current_data)
+
+    def set_running(self, running):
+        """Sperrt den Button während eine Prognose berechnet wird"""
+        self.create_button.setEnabled(not running)
+
+    def create_selected_forecast(self):
+        """Erstellt die Prognose mit den gewählten Einstellungen"""
+        data_key = self.data_combo.currentText()
+
+        if not data_key:
+            return
+
+        method = self.method_combo.currentData()
+        group_by = [col.strip() for col in self.group_by_edit.text().split(",") if col.strip()]
+
+        options = {
+            "group_by": group_by if group_by else None,
+            "season_length": self.season_spin.value()
+        }
+        if method == "moving_average":
+            options["window"] = self.window_spin.value()
+
+        # Signal emittieren
+        self.create_forecast.emit(data_key, self.time_col_edit.text(), self.value_col_edit.text(),
+                                  method, self.periods_spin.value(), options)
+
+    def show_forecast(self, history_df, forecast_df, time_col, value_col):
+        """Zeigt Ist-Verlauf und Prognose (Summe über alle Reihen) sowie die Prognosewerte an"""
+        self.result_table.setModel(DataFrameModel(forecast_df, parent=self.result_table))
+        self.result_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        resize_columns_to_sample(self.result_table)
+
+        self.figure.clear()
+        axes = self.figure.add_subplot(111)
+
+        history = history_df.groupby(pd.to_datetime(history_df[time_col]).dt.to_period("M").dt.to_timestamp())
+        history = history[value_col].sum()
+        prediction = forecast_df.groupby(time_col)[value_col].sum()
+
+        axes.plot(history.index, history.values, marker='o', linestyle='-', color='#3498db', label='Ist')
+        axes.plot(prediction.index, prediction.values, marker='o', linestyle='--', color='#e67e22',
+                  label='Prognose')
+        axes.set_xlabel(time_col)
+        axes.set_ylabel(value_col)
+        axes.set_title(f"Prognose {value_col}")
+        axes.grid(True, linestyle='--', alpha=0.7)
+        axes.legend()
+        self.figure.autofmt_xdate()
+
+        self.canvas.draw()
\ No newline at end of file
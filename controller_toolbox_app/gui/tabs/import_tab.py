@@ -1,37 +1,10 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QFileDialog, QComboBox, QTableView, QGroupBox,
-                             QCheckBox, QLineEdit, QSpinBox)
+                             QCheckBox, QLineEdit, QSpinBox, QTextEdit)
 from PyQt6.QtCore import pyqtSignal, Qt
 import pandas as pd
-from PyQt6.QtCore import QAbstractTableModel
-
-
-class PandasModel(QAbstractTableModel):
-    """Ein Model für die Anzeige von pandas DataFrames in QTableView"""
-
-    def __init__(self, data):
-        super().__init__()
-        self._data = data
-
-    def rowCount(self, parent=None):
-        return self._data.shape[0]
-
-    def columnCount(self, parent=None):
-        return self._data.shape[1]
-
-    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
-        if index.isValid():
-            if role == Qt.ItemDataRole.DisplayRole:
-                return str(self._data.iloc[index.row(), index.column()])
-        return None
-
-    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
-        if role == Qt.ItemDataRole.DisplayRole:
-            if orientation == Qt.Orientation.Horizontal:
-                return str(self._data.columns[section])
-            if orientation == Qt.Orientation.Vertical:
-                return str(self._data.index[section])
-        return None
+from gui.models import DataFrameModel, resize_columns_to_sample
+from gui.widgets import TableFilterBar
 
 
 class ImportTab(QWidget):
@@ -40,9 +13,14 @@ class ImportTab(QWidget):
     # Signale für Kommunikation mit Controller
     file_selected = pyqtSignal(str)
     import_data = pyqtSignal(str, str, dict)
+    cancel_import = pyqtSignal()
+    batch_import = pyqtSignal(str, str, dict)
+    load_stored_dataset = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.sheet_info = {}
+        self.memory_reports = {}
         self.init_ui()
 
     def init_ui(self):
@@ -55,7 +33,7 @@ class ImportTab(QWidget):
 
         self.file_path_edit = QLineEdit()
         self.file_path_edit.setReadOnly(True)
-        self.file_path_edit.setPlaceholderText("Wählen Sie eine Excel-Datei aus...")
+        self.file_path_edit.setPlaceholderText("Wählen Sie eine Excel-, CSV- oder Parquet-Datei aus...")
 
         self.browse_button = QPushButton("Durchsuchen...")
         self.browse_button.clicked.connect(self.browse_file)
@@ -69,9 +47,13 @@ class ImportTab(QWidget):
 
         self.sheet_combo = QComboBox()
         self.sheet_combo.setEnabled(False)
+        self.sheet_combo.currentIndexChanged.connect(self.on_sheet_changed)
+
+        self.sheet_info_label = QLabel("")
 
         sheet_layout.addWidget(QLabel("Tabellenblatt:"))
         sheet_layout.addWidget(self.sheet_combo)
+        sheet_layout.addWidget(self.sheet_info_label)
 
         # Import-Optionen
         options_group = QGroupBox("Import-Optionen")
@@ -84,40 +66,129 @@ class ImportTab(QWidget):
         skip_layout.addWidget(self.skip_rows_spin)
         skip_layout.addStretch()
 
+        engine_layout = QHBoxLayout()
+        engine_layout.addWidget(QLabel("Lese-Engine:"))
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItem("Automatisch")
+        engine_layout.addWidget(self.engine_combo)
+        engine_layout.addStretch()
+
         header_layout = QHBoxLayout()
         self.header_check = QCheckBox("Erste Zeile als Spaltennamen verwenden")
         self.header_check.setChecked(True)
         header_layout.addWidget(self.header_check)
 
+        self.optimize_check = QCheckBox("Datentypen optimieren (Speicherbedarf reduzieren)")
+        self.optimize_check.setChecked(True)
+        header_layout.addWidget(self.optimize_check)
+
+        self.store_check = QCheckBox("In lokaler Datenbank speichern")
+        self.store_check.setToolTip("Datensätze zusätzlich als Parquet ablegen und später ohne erneutes "
+                                    "Einlesen laden (belegt weiteren Speicherplatz)")
+        self.store_check.setChecked(False)
+        header_layout.addWidget(self.store_check)
+
+        stream_layout = QHBoxLayout()
+        self.stream_check = QCheckBox("Blockweise einlesen (große Dateien)")
+        self.chunk_size_spin = QSpinBox()
+        self.chunk_size_spin.setRange(1000, 1000000)
+        self.chunk_size_spin.setSingleStep(10000)
+        self.chunk_size_spin.setValue(50000)
+        self.chunk_size_spin.setEnabled(False)
+        self.stream_check.toggled.connect(self.chunk_size_spin.setEnabled)
+        stream_layout.addWidget(self.stream_check)
+        stream_layout.addWidget(QLabel("Zeilen pro Block:"))
+        stream_layout.addWidget(self.chunk_size_spin)
+        stream_layout.addStretch()
+
         options_layout.addLayout(skip_layout)
         options_layout.addLayout(header_layout)
+        options_layout.addLayout(engine_layout)
+        options_layout.addLayout(stream_layout)
 
         # Import-Button
         self.import_button = QPushButton("Daten importieren")
         self.import_button.setEnabled(False)
         self.import_button.clicked.connect(self.import_file)
 
+        self.cancel_button = QPushButton("Import abbrechen")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_import.emit)
+
+        import_layout = QHBoxLayout()
+        import_layout.addWidget(self.import_button)
+        import_layout.addWidget(self.cancel_button)
+
+        # Stapelimport (Ordner oder Muster)
+        batch_group = QGroupBox("Stapelimport")
+        batch_layout = QHBoxLayout(batch_group)
+
+        self.batch_source_edit = QLineEdit()
+        self.batch_source_edit.setPlaceholderText("Ordner oder Muster, z.B. C:/Monatsabschluss/*.xlsx")
+        self.batch_browse_button = QPushButton("Ordner...")
+        self.batch_browse_button.clicked.connect(self.browse_folder)
+        self.batch_sheet_edit = QLineEdit("0")
+        self.batch_sheet_edit.setToolTip("Index, Name, kommagetrennte Liste, Muster (z.B. Ist*) oder * für alle")
+        self.batch_button = QPushButton("Stapelimport starten")
+        self.batch_button.clicked.connect(self.import_batch)
+
+        batch_layout.addWidget(self.batch_source_edit)
+        batch_layout.addWidget(self.batch_browse_button)
+        batch_layout.addWidget(QLabel("Tabellenblatt:"))
+        batch_layout.addWidget(self.batch_sheet_edit)
+        batch_layout.addWidget(self.batch_button)
+
+        # Gespeicherte Datensätze aus der lokalen Datenbank
+        stored_group = QGroupBox("Gespeicherte Datensätze")
+        stored_layout = QHBoxLayout(stored_group)
+
+        self.stored_combo = QComboBox()
+        self.stored_combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToContents)
+        self.load_stored_button = QPushButton("Laden")
+        self.load_stored_button.setEnabled(False)
+        self.load_stored_button.clicked.connect(self.load_stored)
+
+        stored_layout.addWidget(QLabel("Datensatz:"))
+        stored_layout.addWidget(self.stored_combo)
+        stored_layout.addWidget(self.load_stored_button)
+        stored_layout.addStretch()
+
         # Datenvorschau
         preview_group = QGroupBox("Datenvorschau")
         preview_layout = QVBoxLayout(preview_group)
 
         self.preview_table = QTableView()
+        self.preview_table.setSortingEnabled(True)
+        self.preview_filter = TableFilterBar(self.preview_table)
+        preview_layout.addWidget(self.preview_filter)
         preview_layout.addWidget(self.preview_table)
 
+        # Speicherbericht je Datensatz
+        self.memory_report_text = QTextEdit()
+        self.memory_report_text.setReadOnly(True)
+        self.memory_report_text.setMaximumHeight(90)
+        self.memory_report_text.setPlaceholderText("Speicherbericht: noch keine Datensätze optimiert")
+        preview_layout.addWidget(self.memory_report_text)
+
         # Alles zusammenfügen
         layout.addWidget(file_group)
         layout.addWidget(sheet_group)
         layout.addWidget(options_group)
-        layout.addWidget(self.import_button)
+        layout.addLayout(import_layout)
+        layout.addWidget(batch_group)
+        layout.addWidget(stored_group)
         layout.addWidget(preview_group)
 
     def browse_file(self):
         """Öffnet einen Datei-Browser-Dialog"""
         file_path, _ = QFileDialog.getOpenFileName(
             self,
-            "Excel-Datei öffnen",
+            "Datei öffnen",
             "",
-            "Excel-Dateien (*.xlsx *.xls *.xlsm)"
+            "Alle unterstützten Dateien (*.xlsx *.xls *.xlsm *.xlsb *.csv *.tsv *.txt *.parquet);;"
+            "Excel-Dateien (*.xlsx *.xls *.xlsm *.xlsb);;"
+            "CSV-Dateien (*.csv *.tsv *.txt);;"
+            "Parquet-Dateien (*.parquet)"
         )
 
         if file_path:
@@ -126,11 +197,50 @@ class ImportTab(QWidget):
             self.sheet_combo.setEnabled(True)
             self.import_button.setEnabled(True)
 
-    def set_sheets(self, sheet_names):
+    def browse_folder(self):
+        """Öffnet einen Dialog zur Auswahl eines Ordners für den Stapelimport"""
+        folder = QFileDialog.getExistingDirectory(self, "Ordner für Stapelimport wählen")
+        if folder:
+            self.batch_source_edit.setText(folder)
+
+    def import_batch(self):
+        """Startet den Stapelimport"""
+        source = self.batch_source_edit.text().strip()
+        if not source:
+            return
+
+        options = {
+            "skiprows": self.skip_rows_spin.value() if self.skip_rows_spin.value() > 0 else None,
+            "header": 0 if self.header_check.isChecked() else None,
+            "optimize": self.optimize_check.isChecked(),
+            "store": self.store_check.isChecked()
+        }
+
+        self.batch_import.emit(source, self.batch_sheet_edit.text().strip(), options)
+
+    def set_sheets(self, sheet_names, sheet_info=None):
         """Setzt die verfügbaren Tabellenblätter"""
+        self.sheet_info = {info["name"]: info for info in (sheet_info or [])}
         self.sheet_combo.clear()
         self.sheet_combo.addItems(sheet_names)
 
+    def set_engines(self, engines):
+        """Setzt die für die ausgewählte Datei verfügbaren Lese-Engines"""
+        self.engine_combo.clear()
+        self.engine_combo.addItem("Automatisch")
+        self.engine_combo.addItems(engines)
+
+    def on_sheet_changed(self, index):
+        """Zeigt die Dimensionen des ausgewählten Tabellenblatts an"""
+        info = self.sheet_info.get(self.sheet_combo.currentText())
+        if info and info.get("rows"):
+            text = f"ca. {info['rows']} Zeilen, {info['columns']} Spalten"
+            if info.get("dimensions"):
+                text += f" ({info['dimensions']})"
+            self.sheet_info_label.setText(text)
+        else:
+            self.sheet_info_label.setText("")
+
     def import_file(self):
         """Importiert die ausgewählte Datei"""
         file_path = self.file_path_edit.text()
@@ -139,19 +249,67 @@ class ImportTab(QWidget):
         # Import-Optionen sammeln
         options = {
             "skiprows": self.skip_rows_spin.value() if self.skip_rows_spin.value() > 0 else None,
-            "header": 0 if self.header_check.isChecked() else None
+            "header": 0 if self.header_check.isChecked() else None,
+            "engine": self.engine_combo.currentText() if self.engine_combo.currentIndex() > 0 else None,
+            "optimize_dtypes": self.optimize_check.isChecked(),
+            "chunksize": self.chunk_size_spin.value() if self.stream_check.isChecked() else None,
+            "store": self.store_check.isChecked()
         }
 
         # Signal emittieren
         self.import_data.emit(file_path, sheet_name, options)
 
+    def set_stored_datasets(self, datasets):
+        """Setzt die in der lokalen Datenbank gespeicherten Datensätze (name, description, file_path)"""
+        current = self.stored_combo.currentText()
+
+        self.stored_combo.clear()
+        for name, description, _ in datasets:
+            self.stored_combo.addItem(name)
+            self.stored_combo.setItemData(self.stored_combo.count() - 1, description or "",
+                                          Qt.ItemDataRole.ToolTipRole)
+
+        if current:
+            self.stored_combo.setCurrentIndex(max(self.stored_combo.findText(current), 0))
+        self.load_stored_button.setEnabled(self.stored_combo.count() > 0)
+
+    def load_stored(self):
+        """Lädt den ausgewählten gespeicherten Datensatz"""
+        name = self.stored_combo.currentText()
+        if name:
+            self.load_stored_dataset.emit(name)
+
+    def set_import_running(self, running):
+        """Schaltet die Bedienelemente während eines laufenden Imports um"""
+        self.import_button.setEnabled(not running)
+        self.browse_button.setEnabled(not running)
+        self.batch_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+
+    def show_memory_report(self, name, report):
+        """Zeigt den Speicherbedarf eines Datensatzes vor und nach der Optimierung an"""
+        self.memory_reports[name] = report
+
+        lines = []
+        for dataset, entry in self.memory_reports.items():
+            before_mb = entry["before_bytes"] / (1024 * 1024)
+            after_mb = entry["after_bytes"] / (1024 * 1024)
+            changed = ", ".join(f"{col}: {old} → {new}" for col, (old, new) in entry["columns"].items())
+            lines.append(
+                f"<b>{dataset}</b>: {before_mb:.1f} MB → {after_mb:.1f} MB "
+                f"(−{entry['saved_pct']:.1f} %)" + (f" – {changed}" if changed else "")
+            )
+
+        self.memory_report_text.setHtml("<br>".join(lines))
+
     def update_preview(self, df):
         """Aktualisiert die Datenvorschau"""
         if df is not None:
-            # Zeige nur die ersten 100 Zeilen in der Vorschau
-            preview_df = df.head(100)
-            model = PandasModel(preview_df)
+            # Vollständige Daten anzeigen (das Model lädt Zeilen erst beim Scrollen)
+            model = DataFrameModel(df, parent=self.preview_table)
             self.preview_table.setModel(model)
+            self.preview_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            self.preview_filter.model_changed()
 
-            # Spaltenbreiten anpassen
-            self.preview_table.resizeColumnsToContents()
\ No newline at end of file
+            # Spaltenbreiten anhand einer Stichprobe anpassen
+            resize_columns_to_sample(self.preview_table)
\ No newline at end of file
@@ -1,8 +1,8 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QLabel, QComboBox, QGroupBox, QFormLayout, QLineEdit)
+                             QLabel, QComboBox, QGroupBox, QFormLayout, QLineEdit, QSpinBox,
+                             QFileDialog)
 from PyQt6.QtCore import pyqtSignal
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from gui.widgets import ChartView
 
 
 class VisualizationTab(QWidget):
@@ -10,6 +10,7 @@ class VisualizationTab(QWidget):
 
     # Signal für Kommunikation mit Controller
     create_chart = pyqtSignal(str, str, dict)
+    export_chart_data = pyqtSignal(str)  # Zieldatei
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -48,7 +49,18 @@ class VisualizationTab(QWidget):
 
         timeseries_layout.addRow("X-Achse (Zeit):", self.x_col_edit)
         timeseries_layout.addRow("Y-Achse (Wert):", self.y_col_edit)
+        self.max_points_spin = QSpinBox()
+        self.max_points_spin.setRange(0, 1000000)
+        self.max_points_spin.setSingleStep(500)
+        self.max_points_spin.setValue(2000)
+        self.max_points_spin.setSpecialValueText("alle")
+        self.downsampling_combo = QComboBox()
+        self.downsampling_combo.addItem("LTTB (Kurvenform)", "lttb")
+        self.downsampling_combo.addItem("Min/Max je Intervall", "minmax")
+
         timeseries_layout.addRow("Titel:", self.title_edit)
+        timeseries_layout.addRow("Max. Punkte:", self.max_points_spin)
+        timeseries_layout.addRow("Reduktion:", self.downsampling_combo)
 
         settings_layout.addWidget(self.timeseries_group)
 
@@ -74,17 +86,20 @@ class VisualizationTab(QWidget):
         button_layout = QHBoxLayout()
         self.create_button = QPushButton("Diagramm erstellen")
         self.create_button.clicked.connect(self.create_selected_chart)
+        self.export_button = QPushButton("Diagrammdaten exportieren...")
+        self.export_button.setToolTip("Exportiert alle Datenpunkte, auch die bei der Anzeige reduzierten")
+        self.export_button.clicked.connect(self.export_data)
         button_layout.addStretch()
+        button_layout.addWidget(self.export_button)
         button_layout.addWidget(self.create_button)
 
         # Diagrammanzeige
-        self.figure = Figure(figsize=(8, 6))
-        self.canvas = FigureCanvas(self.figure)
+        self.chart_view = ChartView()
 
         # Alles zusammenfügen
         layout.addLayout(settings_layout)
         layout.addLayout(button_layout)
-        layout.addWidget(self.canvas)
+        layout.addWidget(self.chart_view)
 
         # Standardeinstellung: Zeitreihendiagramm anzeigen, Abweichungsdiagramm ausblenden
         self.variance_group.setVisible(False)
@@ -127,7 +142,9 @@ class VisualizationTab(QWidget):
             parameters = {
                 "x_col": self.x_col_edit.text(),
                 "y_col": self.y_col_edit.text(),
-                "title": self.title_edit.text()
+                "title": self.title_edit.text(),
+                "max_points": self.max_points_spin.value(),
+                "downsampling": self.downsampling_combo.currentData()
             }
         elif chart_index == 1:  # Abweichungsdiagramm
             chart_type = "variance"
@@ -144,44 +161,22 @@ class VisualizationTab(QWidget):
         # Signal emittieren
         self.create_chart.emit(data_key, chart_type, parameters)
 
+    def export_data(self):
+        """Fragt die Zieldatei für den Export der Diagrammdaten ab"""
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Diagrammdaten exportieren",
+            "",
+            "CSV-Dateien (*.csv);;Parquet-Dateien (*.parquet);;Excel-Dateien (*.xlsx)"
+        )
+
+        if file_path:
+            extension = selected_filter[selected_filter.rfind("*") + 1:-1]
+            if not file_path.lower().endswith(extension):
+                file_path += extension
+            self.export_chart_data.emit(file_path)
+
     def show_chart(self, figure):
-        """Zeigt das Diagramm an"""
+        """Zeigt das Diagramm an (die Figur wird direkt eingebettet)"""
         if figure:
-            # Alte Achsen löschen
-            self.figure.clear()
-
-            # Neue Achsen erstellen
-            axes = self.figure.add_subplot(111)
-
-            # Daten aus der übergebenen Figur kopieren
-            for ax in figure.get_axes():
-                # Linien kopieren
-                for line in ax.get_lines():
-                    axes.plot(line.get_xdata(), line.get_ydata(),
-                              color=line.get_color(),
-                              linestyle=line.get_linestyle(),
-                              marker=line.get_marker(),
-                              label=line.get_label())
-
-                # Balken kopieren
-                for container in ax.containers:
-                    if hasattr(container, 'patches'):  # Für BarContainer
-                        for i, patch in enumerate(container.patches):
-                            axes.bar(i, patch.get_height(), color=patch.get_facecolor())
-
-                # Titel und Achsenbeschriftungen kopieren
-                if ax.get_title():
-                    axes.set_title(ax.get_title())
-
-                if ax.get_xlabel():
-                    axes.set_xlabel(ax.get_xlabel())
-
-                if ax.get_ylabel():
-                    axes.set_ylabel(ax.get_ylabel())
-
-                # Legende kopieren
-                if ax.get_legend():
-                    axes.legend()
-
-            # Anzeige aktualisieren
-            self.canvas.draw()
\ No newline at end of file
+            self.chart_view.set_figure(figure)
\ No newline at end of file
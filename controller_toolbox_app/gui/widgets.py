@@ -0,0 +1,336 @@
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QComboBox, QLineEdit
+from PyQt6.QtCore import QTimer
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import PolyCollection
+from matplotlib.container import BarContainer
+from matplotlib.dates import AutoDateFormatter, ConciseDateFormatter, DateFormatter, num2date
+from matplotlib.figure import Figure
+
+
+class TableFilterBar(QWidget):
+    """Filterzeile für eine QTableView mit DataFrameModel
+
+    Der Filter wird kurz nach der letzten Eingabe angewendet, damit bei großen
+    Tabellen nicht bei jedem Tastendruck neu gefiltert wird.
+    """
+
+    def __init__(self, view, parent=None, delay_ms=250):
+        super().__init__(parent)
+        self.view = view
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter, z.B. Nord oder >1000")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.column_combo = QComboBox()
+        self.count_label = QLabel()
+
+        layout.addWidget(QLabel("Filter:"))
+        layout.addWidget(self.filter_edit, 1)
+        layout.addWidget(QLabel("in"))
+        layout.addWidget(self.column_combo)
+        layout.addWidget(self.count_label)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.apply_filter)
+
+        self.filter_edit.textChanged.connect(self.timer.start)
+        self.column_combo.currentIndexChanged.connect(self.timer.start)
+
+    def model_changed(self):
+        """Übernimmt die Spalten eines neuen Models und wendet einen vorhandenen Filter an"""
+        model = self.view.model()
+        current = self.column_combo.currentText()
+
+        self.column_combo.blockSignals(True)
+        self.column_combo.clear()
+        self.column_combo.addItem("Alle Textspalten")
+        if model is not None:
+            for column in range(model.columnCount()):
+                self.column_combo.addItem(str(model.dataframe().columns[column]))
+        index = self.column_combo.findText(current)
+        self.column_combo.setCurrentIndex(max(index, 0))
+        self.column_combo.blockSignals(False)
+
+        if self.filter_edit.text().strip():
+            self.apply_filter()
+        else:
+            self.update_count()
+
+    def apply_filter(self):
+        """Wendet den Filtertext auf das Model an"""
+        self.timer.stop()
+        model = self.view.model()
+        if model is None:
+            return
+
+        column = self.column_combo.currentIndex() - 1
+        model.set_filter(self.filter_edit.text(), column if column >= 0 else None)
+        self.update_count()
+
+    def update_count(self):
+        """Zeigt die Anzahl der angezeigten Zeilen an"""
+        model = self.view.model()
+        if model is None:
+            self.count_label.clear()
+            return
+
+        total = len(model.dataframe())
+        visible = model.visible_row_count()
+        if visible == total:
+            self.count_label.setText(f"{total:,} Zeilen".replace(",", "."))
+        else:
+            self.count_label.setText(f"{visible:,} von {total:,} Zeilen".replace(",", "."))
+
+
+class ChartView(QWidget):
+    """Anzeige einer matplotlib-Figur mit Werkzeugleiste und Wertanzeige beim Überfahren
+
+    Die vom Backend erzeugte Figur wird unverändert eingebettet (inklusive
+    Zweitachsen), statt ihre Elemente einzeln nachzuzeichnen. Die Wertanzeige
+    wird per Blitting über ein zwischengespeichertes Hintergrundbild gelegt,
+    sodass die Figur bei Mausbewegungen nicht neu gezeichnet wird. Zoomen und
+    Verschieben über die Werkzeugleiste lösen bei reduziert gezeichneten
+    Zeitreihen eine neue Reduktion des sichtbaren Bereichs aus.
+    """
+
+    def __init__(self, parent=None, figsize=(8, 6)):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        self.figure = Figure(figsize=figsize)
+        self.canvas = FigureCanvas(self.figure)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        self.layout.addWidget(self.toolbar)
+        self.layout.addWidget(self.canvas)
+
+        self._hover = None
+
+    def set_figure(self, figure):
+        """Bettet eine Figur ein und ersetzt die bisherige Anzeige
+
+        Figuren aus dem Diagramm-Cache werden mehrfach angezeigt: Zoom und
+        Verschiebung der letzten Anzeige werden dabei zurückgesetzt.
+        """
+        # Figur aus pyplot lösen, damit sie nicht in dessen Verwaltung bleibt
+        plt.close(figure)
+        figure.set_layout_engine("tight")
+        _reset_view(figure)
+
+        canvas = FigureCanvas(figure)
+        toolbar = NavigationToolbar(canvas, self)
+        for old, new in ((self.toolbar, toolbar), (self.canvas, canvas)):
+            self.layout.replaceWidget(old, new)
+            old.setParent(None)
+            old.deleteLater()
+        self.toolbar = toolbar
+
+        if self._hover is not None:
+            self._hover.disconnect()
+
+        self.figure = figure
+        self.canvas = canvas
+        self._hover = _HoverAnnotation(canvas)
+        canvas.draw_idle()
+
+
+class _HoverAnnotation:
+    """Zeigt den nächstgelegenen Linienpunkt oder Balken an (per Blitting)"""
+
+    def __init__(self, canvas, radius=30):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.radius = radius
+
+        self.background = None
+        self.points = None
+        self.annotation = None
+        if self.figure.axes:
+            self.annotation = self.figure.axes[-1].annotate(
+                "", xy=(0, 0), xycoords='figure pixels', xytext=(12, 12), textcoords='offset points',
+                bbox=dict(boxstyle='round', fc='white', alpha=0.9), annotation_clip=False, animated=True)
+            self.annotation.set_visible(False)
+
+        self._connections = [
+            canvas.mpl_connect('draw_event', self.on_draw),
+            canvas.mpl_connect('motion_notify_event', self.on_move),
+            canvas.mpl_connect('figure_leave_event', self.on_leave)
+        ]
+
+    def disconnect(self):
+        """Trennt die Ereignisse und entfernt die Wertanzeige wieder aus der Figur"""
+        for connection in self._connections:
+            self.canvas.mpl_disconnect(connection)
+        if self.annotation is not None:
+            self.annotation.remove()
+            self.annotation = None
+
+    def on_draw(self, event):
+        """Merkt sich den Hintergrund und die Bildschirmpositionen aller Datenpunkte"""
+        if self.annotation is None:
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.points = _display_points(self.figure)
+        if self.annotation.get_visible():
+            self.figure.draw_artist(self.annotation)
+
+    def on_move(self, event):
+        if self.background is None or self.points is None or event.inaxes is None:
+            return self.on_leave(event)
+
+        x_pixels, y_pixels, label = self.points
+        if not len(x_pixels):
+            return
+
+        # Kandidaten in der Nähe der Mausposition über die sortierten x-Positionen suchen
+        start = np.searchsorted(x_pixels, event.x - self.radius)
+        stop = np.searchsorted(x_pixels, event.x + self.radius)
+        if start == stop:
+            return self.on_leave(event)
+        distances = np.hypot(x_pixels[start:stop] - event.x, y_pixels[start:stop] - event.y)
+        nearest = start + int(np.argmin(distances))
+        if distances[nearest - start] > self.radius:
+            return self.on_leave(event)
+
+        self.annotation.xy = (x_pixels[nearest], y_pixels[nearest])
+        self.annotation.set_text(label(nearest))
+        self.annotation.set_visible(True)
+        self._blit()
+
+    def on_leave(self, event):
+        if self.annotation is not None and self.annotation.get_visible():
+            self.annotation.set_visible(False)
+            self._blit()
+
+    def _blit(self):
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        if self.annotation.get_visible():
+            self.figure.draw_artist(self.annotation)
+        self.canvas.blit(self.figure.bbox)
+
+
+def _reset_view(figure):
+    """Stellt die Achsenbereiche wieder her, mit denen die Figur zuerst angezeigt wurde"""
+    home_view = getattr(figure, "home_view", None)
+    if home_view is None:
+        figure.home_view = [(axes, axes.get_xlim(), axes.get_ylim()) for axes in figure.axes]
+        return
+    for axes, x_limits, y_limits in home_view:
+        if axes.get_xlim() != x_limits:
+            axes.set_xlim(x_limits)
+        if axes.get_ylim() != y_limits:
+            axes.set_ylim(y_limits)
+
+
+def _display_points(figure):
+    """Bildschirmpositionen aller Linienpunkte und Balken (nach x sortiert)
+
+    Gibt (x, y, Beschriftung) zurück; Beschriftung(i) formatiert den Text des
+    i-ten Punkts erst bei Bedarf.
+    """
+    x_parts, y_parts, labelers = [], [], []
+
+    for axes in figure.axes:
+        label_default = axes.get_ylabel() or "Wert"
+
+        for line in axes.get_lines():
+            # Nur Datenlinien (keine Hilfslinien wie axhline)
+            if line.get_transform() != axes.transData:
+                continue
+            data = np.asarray(line.get_xydata(), dtype=float)
+            if not len(data):
+                continue
+            label = line.get_label() if not line.get_label().startswith('_') else label_default
+            pixels = axes.transData.transform(data)
+            x_parts.append(pixels[:, 0])
+            y_parts.append(pixels[:, 1])
+            labelers.append(_line_labeler(axes, label, data))
+
+        for container in axes.containers:
+            if not isinstance(container, BarContainer) or not len(container.patches):
+                continue
+            label = str(container.get_label())
+            label = label if not label.startswith('_') else label_default
+            data = np.array([(patch.get_x() + patch.get_width() / 2, patch.get_y() + patch.get_height(),
+                              patch.get_height()) for patch in container.patches])
+            pixels = axes.transData.transform(data[:, :2])
+            x_parts.append(pixels[:, 0])
+            y_parts.append(pixels[:, 1])
+            labelers.append(_bar_labeler(axes, label, data))
+
+        # Als PolyCollection gezeichnete Balken (Rechtecke mit vier Eckpunkten)
+        for collection in axes.collections:
+            if not isinstance(collection, PolyCollection):
+                continue
+            paths = collection.get_paths()
+            if not paths or any(len(path.vertices) not in (4, 5) for path in paths):
+                continue
+            corners = np.array([path.vertices[:4] for path in paths])
+            label = str(collection.get_label())
+            label = label if not label.startswith('_') else label_default
+            data = np.column_stack([(corners[:, 0, 0] + corners[:, 2, 0]) / 2, corners[:, 1, 1],
+                                    corners[:, 1, 1] - corners[:, 0, 1]])
+            pixels = axes.transData.transform(data[:, :2])
+            x_parts.append(pixels[:, 0])
+            y_parts.append(pixels[:, 1])
+            labelers.append(_bar_labeler(axes, label, data))
+
+    if not x_parts:
+        return np.array([]), np.array([]), None
+
+    offsets = np.cumsum([0] + [len(part) for part in x_parts])
+    x_pixels = np.concatenate(x_parts)
+    y_pixels = np.concatenate(y_parts)
+    order = np.argsort(x_pixels, kind='stable')
+
+    def label(index):
+        position = int(order[index])
+        part = int(np.searchsorted(offsets, position, side='right')) - 1
+        return labelers[part](position - offsets[part])
+
+    return x_pixels[order], y_pixels[order], label
+
+
+def _line_labeler(axes, label, data):
+    is_date = isinstance(axes.xaxis.get_major_formatter(), (AutoDateFormatter, ConciseDateFormatter, DateFormatter))
+
+    def text(index):
+        x, y = data[index]
+        x_text = num2date(x).strftime("%d.%m.%Y") if is_date else axes.format_xdata(x)
+        return f"{label}\n{x_text}: {_format_number(y)}"
+    return text
+
+
+def _bar_labeler(axes, label, data):
+    """Beschriftung eines Balkens mit der nächstgelegenen x-Achsenbeschriftung"""
+    ticks = np.asarray(axes.get_xticks())
+    tick_labels = [tick.get_text() for tick in axes.get_xticklabels()]
+    formatter = axes.xaxis.get_major_formatter()
+
+    def text(index):
+        x, _, value = data[index]
+        key = None
+        if len(ticks) and len(tick_labels) == len(ticks):
+            nearest = int(np.argmin(np.abs(ticks - x)))
+            if abs(ticks[nearest] - x) < 0.5:
+                key = tick_labels[nearest]
+        if key is None:
+            # Nur ein Teil der Schlüssel ist beschriftet: Beschriftung der Balkenposition
+            key = formatter(round(x), 0)
+        return f"{label} {key}: {_format_number(value)}" if key else f"{label}: {_format_number(value)}"
+    return text
+
+
+def _format_number(value):
+    """Zahl im deutschen Format mit zwei Nachkommastellen"""
+    return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+import threading
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+import pandas as pd
+
+
+class WorkerSignals(QObject):
+    """Signale, mit denen Hintergrund-Worker mit dem GUI-Thread kommunizieren"""
+
+    progress = pyqtSignal('qint64', 'qint64', 'qint64')  # gelesene Zeilen, Zeilen gesamt (0 = unbekannt), gelesene Bytes
+    preview = pyqtSignal(object)          # erster Datenblock für die Vorschau
+    finished = pyqtSignal(object)         # Ergebnis
+    error = pyqtSignal(str)               # Fehlermeldung
+    cancelled = pyqtSignal()
+
+
+class ImportWorker(QRunnable):
+    """Worker für den Excel-Import im Hintergrund"""
+
+    def __init__(self, toolbox, file_path, sheet_name, options):
+        super().__init__()
+        self.toolbox = toolbox
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.options = dict(options)
+        self.signals = WorkerSignals()
+        self.memory_report = None
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Fordert den Abbruch des Imports an"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        try:
+            chunksize = self.options.pop("chunksize", None)
+            optimize = self.options.pop("optimize_dtypes", False)
+            file_size = os.path.getsize(self.file_path)
+
+            if chunksize:
+                df = self.load_chunked(chunksize, file_size)
+            else:
+                # Einlesen am Stück: Fortschritt erst nach Abschluss bekannt
+                self.signals.progress.emit(0, 0, 0)
+                df = self.toolbox.load_excel(self.file_path, self.sheet_name, **self.options)
+                self.signals.progress.emit(len(df), len(df), file_size)
+
+            # Datentypen im Hintergrund verkleinern
+            if optimize and df is not None and not self.is_cancelled():
+                df, self.memory_report = self.toolbox.optimize_dtypes(df)
+
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(df)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+    def load_chunked(self, chunksize, file_size):
+        """Liest die Datei blockweise und meldet den Fortschritt je Block"""
+        # Zeilenzahl aus den Metadaten für die Fortschrittsanzeige
+        total_rows = 0
+        try:
+            for info in self.toolbox.get_sheet_info(self.file_path):
+                if info["name"] == self.sheet_name and info["rows"]:
+                    total_rows = info["rows"]
+        except Exception:
+            pass
+
+        # Der Blockleser wählt sein Verfahren selbst anhand des Dateityps
+        options = {name: value for name, value in self.options.items() if name != "engine"}
+
+        chunks = []
+        rows_read = 0
+        for chunk in self.toolbox.iter_excel_chunks(self.file_path, self.sheet_name,
+                                                    chunksize=chunksize, **options):
+            if self.is_cancelled():
+                return None
+
+            chunks.append(chunk)
+            rows_read += len(chunk)
+
+            if len(chunks) == 1:
+                self.signals.preview.emit(chunk)
+
+            # Gelesene Bytes anhand des Zeilenanteils schätzen
+            bytes_read = int(file_size * rows_read / total_rows) if total_rows else 0
+            self.signals.progress.emit(rows_read, total_rows, min(bytes_read, file_size))
+
+        if not chunks:
+            return pd.DataFrame()
+
+        return pd.concat(chunks, ignore_index=True)
+
+
+class FunctionWorker(QRunnable):
+    """Allgemeiner Worker, der eine Funktion im Hintergrund ausführt
+
+    Die Funktion erhält ein Argument progress_callback(done, total), dessen
+    Aufrufe als progress-Signal weitergegeben werden. Mit cancellable=True
+    erhält sie zusätzlich is_cancelled, das sie zwischen ihren Arbeitsschritten
+    prüft; nach einem Abbruch wird cancelled statt finished gesendet.
+    """
+
+    def __init__(self, function, *args, cancellable=False, **kwargs):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+
+        if cancellable:
+            self.kwargs["is_cancelled"] = self.is_cancelled
+
+    def cancel(self):
+        """Fordert den Abbruch an (wirkt nur bei cancellable=True)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        try:
+            result = self.function(*self.args, progress_callback=self.report_progress, **self.kwargs)
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+    def report_progress(self, done, total):
+        self.signals.progress.emit(done, total, 0)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from controller import ControllerApp
 
@@ -10,4 +11,6 @@ def main():
     return app.exec()
 
 if __name__ == "__main__":
+    # Notwendig für Prozesspools in der gepackten Anwendung (PyInstaller)
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
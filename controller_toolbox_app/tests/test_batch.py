@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+from controller import ControllerApp
+from backend.controller_toolbox import ControllerToolbox
+
+
+def test_numeric_sheet_name_is_not_treated_as_position(tmp_path):
+    source = tmp_path / "mappe.xlsx"
+    with pd.ExcelWriter(source) as writer:
+        for sheet, value in (("Ist", 1.0), ("Plan", 2.0), ("2024", 3.0)):
+            pd.DataFrame({"Wert": np.full(3, value)}).to_excel(writer, sheet_name=sheet, index=False)
+
+    toolbox = ControllerToolbox()
+    by_name = toolbox.load_batch([str(source)], sheet_name=ControllerApp.parse_sheet_selector("2024"),
+                                 max_workers=1)
+    by_position = toolbox.load_batch([str(source)], sheet_name=ControllerApp.parse_sheet_selector("1"),
+                                     max_workers=1)
+
+    assert [df["Wert"].iloc[0] for df in by_name["datasets"].values()] == [3.0]
+    assert [df["Wert"].iloc[0] for df in by_position["datasets"].values()] == [2.0]
\ No newline at end of file
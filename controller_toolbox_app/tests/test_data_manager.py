@@ -0,0 +1,43 @@
+import sqlite3
+import threading
+import pandas as pd
+import pytest
+from data.data_manager import DataManager
+
+
+def test_close_closes_connections_of_other_threads(tmp_path):
+    manager = DataManager(db_path=tmp_path / "daten.db")
+    opened, closed = threading.Event(), threading.Event()
+    errors = []
+
+    def worker():
+        manager.save_setting("budget", 512)
+        conn = manager.conn
+        opened.set()
+        closed.wait()
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    opened.wait()
+    manager.close()
+    closed.set()
+    thread.join()
+
+    assert len(errors) == 1 and "closed" in str(errors[0])
+    # Danach wird je Thread eine neue Verbindung geöffnet
+    assert manager.get_setting("budget") == "512"
+
+
+def test_store_and_load_datasets(tmp_path):
+    manager = DataManager(db_path=tmp_path / "daten.db")
+    ist = pd.DataFrame({"Konto": ["4711", "4714A"], "Umsatz": [1.5, 2.0]})
+
+    assert manager.store_datasets([("Ist 2024", ist, "Ist"), ("Ist_2024", ist.head(1), "")])
+
+    pd.testing.assert_frame_equal(manager.load_dataset("Ist 2024", verify=True), ist)
+    assert manager.get_dataset_info("Ist_2024")["row_count"] == 1
+    manager.close()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from backend.downsampling import plot_decimated, full_resolution_data
+
+
+def _axes():
+    return Figure().add_subplot(111)
+
+
+def test_text_x_values_are_decimated_by_position():
+    """Text als x-Werte (z.B. Periodenbezeichnungen) darf nicht zu NaN werden"""
+    count = 5000
+    labels = pd.Series([f"P{i:05d}" for i in range(count)], dtype="str")
+    values = np.sin(np.arange(count) / 50.0)
+
+    ax = _axes()
+    line, _ = plot_decimated(ax, labels, values, max_points=500)
+    assert len(line.get_xdata()) == 500
+    assert np.isfinite(np.asarray(line.get_xdata(), dtype=float)).all()
+
+    # Neureduktion beim Zoomen liefert weiterhin Punkte im sichtbaren Bereich
+    ax.set_xlim(1000, 1100)
+    x = np.asarray(line.get_xdata(), dtype=float)
+    assert len(x) > 100
+    assert x.min() >= 999 and x.max() <= 1101
+
+    # Achsenbeschriftung zeigt den Text an der Position
+    assert ax.xaxis.get_major_formatter()(1000) == "P01000"
+
+
+def test_datetime_x_values_are_sorted_and_rezoomed():
+    count = 20000
+    dates = pd.Series(pd.date_range("2024-01-01", periods=count, freq="min"))
+    shuffled = np.random.default_rng(0).permutation(count)
+
+    ax = _axes()
+    line, decimation = plot_decimated(ax, dates.iloc[shuffled], np.arange(count, dtype=float)[shuffled],
+                                      max_points=1000)
+    assert len(line.get_xdata()) == 1000
+    assert (np.diff(decimation.x_numeric) > 0).all()
+
+    start, stop = decimation.x_numeric[5000], decimation.x_numeric[5200]
+    ax.set_xlim(start, stop)
+    assert len(line.get_xdata()) >= 200
+
+
+def test_full_resolution_data_keeps_all_points():
+    count = 5000
+    ax = _axes()
+    plot_decimated(ax, np.arange(count), np.random.default_rng(1).normal(size=count), max_points=200,
+                   label="Umsatz")
+    ax.plot([0, 1], [2, 3], label="Plan")
+
+    data = full_resolution_data(ax.figure)
+    assert len(data["Umsatz"]) == count
+    assert data["Plan"]["y"].tolist() == [2, 3]
\ No newline at end of file
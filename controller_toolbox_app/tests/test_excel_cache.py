@@ -0,0 +1,30 @@
+import os
+import pandas as pd
+from data.excel_cache import ExcelCache
+
+
+def test_cache_hits_do_not_rewrite_the_index(tmp_path):
+    source = tmp_path / "daten.csv"
+    source.write_text("Konto;Umsatz\n4711;1,5\n", encoding="utf-8")
+    cache = ExcelCache(cache_dir=tmp_path / "cache")
+    df = pd.DataFrame({"Konto": [4711], "Umsatz": [1.5]})
+
+    assert cache.put(source, df, sheet_name=0)
+    written = os.stat(cache.index_path).st_mtime_ns
+    for _ in range(3):
+        pd.testing.assert_frame_equal(cache.get(source, sheet_name=0), df)
+
+    assert os.stat(cache.index_path).st_mtime_ns == written
+    assert cache.stats()["hits"] == 3
+
+
+def test_hash_memo_keeps_one_entry_per_file(tmp_path):
+    source = tmp_path / "daten.csv"
+    cache = ExcelCache(cache_dir=tmp_path / "cache")
+
+    for version in range(5):
+        source.write_text(f"Konto\n{version}\n", encoding="utf-8")
+        os.utime(source, ns=(version * 10**9, version * 10**9))
+        cache.make_key(source)
+
+    assert len(cache._hash_memo) == 1
\ No newline at end of file
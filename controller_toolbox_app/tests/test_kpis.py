@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.controller_toolbox import ControllerToolbox, KPI_COLUMNS, GROWTH_COLUMNS
+
+
+def _bookings(months=24, cost_centers=("100", "200", "300")):
+    rng = np.random.default_rng(3)
+    dates = pd.date_range("2022-01-01", periods=months, freq="MS")
+    df = pd.DataFrame([(date, center) for date in dates for center in cost_centers],
+                      columns=["Datum", "Kostenstelle"])
+    df["Umsatz"] = rng.random(len(df)) * 1000 + 100
+    df["Kosten"] = rng.random(len(df)) * 500
+    return df
+
+
+def _sorted(df):
+    return df.sort_values(["Kostenstelle", "Datum"], kind="mergesort").reset_index(drop=True)
+
+
+def test_grouped_growth_restarts_per_group():
+    df = _bookings()
+    result = ControllerToolbox().calculate_kpis(df, time_col="Datum", group_by="Kostenstelle")
+
+    expected = _sorted(df).groupby("Kostenstelle")["Umsatz"].pct_change() * 100
+    assert np.allclose(_sorted(result)["Umsatzwachstum"], expected, equal_nan=True)
+    first_rows = result.groupby("Kostenstelle").head(1)
+    assert first_rows["Umsatzwachstum"].isna().all()
+
+
+@pytest.mark.parametrize("group_by", [None, "Kostenstelle"])
+def test_incremental_update_matches_full_recompute(group_by):
+    toolbox = ControllerToolbox()
+    df = _bookings()
+    history, new_rows = df[df["Datum"] < "2023-07-01"], df[df["Datum"] >= "2023-07-01"]
+
+    previous = toolbox.calculate_kpis(history, time_col="Datum", group_by=group_by)
+    updated = toolbox.update_kpis(previous, new_rows, time_col="Datum", group_by=group_by)
+    full = toolbox.calculate_kpis(df, time_col="Datum", group_by=group_by)
+
+    columns = ["Datum", "Kostenstelle"] + KPI_COLUMNS + GROWTH_COLUMNS
+    pd.testing.assert_frame_equal(_sorted(updated)[columns], _sorted(full)[columns])
+
+
+def test_update_with_older_rows_recomputes_everything():
+    toolbox = ControllerToolbox()
+    df = _bookings()
+    late, early = df[df["Datum"] >= "2022-07-01"], df[df["Datum"] < "2022-07-01"]
+
+    previous = toolbox.calculate_kpis(late, time_col="Datum", group_by="Kostenstelle")
+    updated = toolbox.update_kpis(previous, early, time_col="Datum", group_by="Kostenstelle")
+    full = toolbox.calculate_kpis(df, time_col="Datum", group_by="Kostenstelle")
+
+    columns = ["Datum", "Kostenstelle"] + GROWTH_COLUMNS
+    pd.testing.assert_frame_equal(_sorted(updated)[columns], _sorted(full)[columns])
\ No newline at end of file
@@ -0,0 +1,58 @@
+import tracemalloc
+import numpy as np
+import pandas as pd
+from backend.controller_toolbox import ControllerToolbox
+
+
+ROWS = 100000
+
+
+def _frame():
+    """Duplikatfreie Buchungen mit Lücken in einer Kostenspalte"""
+    rng = np.random.default_rng(0)
+    data = {
+        "Kostenstelle": pd.Categorical(rng.integers(0, 50, ROWS).astype(str)),
+        "Produkt": pd.Categorical(rng.integers(0, 500, ROWS).astype(str)),
+        "Datum": pd.date_range("2000-01-01", periods=ROWS, freq="min"),
+        "Umsatz": rng.random(ROWS) * 1000 + 1,
+        "Kosten": rng.random(ROWS) * 500,
+        "Menge": rng.random(ROWS)
+    }
+    for i in range(6):
+        data[f"Wert{i}"] = rng.random(ROWS)
+    df = pd.DataFrame(data)
+    df.loc[::100, "Kosten"] = np.nan
+    return df
+
+
+def _peak_memory(function, *args, **kwargs):
+    """Ergebnis und maximale zusätzliche Speicherbelegung in Bytes (tracemalloc erfasst auch NumPy)"""
+    tracemalloc.start()
+    try:
+        result = function(*args, **kwargs)
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_clean_data_without_copy_stays_below_the_input_size():
+    df = _frame()
+    input_bytes = df.memory_usage(deep=True).sum()
+
+    result, peak = _peak_memory(ControllerToolbox().clean_data, df, copy=False)
+
+    # Hashes für die Duplikatsuche und die aufgefüllte Kostenspalte, keine Kopie der Tabelle
+    assert result is df
+    assert peak < 0.75 * input_bytes
+
+
+def test_calculate_kpis_without_copy_needs_one_sorted_copy():
+    df = _frame()
+    input_bytes = df.memory_usage(deep=True).sum()
+
+    result, peak = _peak_memory(ControllerToolbox().calculate_kpis, df, time_col="Datum",
+                                group_by="Kostenstelle", copy=False)
+
+    # Sortieren nach Gruppe und Zeit legt die Spalten einmal neu an, dazu kommen die Kennzahlspalten
+    kpi_bytes = result.memory_usage(deep=True).sum() - input_bytes
+    assert peak < kpi_bytes + 1.5 * input_bytes
\ No newline at end of file
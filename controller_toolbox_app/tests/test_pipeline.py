@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.controller_toolbox import ControllerToolbox
+from backend.pipeline import ChunkedPipeline
+
+
+def _accounts_csv(path, rows=300, late_code_at=250):
+    """Kontonummern zunächst rein numerisch, später eine alphanumerische Nummer"""
+    accounts = pd.Series([4000 + i for i in range(rows)], dtype="object")
+    accounts.iloc[late_code_at] = "4714A"
+    df = pd.DataFrame({"Konto": accounts, "Umsatz": range(rows), "Kosten": range(rows)})
+    df.to_csv(path, index=False, sep=";")
+    return path
+
+
+def test_late_type_change_keeps_a_stable_text_schema(tmp_path):
+    source = _accounts_csv(tmp_path / "konten.csv")
+    toolbox = ControllerToolbox()
+
+    chunks = list(toolbox.iter_excel_chunks(source, chunksize=100))
+    assert len(chunks) == 3
+    assert all(chunk["Konto"].map(type).eq(str).all() for chunk in chunks)
+
+    output = tmp_path / "ergebnis.parquet"
+    stats = ChunkedPipeline(toolbox).run(source, output, chunksize=100)
+    result = pd.read_parquet(output)
+    assert stats["rows_out"] == 300
+    assert result["Konto"].iloc[[0, 250]].tolist() == ["4000", "4714A"]
+
+
+def test_late_type_change_outside_the_sample_raises(tmp_path):
+    source = _accounts_csv(tmp_path / "konten.csv")
+    toolbox = ControllerToolbox()
+
+    with pytest.raises(ValueError, match="4714A"):
+        list(toolbox.iter_excel_chunks(source, chunksize=100, schema_sample_rows=100))
+
+def test_pipeline_matches_in_memory_processing(tmp_path):
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2020-01-01", periods=60, freq="MS")
+    df = pd.DataFrame([(date, center) for date in dates for center in ("100", "200", "300")],
+                      columns=["Datum", "Kostenstelle"])
+    df["Umsatz"] = rng.random(len(df)) * 1000 + 100
+    df["Kosten"] = rng.random(len(df)) * 500
+    # Duplikate über Blockgrenzen hinweg
+    df = pd.concat([df, df.iloc[[3, 150]]]).sort_values("Datum", kind="mergesort")
+    source = tmp_path / "buchungen.parquet"
+    df.to_parquet(source, index=False)
+
+    toolbox = ControllerToolbox()
+    output = tmp_path / "ergebnis.parquet"
+    stats = ChunkedPipeline(toolbox, time_col="Datum", group_by="Kostenstelle").run(source, output,
+                                                                                    chunksize=50)
+    expected = toolbox.calculate_kpis(toolbox.clean_data(df), time_col="Datum", group_by="Kostenstelle")
+
+    assert stats["chunks"] == 4
+    assert stats["duplicates"] == 2
+    key = ["Kostenstelle", "Datum"]
+    result = pd.read_parquet(output).sort_values(key).reset_index(drop=True)
+    expected = expected.sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected[result.columns], check_dtype=False)
\ No newline at end of file
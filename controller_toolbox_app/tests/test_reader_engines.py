@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend import controller_toolbox
+from backend.controller_toolbox import ControllerToolbox
+from backend.reader_engines import read_table, select_engine
+
+
+def _workbook(path):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame(np.ones((5, 3))).to_excel(writer, sheet_name="Ist", index=False)
+        pd.DataFrame(np.ones((30, 28))).to_excel(writer, sheet_name="2024", index=False)
+    return path
+
+
+def test_load_excel_reuses_the_handle_from_get_sheet_info(tmp_path, monkeypatch):
+    source = _workbook(tmp_path / "mappe.xlsx")
+    toolbox = ControllerToolbox()
+
+    info = toolbox.get_sheet_info(source)
+    sizes = [(sheet["name"], sheet["rows"], sheet["columns"]) for sheet in info]
+    assert sizes == [("Ist", 6, 3), ("2024", 31, 28)]
+    assert toolbox.open_excel(source).engine == select_engine(source)
+
+    def reopen(*args, **kwargs):
+        raise AssertionError("Arbeitsmappe wurde erneut geöffnet")
+
+    monkeypatch.setattr(controller_toolbox, "read_table", reopen)
+    assert toolbox.load_excel(source, sheet_name="2024").shape == (30, 28)
+
+def test_parquet_skiprows_accepts_count_list_and_callable(tmp_path):
+    source = tmp_path / "daten.parquet"
+    pd.DataFrame({"Wert": range(6)}).to_parquet(source, index=False)
+
+    assert read_table(source, skiprows=2)["Wert"].tolist() == [2, 3, 4, 5]
+    assert read_table(source, skiprows=[0, 3])["Wert"].tolist() == [1, 2, 4, 5]
+    assert read_table(source, skiprows=lambda row: row % 2 == 0)["Wert"].tolist() == [1, 3, 5]
+
+
+def test_parquet_rejects_header_option(tmp_path):
+    source = tmp_path / "daten.parquet"
+    pd.DataFrame({"Wert": range(3)}).to_parquet(source, index=False)
+
+    with pytest.raises(ValueError, match="header"):
+        read_table(source, header=None)
\ No newline at end of file
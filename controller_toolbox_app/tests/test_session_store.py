@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from data.session_store import SessionStore
+
+
+def _dataset(rows=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Datum": pd.date_range("2024-01-01", periods=rows, freq="h"),
+        "Kostenstelle": pd.Categorical(rng.integers(0, 20, rows).astype(str)),
+        "Text": [f"Buchung {i}" for i in range(rows)],
+        "Umsatz": rng.random(rows)
+    }, index=pd.RangeIndex(rows).rename("Zeile") + 1000)
+
+
+def test_spill_and_reload_round_trip(tmp_path):
+    first, second = _dataset(seed=1), _dataset(seed=2)
+    budget_mb = first.memory_usage(deep=True).sum() * 1.5 / (1024 * 1024)
+    store = SessionStore(memory_budget_mb=budget_mb, spill_dir=tmp_path)
+
+    store["Ist"] = first
+    version = store.version("Ist")
+    store["Plan"] = second
+
+    # Der ältere Datensatz wird ausgelagert, der zuletzt genutzte bleibt geladen
+    assert store.is_spilled("Ist") and not store.is_spilled("Plan")
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+    assert store.memory_usage() <= store.memory_budget
+
+    reloaded = store["Ist"]
+    pd.testing.assert_frame_equal(reloaded, first)
+    assert store.version("Ist") == version
+    assert store.is_spilled("Plan")
+    assert store.stats()["reload_count"] == 1
+
+    del store["Plan"]
+    assert sorted(store) == ["Ist"]
+    store.close()
+    assert not tmp_path.exists()
+
+def test_reload_makes_room_and_spill_errors_are_reported(tmp_path):
+    first, second = _dataset(seed=1), _dataset(seed=2)
+    budget_mb = first.memory_usage(deep=True).sum() * 1.5 / (1024 * 1024)
+    errors = []
+    store = SessionStore(memory_budget_mb=budget_mb, spill_dir=tmp_path, error_callback=errors.append)
+
+    store["Ist"] = first
+    store["Plan"] = second
+    store["Ist"]
+    # Vor dem Nachladen wurde der andere Datensatz ausgelagert, das Budget gilt weiter
+    assert store.is_spilled("Plan")
+    assert store.memory_usage() <= store.memory_budget
+
+    # Nicht als Arrow darstellbare Spalte: Fehler wird einmal gemeldet, Daten bleiben geladen
+    store["Objekte"] = pd.DataFrame({"Wert": [object()] * 50000})
+    store["Plan"]
+    store["Ist"]
+    assert len(errors) == 1 and "Objekte" in errors[0]
+    assert not store.is_spilled("Objekte")
\ No newline at end of file
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from backend.time_intelligence import time_intelligence
+
+
+def _monthly(months=30):
+    dates = pd.date_range("2022-01-01", periods=months, freq="MS")
+    return pd.DataFrame({"Datum": dates, "Umsatz": np.arange(1, months + 1, dtype=float)})
+
+
+def test_ytd_r12_mom_yoy():
+    df = _monthly()
+    result = time_intelligence(df, value_cols="Umsatz")
+
+    revenue = df["Umsatz"]
+    year = df["Datum"].dt.year
+    assert np.allclose(result["Umsatz_YTD"], revenue.groupby(year).cumsum())
+    assert np.allclose(result["Umsatz_R12"], revenue.rolling(12).sum(), equal_nan=True)
+    assert np.allclose(result["Umsatz_MoM"], revenue.pct_change() * 100, equal_nan=True)
+    assert np.allclose(result["Umsatz_YoY"], revenue.pct_change(12) * 100, equal_nan=True)
+
+
+def test_fiscal_year_and_missing_months():
+    df = _monthly().drop(index=[4])  # Mai 2022 fehlt
+    result = time_intelligence(df, value_cols="Umsatz", fiscal_year_start=4)
+
+    by_month = result.set_index("Datum")
+    # Geschäftsjahr ab April: YTD beginnt im April neu, der fehlende Mai zählt als 0
+    assert by_month.loc["2022-04-01", "Umsatz_YTD"] == 4
+    assert by_month.loc["2022-06-01", "Umsatz_YTD"] == 4 + 6
+    assert np.isnan(by_month.loc["2022-06-01", "Umsatz_MoM"])
+    assert by_month.loc["2023-03-01", "Umsatz_YTD"] == sum(range(4, 16)) - 5
+
+
+def test_groups_are_evaluated_separately_in_row_order():
+    a, b = _monthly(), _monthly().assign(Umsatz=lambda df: df["Umsatz"] * 10)
+    df = pd.concat([a.assign(Kostenstelle="100"), b.assign(Kostenstelle="200")]).sample(frac=1, random_state=0)
+
+    result = time_intelligence(df, value_cols="Umsatz", group_by="Kostenstelle")
+
+    assert result.index.equals(df.index)
+    single = time_intelligence(b, value_cols="Umsatz")
+    grouped = result[result["Kostenstelle"] == "200"].sort_values("Datum")
+    assert np.allclose(grouped["Umsatz_YTD"], single["Umsatz_YTD"])
\ No newline at end of file
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.controller_toolbox import ControllerToolbox
+
+
+def _sales(seed, products=("A", "B", "C", "D")):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame([(region, product) for region in ("Nord", "Süd") for product in products],
+                      columns=["Region", "Produkt"])
+    df["Menge"] = rng.integers(10, 100, len(df)).astype(float)
+    df["Umsatz"] = df["Menge"] * rng.random(len(df)) * 20
+    return df
+
+
+@pytest.mark.parametrize("mix_level", [None, "Region"])
+def test_decomposition_sums_to_total_variance(mix_level):
+    actual = _sales(1)
+    # Neue Position im Ist, entfallene Position im Plan
+    plan = _sales(2, products=("A", "B", "C", "E"))
+
+    result = ControllerToolbox().variance_decomposition(actual, plan, ["Region", "Produkt"],
+                                                        mix_level=mix_level)
+
+    parts = result[["Preisabweichung", "Mengenabweichung", "Mixabweichung"]].sum(axis=1)
+    assert np.allclose(parts, result["Gesamtabweichung"])
+    assert np.allclose(result["Restabweichung"], 0)
+    total = actual["Umsatz"].sum() - plan["Umsatz"].sum()
+    assert result["Gesamtabweichung"].sum() == pytest.approx(total)
+
+
+def test_unchanged_prices_leave_no_price_variance():
+    plan = _sales(1)
+    actual = plan.assign(Menge=plan["Menge"] * 2, Umsatz=plan["Umsatz"] * 2)
+
+    result = ControllerToolbox().variance_decomposition(actual, plan, ["Region", "Produkt"])
+
+    assert np.allclose(result["Preisabweichung"], 0)
+    assert np.allclose(result["Mixabweichung"], 0)
+    assert np.allclose(result["Mengenabweichung"], result["Gesamtabweichung"])
+
+
+def test_prepared_plan_matches_direct_analysis():
+    toolbox = ControllerToolbox()
+    actual, plan = _sales(1), _sales(2)
+    keys = ["Region", "Produkt"]
+
+    prepared = toolbox.prepare_plan(plan, keys, ["Menge", "Umsatz"])
+    direct = toolbox.variance_analysis(actual, plan, keys, ["Menge", "Umsatz"])
+
+    pd.testing.assert_frame_equal(toolbox.variance_analysis(actual, prepared), direct)
+    # Wiederverwendung mit anderen Ist-Daten
+    other = _sales(3)
+    pd.testing.assert_frame_equal(prepared.join(other), toolbox.variance_analysis(other, plan, keys))
+    assert prepared.is_prepared_from(plan)
\ No newline at end of file